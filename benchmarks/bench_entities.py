@@ -0,0 +1,74 @@
+"""
+Benchmark the memory and construction time of entity representations.
+
+Compares a regular dataclass with a per-instance __dict__ (the previous Entity), the __slots__ Entity and a SpanTable
+holding the same entities in flat arrays.
+
+Usage:
+    python benchmarks/bench_entities.py --documents 20000 --length 200
+"""
+
+import argparse
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from nervaluate.entities import Entity
+from nervaluate.loaders import DictLoader
+from nervaluate.spans import SpanTable
+
+from corpus import CorpusConfig, add_corpus_arguments, config_from_arguments, make_corpus
+
+
+@dataclass
+class DictEntity:
+    """Entity as previously defined, with a per-instance __dict__."""
+
+    label: str
+    start: int
+    end: int
+
+
+def measure(build: Callable[[], Any]) -> Tuple[float, int]:
+    """Return the construction time and the memory retained by the built object."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    built = build()
+    elapsed = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+    return elapsed, retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_corpus_arguments(parser, CorpusConfig(documents=20000, tags=40))
+    args = parser.parse_args()
+
+    corpus = make_corpus(config_from_arguments(args))
+    spans: List[List[Dict[str, Any]]] = corpus.to_dicts(corpus.true)
+    n_entities = sum(len(doc) for doc in spans)
+
+    candidates: Dict[str, Callable[[], Any]] = {
+        "dataclass": lambda: [[DictEntity(e["label"], e["start"], e["end"]) for e in doc] for doc in spans],
+        "slots": lambda: [[Entity(e["label"], e["start"], e["end"]) for e in doc] for doc in spans],
+        "span table": lambda: DictLoader().load_table(spans),
+    }
+
+    print(f"documents={args.documents} entities={n_entities}")
+    for name, build in candidates.items():
+        # Time without tracemalloc, which slows down allocations
+        start = time.perf_counter()
+        build()
+        elapsed = time.perf_counter() - start
+        _, retained = measure(build)
+        print(f"{name:>10}: {elapsed:.3f}s, {retained / 1e6:.1f} MB, {retained / n_entities:.1f} bytes/entity")
+
+    table = SpanTable.from_documents(DictLoader().load(spans))
+    print(f"span table arrays: {table.nbytes / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
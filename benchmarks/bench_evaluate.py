@@ -0,0 +1,54 @@
+"""
+Benchmark Evaluator.evaluate() on a synthetic corpus.
+
+Usage:
+    python benchmarks/bench_evaluate.py --documents 2000 --tags 40
+"""
+
+import argparse
+import time
+
+from nervaluate.evaluator import Evaluator
+
+from corpus import CorpusConfig, add_corpus_arguments, config_from_arguments, make_corpus
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_corpus_arguments(parser, CorpusConfig(tags=40))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes passed to evaluate()")
+    parser.add_argument("--no-indices", action="store_true", help="evaluate with collect_indices=False")
+    parser.add_argument(
+        "--backend",
+        choices=["python", "numpy"],
+        default="python",
+        help="evaluation backend, numpy implies --no-indices",
+    )
+    args = parser.parse_args()
+
+    corpus = make_corpus(config_from_arguments(args))
+    true, pred = corpus.to_dicts(corpus.true), corpus.to_dicts(corpus.pred)
+    evaluator = Evaluator(
+        true,
+        pred,
+        corpus.tags,
+        loader="dict",
+        collect_indices=not args.no_indices and args.backend == "python",
+        backend=args.backend,
+    )
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        evaluator.refresh(n_jobs=args.jobs)
+        timings.append(time.perf_counter() - start)
+
+    n_entities = corpus.n_entities
+    best = min(timings)
+    print(f"documents={args.documents} entities={n_entities} tags={args.tags}")
+    print(f"evaluate: best {best:.3f}s of {args.repeat}, {n_entities / best:,.0f} entities/s")
+
+
+if __name__ == "__main__":
+    main()
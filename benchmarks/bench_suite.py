@@ -0,0 +1,203 @@
+"""
+Benchmark the loaders, the evaluation strategies, Evaluator.evaluate() and the reports on a synthetic corpus.
+
+Each benchmark is timed as the best of several runs, then run once more under tracemalloc to measure its peak memory.
+The results are written as JSON, which benchmarks/compare.py compares between two commits.
+
+Usage:
+    python benchmarks/bench_suite.py --documents 2000 --length 200 --output before.json
+    python benchmarks/bench_suite.py --only evaluate --only loader
+"""
+
+import argparse
+import dataclasses
+import importlib.metadata
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from nervaluate import columnar
+from nervaluate.entities import EvaluationResult
+from nervaluate.evaluator import Evaluator, _evaluate_chunk
+from nervaluate.loaders import ConllLoader, DictLoader, ListLoader
+from nervaluate.strategies import EntityTypeEvaluation, ExactEvaluation, PartialEvaluation, StrictEvaluation
+
+from corpus import Corpus, add_corpus_arguments, config_from_arguments, make_corpus
+
+# Name, function to time and number of entities it processes
+Benchmark = Tuple[str, Callable[[], Any], int]
+
+
+def loader_benchmarks(corpus: Corpus) -> List[Benchmark]:
+    """Time the loading of the true and predicted documents in each format."""
+    conll = (corpus.to_conll(corpus.true), corpus.to_conll(corpus.pred))
+    dicts = (corpus.to_dicts(corpus.true), corpus.to_dicts(corpus.pred))
+    n_entities = corpus.n_entities
+    return [
+        ("loader.conll", lambda: [ConllLoader().load(data) for data in conll], n_entities),
+        ("loader.list", lambda: [ListLoader().load(data) for data in (corpus.true, corpus.pred)], n_entities),
+        ("loader.dict", lambda: [DictLoader().load(data) for data in dicts], n_entities),
+    ]
+
+
+def strategy_benchmarks(corpus: Corpus) -> List[Benchmark]:
+    """Time each evaluation strategy on all the documents."""
+    true, pred = ListLoader().load(corpus.true), ListLoader().load(corpus.pred)
+    benchmarks: List[Benchmark] = []
+    for name, strategy in [
+        ("strict", StrictEvaluation()),
+        ("partial", PartialEvaluation()),
+        ("ent_type", EntityTypeEvaluation()),
+        ("exact", ExactEvaluation()),
+    ]:
+
+        def run(strategy: Any = strategy) -> None:
+            for index, (true_doc, pred_doc) in enumerate(zip(true, pred)):
+                strategy.evaluate(true_doc, pred_doc, corpus.tags, index)
+
+        benchmarks.append((f"strategy.{name}", run, corpus.n_entities))
+    return benchmarks
+
+
+def evaluate_benchmarks(corpus: Corpus) -> List[Benchmark]:
+    """Time Evaluator.evaluate(), with and without the indices, on loaded documents."""
+    configurations: Dict[str, Dict[str, Any]] = {
+        "evaluate": {},
+        "evaluate.counts_only": {"collect_indices": False},
+        "evaluate.sweep": {"matching": "sweep"},
+    }
+    if columnar.np is not None:
+        configurations["evaluate.numpy_backend"] = {"collect_indices": False, "backend": "numpy"}
+
+    benchmarks: List[Benchmark] = []
+    for name, options in configurations.items():
+        evaluator = Evaluator(corpus.true, corpus.pred, corpus.tags, loader="list", **options)
+        benchmarks.append((name, evaluator.refresh, corpus.n_entities))
+    return benchmarks
+
+
+def report_benchmarks(corpus: Corpus) -> List[Benchmark]:
+    """Time the reports of an evaluator whose results are already cached."""
+    evaluator = Evaluator(corpus.true, corpus.pred, corpus.tags, loader="list")
+    evaluator.evaluate()
+    n_entities = corpus.n_entities
+    return [
+        ("report.summary", evaluator.summary_report, n_entities),
+        ("report.summary_entities", lambda: evaluator.summary_report(mode="entities"), n_entities),
+        ("report.indices", evaluator.summary_report_indices, n_entities),
+        ("report.csv", evaluator.results_to_csv, n_entities),
+    ]
+
+
+def merge_benchmarks(corpus: Corpus) -> List[Benchmark]:
+    """Time the merge of the results of each document into the results of the corpus."""
+    evaluator = Evaluator(corpus.true, corpus.pred, corpus.tags, loader="list", collect_indices=False)
+    tags = set(corpus.tags)
+    evaluations = [
+        _evaluate_chunk([true_doc], [pred_doc], corpus.tags, tags, evaluator.fused_strategy, index)
+        for index, (true_doc, pred_doc) in enumerate(zip(evaluator.true, evaluator.pred))
+    ]
+    strategies = list(evaluator.fused_strategy.strategy_names)
+
+    def run() -> None:
+        # Every result is already in the target, so the results of the documents are only read
+        target: Dict[str, Any] = {
+            "overall": {name: EvaluationResult() for name in strategies},
+            "entities": {tag: {name: EvaluationResult() for name in strategies} for tag in tags},
+        }
+        for evaluation in evaluations:
+            Evaluator._merge_evaluations(target, evaluation)
+
+    return [("evaluate.merge_results", run, corpus.n_entities)]
+
+
+GROUPS: Dict[str, Callable[[Corpus], List[Benchmark]]] = {
+    "loader": loader_benchmarks,
+    "strategy": strategy_benchmarks,
+    "evaluate": evaluate_benchmarks,
+    "report": report_benchmarks,
+    "merge": merge_benchmarks,
+}
+
+
+def measure(function: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Time a function as the best of several runs, then measure its peak memory in a separate run."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    # tracemalloc slows down allocations, so the memory is measured apart from the timings
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": min(timings), "mean_seconds": sum(timings) / len(timings), "peak_memory_bytes": peak}
+
+
+def git_commit() -> Optional[str]:
+    """Get the commit of the working tree, None outside of a git repository."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def package_version() -> Optional[str]:
+    """Get the installed version of nervaluate, None when it is run from the sources."""
+    try:
+        return importlib.metadata.version("nervaluate")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_corpus_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", action="append", choices=list(GROUPS), help="run only these groups of benchmarks")
+    parser.add_argument("--output", help="path of the JSON results, printed to stdout by default")
+    args = parser.parse_args()
+
+    config = config_from_arguments(args)
+    corpus = make_corpus(config)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for group in args.only or list(GROUPS):
+        for name, function, n_entities in GROUPS[group](corpus):
+            result = measure(function, args.repeat)
+            result["entities_per_second"] = n_entities / result["seconds"]
+            results[name] = result
+            print(
+                f"{name:<28} {result['seconds']:8.3f}s {result['entities_per_second']:>14,.0f} entities/s "
+                f"{result['peak_memory_bytes'] / 1e6:10.1f} MB",
+                file=sys.stderr,
+            )
+
+    report = {
+        "metadata": {
+            "commit": git_commit(),
+            "nervaluate": package_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "corpus": {**dataclasses.asdict(config), "entities": corpus.n_entities},
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
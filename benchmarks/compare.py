@@ -0,0 +1,59 @@
+"""
+Compare two results of benchmarks/bench_suite.py, such as the results of two commits.
+
+A benchmark is reported as a regression when it is slower, or uses more memory, by more than the threshold.
+
+Usage:
+    python benchmarks/compare.py before.json after.json --threshold 0.1
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def compare(before: Dict[str, Any], after: Dict[str, Any], threshold: float) -> List[str]:
+    """Print the change of the time and peak memory of each benchmark, and return the names of the regressions."""
+    if before["metadata"]["corpus"] != after["metadata"]["corpus"]:
+        print("warning: the results were measured on different corpora", file=sys.stderr)
+
+    regressions = []
+    print(f"{'benchmark':<28} {'before':>9} {'after':>9} {'time':>8} {'memory':>8}")
+    for name, result in after["results"].items():
+        if name not in before["results"]:
+            print(f"{name:<28} {'-':>9} {result['seconds']:8.3f}s")
+            continue
+        previous = before["results"][name]
+        time_ratio = result["seconds"] / previous["seconds"]
+        memory_ratio = result["peak_memory_bytes"] / max(previous["peak_memory_bytes"], 1)
+        regressed = time_ratio > 1 + threshold or memory_ratio > 1 + threshold
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:<28} {previous['seconds']:8.3f}s {result['seconds']:8.3f}s {time_ratio - 1:+8.1%} "
+            f"{memory_ratio - 1:+8.1%}{'  regression' if regressed else ''}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative increase reported as a regression")
+    args = parser.parse_args()
+
+    regressions = compare(load(args.before), load(args.after), args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
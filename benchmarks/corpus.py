@@ -0,0 +1,150 @@
+"""
+Synthetic NER corpora for the benchmarks.
+
+The corpus is generated at the token level, as BIO tags, so that the same documents can be given to every loader: the
+tags in the list format, the CoNLL content and the entity spans in the dict format.
+"""
+
+import argparse
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# Entities are 1 to 4 tokens long
+MAX_ENTITY_LENGTH = 4
+MEAN_ENTITY_LENGTH = (1 + MAX_ENTITY_LENGTH) / 2
+
+
+@dataclass
+class CorpusConfig:
+    """Parameters of a synthetic corpus."""
+
+    documents: int = 2000
+    length: int = 200
+    density: float = 0.2
+    tags: int = 10
+    overlap_rate: float = 0.2
+    label_error_rate: float = 0.1
+    miss_rate: float = 0.05
+    seed: int = 0
+
+
+@dataclass
+class Corpus:
+    """True and predicted tags of a synthetic corpus, with the entity tags."""
+
+    true: List[List[str]]
+    pred: List[List[str]]
+    tags: List[str]
+
+    @property
+    def n_entities(self) -> int:
+        """Number of true and predicted entities."""
+        return sum(tag.startswith("B-") for doc in self.true + self.pred for tag in doc)
+
+    def to_conll(self, documents: List[List[str]]) -> str:
+        """Format documents as tab delimited CoNLL content, with a blank line between documents."""
+        return "\n\n".join("\n".join(f"w\t{tag}" for tag in doc) for doc in documents)
+
+    def to_dicts(self, documents: List[List[str]]) -> List[List[Dict[str, Any]]]:
+        """Convert documents to the entity spans of the dict format."""
+        return [
+            [{"label": label, "start": start, "end": end} for label, start, end in _spans(doc)] for doc in documents
+        ]
+
+
+def make_corpus(config: CorpusConfig) -> Corpus:
+    """
+    Generate true tags and predictions with shifted boundaries, swapped labels and missed entities.
+
+    Args:
+        config: Parameters of the corpus. The density is the fraction of the tokens in a true entity and the overlap
+            rate the fraction of the predicted entities whose boundaries are shifted by one token.
+
+    Returns:
+        The generated corpus
+    """
+    rng = random.Random(config.seed)
+    tags = [f"TAG{i}" for i in range(config.tags)]
+    true, pred = [], []
+    for _ in range(config.documents):
+        true_doc = ["O"] * config.length
+        pred_doc = ["O"] * config.length
+        for label, start, end in _layout(rng, config, tags):
+            _write_entity(true_doc, label, start, end)
+
+            roll = rng.random()
+            if roll < config.miss_rate:
+                continue
+            if roll < config.miss_rate + config.overlap_rate:
+                # Entities are two tokens apart, so a shifted entity never overlaps its neighbours
+                start = min(max(0, start + rng.choice((-1, 1))), end)
+                end = min(max(start, end + rng.choice((-1, 0, 1))), config.length - 1)
+            if rng.random() < config.label_error_rate:
+                label = rng.choice(tags)
+            _write_entity(pred_doc, label, start, end)
+        true.append(true_doc)
+        pred.append(pred_doc)
+    return Corpus(true, pred, tags)
+
+
+def add_corpus_arguments(parser: argparse.ArgumentParser, defaults: Optional[CorpusConfig] = None) -> None:
+    """Add the command line options of the parameters of a corpus, with the defaults of a benchmark."""
+    defaults = defaults or CorpusConfig()
+    parser.add_argument("--documents", type=int, default=defaults.documents)
+    parser.add_argument("--length", type=int, default=defaults.length, help="tokens per document")
+    parser.add_argument("--density", type=float, default=defaults.density, help="fraction of tokens in an entity")
+    parser.add_argument("--tags", type=int, default=defaults.tags)
+    parser.add_argument(
+        "--overlap-rate", type=float, default=defaults.overlap_rate, help="fraction of predictions with shifted bounds"
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def config_from_arguments(args: argparse.Namespace) -> CorpusConfig:
+    """Get the parameters of the corpus from the options added by add_corpus_arguments()."""
+    return CorpusConfig(
+        documents=args.documents,
+        length=args.length,
+        density=args.density,
+        tags=args.tags,
+        overlap_rate=args.overlap_rate,
+        seed=args.seed,
+    )
+
+
+def _layout(rng: random.Random, config: CorpusConfig, tags: List[str]) -> List[Tuple[str, int, int]]:
+    """Place the entities of a document at random, separated by at least two tokens."""
+    n_entities = round(config.length * config.density / MEAN_ENTITY_LENGTH)
+    lengths = [rng.randint(1, MAX_ENTITY_LENGTH) for _ in range(n_entities)]
+    while lengths and sum(lengths) + 2 * len(lengths) > config.length:
+        lengths.pop()
+
+    # Spread the remaining tokens over the gaps before each entity
+    free = config.length - sum(lengths) - 2 * len(lengths)
+    cuts = sorted(rng.randint(0, free) for _ in lengths)
+    entities, position, previous_cut = [], 0, 0
+    for length, cut in zip(lengths, cuts):
+        start = position + 2 + cut - previous_cut
+        entities.append((rng.choice(tags), start, start + length - 1))
+        position, previous_cut = start + length, cut
+    return entities
+
+
+def _write_entity(document: List[str], label: str, start: int, end: int) -> None:
+    """Write the BIO tags of an entity."""
+    document[start] = f"B-{label}"
+    for position in range(start + 1, end + 1):
+        document[position] = f"I-{label}"
+
+
+def _spans(document: List[str]) -> List[Tuple[str, int, int]]:
+    """Get the (label, start, end) spans of the BIO tags of a document."""
+    spans: List[Tuple[str, int, int]] = []
+    for position, tag in enumerate(document):
+        if tag.startswith("B-"):
+            spans.append((tag[2:], position, position))
+        elif tag.startswith("I-"):
+            label, start, _ = spans[-1]
+            spans[-1] = (label, start, position)
+    return spans
@@ -1,2 +1,12 @@
+from .bootstrap import ConfidenceInterval, bootstrap_confidence_intervals
+from .counters import DocumentCounters
+from .documents import DocumentResults
 from .evaluator import Evaluator
+from .gold import GoldSet
+from .incremental import IncrementalEvaluator
+from .instrumentation import EvaluationStats, Instrumentation, PhaseStats
+from .significance import SignificanceResult, paired_significance_test
+from .spans import SpanTable
+from .state import EvaluationState, merge_states
+from .store import MappedSpanTable, open_span_store, write_span_store
 from .utils import collect_named_entities, conll_to_spans, list_to_spans, split_list
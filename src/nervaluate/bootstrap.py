@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+from .columnar import require_numpy
+from .counters import DocumentCounters, metrics_from_counts, partial_weights
+from .evaluator import Evaluator
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+METRICS = ("precision", "recall", "f1")
+
+# Upper bound on the number of (resample, document) weights held in memory at once
+_MAX_BATCH_WEIGHTS = 2**24
+
+
+@dataclass
+class ConfidenceInterval:
+    """Represents a metric computed on the whole corpus and the bounds of its bootstrap confidence interval."""
+
+    estimate: float
+    lower: float
+    upper: float
+
+
+def bootstrap_confidence_intervals(
+    counters: Union[Evaluator, DocumentCounters],
+    n_resamples: int = 1000,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+    metrics: Sequence[str] = METRICS,
+) -> Dict[str, Any]:
+    """
+    Compute percentile bootstrap confidence intervals of the metrics of each strategy and entity type.
+
+    Each document is evaluated once. A resample draws as many documents as the corpus with replacement, and its
+    counters are the product of the number of times each document is drawn with the counters of the documents, computed
+    for a batch of resamples at once as a matrix product.
+
+    Args:
+        counters: Counters of each document, or an evaluator whose documents are evaluated to get them
+        n_resamples: Number of bootstrap resamples
+        confidence: Confidence level of the intervals, between 0 and 1
+        seed: Seed of the random generator, the same seed gives the same intervals
+        metrics: Metrics to compute the intervals of, among 'precision', 'recall' and 'f1'
+
+    Returns:
+        Dictionary with the same 'overall' and 'entities' structure as Evaluator.evaluate(), mapping each strategy to
+        the ConfidenceInterval of each metric
+    """
+    require_numpy("bootstrap_confidence_intervals")
+    if n_resamples < 1:
+        raise ValueError("n_resamples must be a positive integer")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    unknown_metrics = set(metrics) - set(METRICS)
+    if unknown_metrics:
+        raise ValueError(f"Unknown metrics: {sorted(unknown_metrics)}, must be among {list(METRICS)}")
+    if isinstance(counters, Evaluator):
+        counters = DocumentCounters.from_evaluator(counters)
+    if counters.n_documents == 0:
+        raise ValueError("The bootstrap requires at least one document")
+
+    samples = resample_counts(counters, n_resamples, seed)
+    weights = partial_weights(counters.strategies)
+    bounds = [(1 - confidence) / 2, 1 - (1 - confidence) / 2]
+
+    def intervals(totals: Any, resampled: Any, weight: Any) -> Dict[str, ConfidenceInterval]:
+        """Compute the interval of each metric from the counters of the corpus and of the resamples."""
+        estimates = dict(zip(METRICS, metrics_from_counts(totals, weight)))
+        resampled_metrics = dict(zip(METRICS, metrics_from_counts(resampled, weight)))
+        return {
+            metric: ConfidenceInterval(
+                float(estimates[metric]), *(float(bound) for bound in np.quantile(resampled_metrics[metric], bounds))
+            )
+            for metric in metrics
+        }
+
+    overall_totals = counters.overall.sum(axis=0)
+    entity_totals = counters.entities.sum(axis=0)
+    overall_samples, entity_samples = counters.split_features(samples)
+
+    return {
+        "overall": {
+            name: intervals(overall_totals[position], overall_samples[:, position], weights[position])
+            for position, name in enumerate(counters.strategies)
+        },
+        "entities": {
+            tag: {
+                name: intervals(
+                    entity_totals[position, tag_position], entity_samples[:, position, tag_position], weights[position]
+                )
+                for position, name in enumerate(counters.strategies)
+            }
+            for tag_position, tag in enumerate(counters.tags)
+        },
+    }
+
+
+def resample_counts(counters: DocumentCounters, n_resamples: int, seed: Optional[int] = None) -> Any:
+    """
+    Draw bootstrap resamples of the documents and sum their counters.
+
+    Args:
+        counters: Counters of each document
+        n_resamples: Number of resamples
+        seed: Seed of the random generator
+
+    Returns:
+        Array of shape (n_resamples, features) holding the summed overall counters of each resample, flattened, followed
+        by its summed entity counters, flattened
+    """
+    require_numpy("resample_counts")
+    return _resample_features(counters.features(), n_resamples, seed)
+
+
+def _resample_features(features: Any, n_resamples: int, seed: Optional[int]) -> Any:
+    """Sum the rows of features of bootstrap resamples of the documents, drawn in batches of bounded size."""
+    n_documents = len(features)
+    rng = np.random.default_rng(seed)
+    samples = np.empty((n_resamples, features.shape[1]))
+    for start, size in _batches(n_resamples, n_documents):
+        drawn = rng.integers(0, n_documents, size=(size, n_documents))
+        # Number of times each document is drawn by each resample of the batch
+        drawn += np.arange(size)[:, None] * n_documents
+        weights = np.bincount(drawn.ravel(), minlength=size * n_documents).reshape(size, n_documents)
+        samples[start : start + size] = weights @ features
+    return samples
+
+
+def _batches(n_rounds: int, n_documents: int) -> Iterator[Tuple[int, int]]:
+    """Split rounds into batches whose (round, document) matrices hold at most _MAX_BATCH_WEIGHTS values."""
+    batch_size = max(1, _MAX_BATCH_WEIGHTS // max(n_documents, 1))
+    for start in range(0, n_rounds, batch_size):
+        yield start, min(batch_size, n_rounds - start)
@@ -0,0 +1,204 @@
+from array import array
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple, Union, overload
+
+from .entities import EvaluationIndices
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+
+INDEX_CATEGORIES = ("correct_indices", "incorrect_indices", "partial_indices", "missed_indices", "spurious_indices")
+
+
+def require_numpy(feature: str) -> None:
+    """Raise an ImportError if NumPy, an optional dependency, is not installed."""
+    if np is None:  # pragma: no cover
+        raise ImportError(f"{feature} requires numpy, install it with `pip install nervaluate[numpy]`")
+
+
+class IndexColumn(Sequence[Tuple[int, int]]):
+    """
+    Growable NumPy buffer of (instance_index, entity_index) pairs.
+
+    The pairs are stored in a two-column integer array, 16 bytes per pair with int64 instead of more than 100 bytes for
+    a list of tuples. Appended pairs are staged in a flat stdlib array and copied into the NumPy array in blocks, so
+    appending the few pairs of a document does not call into NumPy. The column behaves like a read-only list of tuples
+    of Python integers, with append() and extend() to add pairs.
+    """
+
+    _block_size = 8192
+    _typecodes = {1: "b", 2: "h", 4: "i", 8: "q"}
+
+    def __init__(self, pairs: Iterable[Tuple[int, int]] = (), dtype: Any = "int64") -> None:
+        """
+        Initialize the column.
+
+        Args:
+            pairs: Initial (instance_index, entity_index) pairs
+            dtype: Integer type of the columns, 'int32' halves the memory when the indices fit in it
+        """
+        require_numpy("IndexColumn")
+        self.dtype = np.dtype(dtype)
+        if self.dtype.kind != "i":
+            raise ValueError(f"IndexColumn expects a signed integer dtype, got {self.dtype}")
+        self._data = np.empty((0, 2), dtype=self.dtype)
+        self._size = 0
+        self._pending = self._new_pending()
+        self.extend(pairs)
+
+    def _new_pending(self) -> array:
+        return array(self._typecodes[self.dtype.itemsize])
+
+    def append(self, pair: Tuple[int, int]) -> None:
+        """Add a pair at the end of the column."""
+        self._pending.extend(pair)
+        if len(self._pending) >= self._block_size:
+            self._flush()
+
+    def extend(self, pairs: Iterable[Tuple[int, int]]) -> None:
+        """Add pairs at the end of the column, another column is copied without going through Python tuples."""
+        if not pairs:
+            return
+        # Lists are checked first, isinstance() on an abstract base class subclass is comparatively slow
+        if not isinstance(pairs, list) and isinstance(pairs, IndexColumn):
+            self._write(pairs.to_numpy())
+            return
+        self._pending.extend(chain.from_iterable(pairs))
+        if len(self._pending) >= self._block_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Copy the staged pairs into the array."""
+        if self._pending:
+            pending = np.frombuffer(self._pending, dtype=self.dtype).reshape(-1, 2)
+            self._pending = self._new_pending()
+            self._write(pending)
+
+    def compact(self) -> None:
+        """Copy the staged pairs into the array and release its unused capacity."""
+        self._flush()
+        if len(self._data) > self._size:
+            self._data = self._data[: self._size].copy()
+
+    def _write(self, block: Any) -> None:
+        """Copy a block of pairs at the end of the array, growing it geometrically."""
+        self._flush()
+        size = self._size + len(block)
+        if size > len(self._data):
+            data = np.empty((max(size, 2 * len(self._data), 16), 2), dtype=self.dtype)
+            data[: self._size] = self._data[: self._size]
+            self._data = data
+        self._data[self._size : size] = block
+        self._size = size
+
+    def to_numpy(self) -> Any:
+        """
+        Get the pairs as an array with one row per pair.
+
+        The array is a view on the buffer of the column, without copy. It is not updated by pairs added later, which
+        may move the buffer.
+        """
+        self._flush()
+        view = self._data[: self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def instances(self) -> Any:
+        """View on the instance (document) index of each pair."""
+        return self.to_numpy()[:, 0]
+
+    @property
+    def entities(self) -> Any:
+        """View on the entity index of each pair."""
+        return self.to_numpy()[:, 1]
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes used by the buffer."""
+        return int(self._data.nbytes)
+
+    def __len__(self) -> int:
+        return self._size + len(self._pending) // 2
+
+    @overload
+    def __getitem__(self, index: int) -> Tuple[int, int]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Tuple[int, int]]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Tuple[int, int], List[Tuple[int, int]]]:
+        rows = self.to_numpy()[index]
+        if isinstance(index, slice):
+            return [(pair[0], pair[1]) for pair in rows.tolist()]
+        instance, entity = rows.tolist()
+        return instance, entity
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        for instance, entity in self.to_numpy().tolist():
+            yield instance, entity
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, IndexColumn):
+            return bool(np.array_equal(self.to_numpy(), other.to_numpy()))
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(
+                tuple(pair) == tuple(other_pair) for pair, other_pair in zip(self, other)
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"IndexColumn({list(self)!r})"
+
+    def __getstate__(self) -> Any:
+        self._flush()
+        return {"dtype": self.dtype, "data": self._data[: self._size].copy()}
+
+    def __setstate__(self, state: Any) -> None:
+        self.dtype = state["dtype"]
+        self._data = state["data"]
+        self._size = len(self._data)
+        self._pending = self._new_pending()
+
+
+@dataclass(eq=False)
+class ColumnarEvaluationIndices(EvaluationIndices):
+    """
+    Evaluation indices stored in NumPy columns.
+
+    Each category is an IndexColumn instead of a list of tuples, which can be iterated and compared like a list.
+    """
+
+    def __post_init__(self) -> None:
+        for category in INDEX_CATEGORIES:
+            setattr(self, category, IndexColumn(getattr(self, category) or ()))
+
+    def compact(self) -> None:
+        """Release the unused capacity of each column."""
+        for category in INDEX_CATEGORIES:
+            getattr(self, category).compact()
+
+    @classmethod
+    def from_indices(cls, indices: EvaluationIndices, dtype: Any = "int64") -> "ColumnarEvaluationIndices":
+        """
+        Copy evaluation indices into NumPy columns.
+
+        Args:
+            indices: Evaluation indices to copy
+            dtype: Integer type of the columns
+        """
+        columnar = cls()
+        for category in INDEX_CATEGORIES:
+            setattr(columnar, category, IndexColumn(getattr(indices, category), dtype))
+        return columnar
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, EvaluationIndices):
+            return NotImplemented
+        return all(getattr(self, category) == getattr(other, category) for category in INDEX_CATEGORIES)
+
+    __hash__ = None  # type: ignore[assignment]
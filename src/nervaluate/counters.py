@@ -0,0 +1,152 @@
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple
+
+from .columnar import require_numpy
+from .documents import STRATEGIES, DocumentResults
+from .evaluator import Evaluator
+from .state import COUNTERS, PARTIAL_CREDIT_STRATEGIES
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+
+@dataclass
+class DocumentCounters:
+    """
+    Counters of each document, strategy and entity type, in NumPy arrays.
+
+    `overall` has shape (documents, strategies, 5) and `entities` has shape (documents, strategies, tags, 5), the last
+    axis holding the correct, incorrect, partial, missed and spurious counters. Summing over the documents gives the
+    counters of Evaluator.evaluate(), and summing over a resample of the documents gives the counters of the evaluation
+    of the resampled corpus, without evaluating its documents again.
+    """
+
+    overall: Any
+    entities: Any
+    tags: List[str]
+    strategies: Tuple[str, ...] = STRATEGIES
+
+    @property
+    def n_documents(self) -> int:
+        """Number of documents."""
+        return int(self.overall.shape[0])
+
+    @classmethod
+    def from_evaluator(
+        cls, evaluator: Evaluator, n_jobs: Optional[int] = None, chunk_size: Optional[int] = None
+    ) -> "DocumentCounters":
+        """
+        Evaluate the documents of an evaluator and keep the counters of each document.
+
+        Args:
+            evaluator: Evaluator whose documents, tags, overlap threshold and matching engine are used
+            n_jobs: Number of worker processes, as in Evaluator.evaluate()
+            chunk_size: Number of documents evaluated by a worker at a time, as in Evaluator.evaluate()
+
+        Returns:
+            The counters of each document, for the tags used in the true or predicted entities
+        """
+        require_numpy("DocumentCounters")
+        if evaluator.document_results:
+            # The results of each document are part of the cached evaluation
+            return cls.from_document_results(evaluator.evaluate(n_jobs, chunk_size)["documents"])
+        # The documents are evaluated as by evaluate(), recording the results of each document without the indices
+        evaluation = evaluator._evaluate_documents(n_jobs, chunk_size, document_results=True, collect_indices=False)
+        return cls.from_document_results(evaluation["documents"])
+
+    @classmethod
+    def from_document_results(cls, documents: DocumentResults) -> "DocumentCounters":
+        """
+        Get the counters of the documents recorded in a table of the results of each document.
+
+        Args:
+            documents: Results of each document, as returned by Evaluator.evaluate() with document_results=True
+
+        Returns:
+            The counters of each document, for the entity types of the table
+        """
+        require_numpy("DocumentCounters")
+        n_documents, n_strategies = len(documents), len(STRATEGIES)
+        overall = np.asarray(documents.overall, dtype=np.int64).reshape(n_documents, n_strategies, len(COUNTERS))
+        entities = np.zeros((n_documents, n_strategies, len(documents.tags), len(COUNTERS)), dtype=np.int64)
+        # Each row of the entity columns holds the counters of the entity types found in a document
+        entities[np.asarray(documents.entity_documents), :, np.asarray(documents.entity_tags)] = np.asarray(
+            documents.entities, dtype=np.int64
+        ).reshape(-1, n_strategies, len(COUNTERS))
+        return cls(overall, entities, list(documents.tags))
+
+    def with_tags(self, tags: Sequence[str]) -> "DocumentCounters":
+        """
+        Get the counters of other entity types, such as the union of the entity types of two systems.
+
+        Args:
+            tags: Entity types of the new counters, those without counters here get zero counters
+
+        Returns:
+            Counters with the same documents and strategies for the given entity types
+        """
+        positions = {tag: position for position, tag in enumerate(self.tags)}
+        entities = np.zeros(self.entities.shape[:2] + (len(tags),) + self.entities.shape[3:], dtype=self.entities.dtype)
+        for position, tag in enumerate(tags):
+            if tag in positions:
+                entities[:, :, position] = self.entities[:, :, positions[tag]]
+        return DocumentCounters(self.overall, entities, list(tags), self.strategies)
+
+    def features(self) -> Any:
+        """Get the overall and entity counters of each document, flattened into one row of floats per document."""
+        n_documents = self.n_documents
+        return np.concatenate(
+            [self.overall.reshape(n_documents, -1), self.entities.reshape(n_documents, -1)], axis=1
+        ).astype(np.float64)
+
+    def split_features(self, rows: Any) -> Tuple[Any, Any]:
+        """
+        Split rows of summed features, such as the counters of resamples, into overall and entity counters.
+
+        Args:
+            rows: Array of shape (rows, features) of sums of rows of features()
+
+        Returns:
+            The overall counters, of shape (rows, strategies, 5), and the entity counters, of shape
+            (rows, strategies, tags, 5)
+        """
+        n_rows, n_strategies, n_counters = len(rows), len(self.strategies), len(COUNTERS)
+        n_overall = n_strategies * n_counters
+        return (
+            rows[:, :n_overall].reshape(n_rows, n_strategies, n_counters),
+            rows[:, n_overall:].reshape(n_rows, n_strategies, len(self.tags), n_counters),
+        )
+
+
+def partial_weights(strategies: Sequence[str]) -> Any:
+    """Get the weight of the partial matches in the precision and recall of each strategy, as Evaluator reports them."""
+    require_numpy("partial_weights")
+    return np.array([0.5 if name in PARTIAL_CREDIT_STRATEGIES else 0.0 for name in strategies])
+
+
+def metrics_from_counts(counts: Any, partial_weight: Any) -> Tuple[Any, Any, Any]:
+    """
+    Compute the precision, recall and F1 score of arrays of counters, as EvaluationResult.compute_metrics() does.
+
+    Args:
+        counts: Array of counters whose last axis holds the correct, incorrect, partial, missed and spurious counters
+        partial_weight: Weight of the partial matches, broadcast against the other axes of the counters
+
+    Returns:
+        The precision, recall and F1 score arrays, with the shape of the counters without their last axis
+    """
+    require_numpy("metrics_from_counts")
+    counts = np.asarray(counts, dtype=np.float64)
+    correct, incorrect, partial, missed, spurious = (counts[..., position] for position in range(len(COUNTERS)))
+    actual = correct + incorrect + partial + spurious
+    possible = correct + incorrect + partial + missed
+    score = correct + partial_weight * partial
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(actual > 0, score / actual, 0.0)
+        recall = np.where(possible > 0, score / possible, 0.0)
+        total = precision + recall
+        f1 = np.where(total > 0, 2 * (precision * recall) / total, 0.0)
+    return precision, recall, f1
@@ -0,0 +1,240 @@
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .entities import EvaluationIndices, EvaluationResult
+from .state import COUNTERS, PARTIAL_CREDIT_STRATEGIES
+from .strategies import FusedEvaluation
+
+STRATEGIES = FusedEvaluation.strategy_names
+METRICS = ("precision", "recall", "f1")
+
+# Evaluation results of each strategy, as returned by FusedEvaluation.evaluate()
+Outcomes = Dict[str, Tuple[EvaluationResult, Optional[EvaluationIndices]]]
+
+
+class DocumentResults:
+    """
+    Counters of each document, strategy and entity type, in flat integer columns.
+
+    Each document has a row of counters, the correct, incorrect, partial, missed and spurious counters of each strategy,
+    and each entity type found in a document has a row of counters in the entity columns, along with the index of the
+    document and of the entity type. The rows are recorded during the evaluation, and EvaluationResult objects are
+    only built for the documents that are accessed or selected by a query.
+    """
+
+    def __init__(self, tags: Sequence[str]) -> None:
+        """
+        Initialize an empty table.
+
+        Args:
+            tags: Entity types with a column of results, the other entity types are ignored
+        """
+        self.tags = list(tags)
+        self._tag_ids = {tag: tag_id for tag_id, tag in enumerate(self.tags)}
+        self._width = len(STRATEGIES) * len(COUNTERS)
+        self.overall = array("i")
+        self.entity_documents = array("q")
+        self.entity_tags = array("i")
+        self.entities = array("i")
+
+    def __len__(self) -> int:
+        return len(self.overall) // self._width
+
+    def add(self, document: int, outcomes: Outcomes, tag_outcomes: Dict[str, Outcomes]) -> None:
+        """
+        Record the counters of the next document.
+
+        Args:
+            document: Index of the document in the corpus
+            outcomes: Evaluation results of each strategy over all the entities of the document
+            tag_outcomes: Evaluation results of each strategy over the entities of each entity type of the document
+        """
+        overall, entities = self.overall, self.entities
+        for name in STRATEGIES:
+            overall.extend(_counters(outcomes[name][0]))
+        for tag, tag_results in tag_outcomes.items():
+            tag_id = self._tag_ids.get(tag)
+            if tag_id is not None:
+                self.entity_documents.append(document)
+                self.entity_tags.append(tag_id)
+                for name in STRATEGIES:
+                    entities.extend(_counters(tag_results[name][0]))
+
+    def extend(self, other: "DocumentResults") -> None:
+        """Add the rows of the documents following the documents of this table, such as the next chunk."""
+        if other.tags != self.tags:
+            raise ValueError("Cannot extend document results with different tags")
+        self.overall.extend(other.overall)
+        self.entity_documents.extend(other.entity_documents)
+        self.entity_tags.extend(other.entity_tags)
+        self.entities.extend(other.entities)
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes used by the columns."""
+        columns = (self.overall, self.entity_documents, self.entity_tags, self.entities)
+        return sum(len(column) * column.itemsize for column in columns)
+
+    def result(self, document: int, strategy: str = "strict", tag: Optional[str] = None) -> EvaluationResult:
+        """
+        Build the evaluation result of a document.
+
+        Args:
+            document: Index of the document
+            strategy: Name of the strategy
+            tag: Entity type, the result is over all the entities when None
+
+        Returns:
+            The result of the evaluation of the document alone, with its metrics
+        """
+        if not 0 <= document < len(self):
+            raise IndexError(f"Document index out of range: {document}")
+        offset = self._strategy_offset(strategy)
+        if tag is None:
+            return _result(self.overall, document * self._width + offset, strategy)
+        tag_id = self._tag_id(tag)
+        for row in self._entity_rows(document):
+            if self.entity_tags[row] == tag_id:
+                return _result(self.entities, row * self._width + offset, strategy)
+        # The document has no entity of this type
+        return EvaluationResult()
+
+    def _entity_rows(self, document: int) -> range:
+        """Rows of the entity columns of a document, the rows are recorded in document order."""
+        return range(bisect_left(self.entity_documents, document), bisect_right(self.entity_documents, document))
+
+    def results(self, document: int) -> Dict[str, Any]:
+        """
+        Build the evaluation results of a document.
+
+        Returns:
+            Dictionary containing the results of the document for each strategy and for each entity type found in it,
+            with the same 'overall' and 'entities' structure as Evaluator.evaluate()
+        """
+        return {
+            "overall": {name: self.result(document, name) for name in STRATEGIES},
+            "entities": {
+                self.tags[self.entity_tags[row]]: {
+                    name: _result(self.entities, row * self._width + self._strategy_offset(name), name)
+                    for name in STRATEGIES
+                }
+                for row in self._entity_rows(document)
+            },
+        }
+
+    def nsmallest(
+        self, k: int, key: str = "f1", strategy: str = "strict", tag: Optional[str] = None
+    ) -> List[Tuple[int, EvaluationResult]]:
+        """
+        Find the documents with the smallest value of a metric or counter, e.g. the lowest strict F1 scores.
+
+        Args:
+            k: Number of documents
+            key: Metric ('precision', 'recall' or 'f1') or counter ('correct', 'incorrect', 'partial', 'missed' or
+                'spurious') to sort the documents by
+            strategy: Name of the strategy
+            tag: Entity type, only the documents with entities of this type are ranked, all the documents over all
+                their entities are ranked when None
+
+        Returns:
+            The index and the evaluation result of each document, sorted by the key, ties in document order
+        """
+        return self._select(heapq.nsmallest, k, key, strategy, tag)
+
+    def nlargest(
+        self, k: int, key: str = "spurious", strategy: str = "strict", tag: Optional[str] = None
+    ) -> List[Tuple[int, EvaluationResult]]:
+        """
+        Find the documents with the largest value of a metric or counter, e.g. the most spurious entities.
+
+        Args:
+            k: Number of documents
+            key: Metric or counter to sort the documents by, see nsmallest()
+            strategy: Name of the strategy
+            tag: Entity type, see nsmallest()
+
+        Returns:
+            The index and the evaluation result of each document, sorted by the key, ties in document order
+        """
+        return self._select(heapq.nlargest, k, key, strategy, tag)
+
+    def _select(
+        self, select: Callable[..., List[int]], k: int, key: str, strategy: str, tag: Optional[str]
+    ) -> List[Tuple[int, EvaluationResult]]:
+        """Rank the rows of the overall or entity columns by a key and build the results of the selected ones."""
+        if k < 0:
+            raise ValueError("k must be a non-negative integer")
+        if key not in COUNTERS and key not in METRICS:
+            raise ValueError(f"Unknown key: {key}, must be one of {list(COUNTERS) + list(METRICS)}")
+        offset = self._strategy_offset(strategy)
+        documents: Sequence[int]
+        rows: Iterable[int]
+        if tag is None:
+            # Each document has a row of the overall columns
+            column, documents = self.overall, range(len(self))
+            rows = documents
+        else:
+            tag_id = self._tag_id(tag)
+            column, documents = self.entities, self.entity_documents
+            rows = (row for row, row_tag in enumerate(self.entity_tags) if row_tag == tag_id)
+
+        # The rows are ranked on their counters, and only the selected rows are built into results
+        selected = select(k, rows, key=_key_function(column, self._width, offset, key, strategy))
+        return [(documents[row], _result(column, row * self._width + offset, strategy)) for row in selected]
+
+    def _strategy_offset(self, strategy: str) -> int:
+        """Position of the counters of a strategy in a row."""
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}, must be one of {list(STRATEGIES)}")
+        return STRATEGIES.index(strategy) * len(COUNTERS)
+
+    def _tag_id(self, tag: str) -> int:
+        """Position of an entity type in the tags."""
+        if tag not in self._tag_ids:
+            raise ValueError(f"Unknown tag: {tag}, must be one of {self.tags}")
+        return self._tag_ids[tag]
+
+
+# Counters of an evaluation result, in the order of COUNTERS
+_counters = attrgetter(*COUNTERS)
+
+
+def _result(column: array, start: int, strategy: str) -> EvaluationResult:
+    """Build the evaluation result of the counters at a position of a column."""
+    result = EvaluationResult(*column[start : start + len(COUNTERS)])
+    # Each row holds the counters of a single document
+    result.compute_metrics(partial_or_type=strategy in PARTIAL_CREDIT_STRATEGIES)
+    return result
+
+
+def _key_function(column: array, width: int, offset: int, key: str, strategy: str) -> Callable[[int], float]:
+    """
+    Get the function computing the key of a row of a column.
+
+    The metrics are computed from the counters in the column, as by _result() but without building an EvaluationResult
+    for each ranked row.
+    """
+    if key in COUNTERS:
+        position = offset + COUNTERS.index(key)
+        return lambda row: column[row * width + position]
+
+    weight = 0.5 if strategy in PARTIAL_CREDIT_STRATEGIES else 0.0
+
+    def metric(row: int) -> float:
+        start = row * width + offset
+        correct, incorrect, partial, missed, spurious = column[start : start + len(COUNTERS)]
+        score = correct + weight * partial
+        actual = correct + incorrect + partial + spurious
+        precision = score / actual if actual > 0 else 0
+        if key == "precision":
+            return precision
+        possible = correct + incorrect + partial + missed
+        recall = score / possible if possible > 0 else 0
+        if key == "recall":
+            return recall
+        return 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0
+
+    return metric
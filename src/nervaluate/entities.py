@@ -2,9 +2,14 @@ from dataclasses import dataclass
 from typing import List, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class Entity:
-    """Represents a named entity with its position and label."""
+    """
+    Represents a named entity with its position and label.
+
+    Entities use __slots__ instead of a per-instance __dict__. Large corpora can be stored in a SpanTable, which keeps
+    the entities in flat arrays and creates Entity objects on access.
+    """
 
     label: str
     start: int
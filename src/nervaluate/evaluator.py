@@ -1,6 +1,31 @@
-from typing import List, Dict, Any, Union, Optional
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from bisect import bisect_left
+from contextlib import nullcontext
+from itertools import repeat
+from typing import (
+    List,
+    Dict,
+    Any,
+    Callable,
+    ContextManager,
+    Iterator,
+    Mapping,
+    Union,
+    Optional,
+    Sequence,
+    Set,
+    TextIO,
+    Tuple,
+    TypeVar,
+    cast,
+)
 import csv
+import functools
 import io
+import math
+import os
+import time
 
 from .entities import EvaluationResult, EvaluationIndices
 from .strategies import (
@@ -9,16 +34,104 @@ from .strategies import (
     PartialEvaluation,
     EntityTypeEvaluation,
     ExactEvaluation,
+    FusedEvaluation,
+    OverlapThresholdEvaluation,
 )
-from .loaders import DataLoader, ConllLoader, ListLoader, DictLoader
+from .loaders import ArrayLoader, DataLoader, ConllLoader, ListLoader, DictLoader, load_documents
+from .state import COUNTERS, PARTIAL_CREDIT_STRATEGIES, EvaluationState
+from .spans import DocumentSpans, SpanTable
+from .vocabulary import LabelVocabulary
+from .columnar import INDEX_CATEGORIES, ColumnarEvaluationIndices, require_numpy
+from .vectorized import NumpyEvaluation
 from .entities import Entity
+from .instrumentation import EvaluationStats, Instrumentation, PhaseStats, PhaseTimer
+from .documents import DocumentResults
+
+# Phases of the evaluation of each document recorded by an Instrumentation, in the order they run
+EVALUATION_PHASES = ("evaluate.select", "evaluate.match", "evaluate.match_by_label", "evaluate.merge")
+
+# ANSI color codes of the report of the indices
+_REPORT_COLORS = {
+    "reset": "\033[0m",
+    "bold": "\033[1m",
+    "red": "\033[91m",
+    "green": "\033[92m",
+    "yellow": "\033[93m",
+    "blue": "\033[94m",
+    "magenta": "\033[95m",
+    "cyan": "\033[96m",
+    "white": "\033[97m",
+}
+
+# Color of each category of the report of the indices
+_CATEGORY_COLORS = {
+    "Correct": "green",
+    "Incorrect": "red",
+    "Partial": "yellow",
+    "Missed": "magenta",
+    "Spurious": "blue",
+}
+
+
+_Report = TypeVar("_Report", bound=Callable[..., Any])
+
+
+def _report_phase(name: str) -> Callable[[_Report], _Report]:
+    """Record the calls of a report method as a phase of the instrumentation of the evaluator."""
+
+    def decorator(method: _Report) -> _Report:
+        @functools.wraps(method)
+        def wrapper(self: "Evaluator", *args: Any, **kwargs: Any) -> Any:
+            if self.instrumentation is None:
+                return method(self, *args, **kwargs)
+            # Evaluate first, the evaluation is its own phase and the report only times the formatting of the results,
+            # which the report takes from _report_results() instead of evaluating again
+            self._reported_results = self.evaluate()
+            try:
+                with self.instrumentation.phase(name, documents=len(self.true)):
+                    return method(self, *args, **kwargs)
+            finally:
+                self._reported_results = None
+
+        return cast(_Report, wrapper)
+
+    return decorator
+
+
+@dataclass
+class CacheInfo:
+    """Represents the state of the evaluation results cache of an Evaluator."""
+
+    hits: int = 0
+    misses: int = 0
+    cached: bool = False
+    last_hit: bool = False
 
 
 class Evaluator:
-    """Main evaluator class for NER evaluation."""
-
-    def __init__(
-        self, true: Any, pred: Any, tags: List[str], loader: str = "default", min_overlap_percentage: float = 1.0
+    """
+    Main evaluator class for NER evaluation.
+
+    The results of evaluate() are cached, so the report methods can be called repeatedly without re-running the
+    evaluation. The cache is invalidated when `true`, `pred`, `tags`, `min_overlap_percentage` or `collect_indices` are
+    reassigned or when the tags are changed in place. Call refresh() after modifying the loaded entities in place.
+    """
+
+    def __init__(  # pylint: disable=too-many-positional-arguments
+        self,
+        true: Any,
+        pred: Any,
+        tags: List[str],
+        loader: str = "default",
+        min_overlap_percentage: float = 1.0,
+        *,
+        matching: str = "pairwise",
+        collect_indices: bool = True,
+        indices_storage: str = "list",
+        entity_storage: str = "list",
+        backend: str = "python",
+        instrumentation: Optional[Instrumentation] = None,
+        document_results: bool = False,
     ) -> None:
         """
         Initialize the evaluator.
@@ -29,13 +142,206 @@ class Evaluator:
             tags: List of valid entity tags
             loader: Name of the loader to use
             min_overlap_percentage: Minimum overlap percentage for partial matches (1-100)
+            matching: Matching engine used by the strategies, 'pairwise' compares every pair of entities and 'sweep'
+                only compares overlapping entities, both produce the same results
+            collect_indices: Whether to collect the indices of the entities in each category. Without them only the
+                counters are computed, which saves memory on large corpora, and summary_report_indices() is not
+                available.
+            indices_storage: How the indices are stored, 'list' for lists of tuples and 'numpy' for NumPy columns of
+                integers, which take much less memory and can be iterated and compared like lists
+            entity_storage: How the loaded entities are stored, 'list' for lists of Entity and 'table' for two
+                SpanTables sharing a label vocabulary built from the tags, which take much less memory and let
+                documents be filtered on integer label ids
+            backend: How the documents are evaluated, 'python' evaluates them one by one and 'numpy' evaluates the
+                whole corpus at once with vectorized NumPy operations, which is faster on large corpora. The 'numpy'
+                backend only computes the counters and requires collect_indices=False.
+            instrumentation: When given, the time spent loading the data, in each phase of the evaluation and in each
+                report is recorded in its stats and passed to its hooks
+            document_results: Whether to record the counters of each document in a DocumentResults table, returned
+                by evaluate() under the 'documents' key, to find the documents with the worst results
         """
+        self.instrumentation = instrumentation
+        self._cache: Optional[Dict[str, Any]] = None
+        self._cache_tags: Tuple[str, ...] = ()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_last_hit = False
+        self._reported_results: Optional[Dict[str, Any]] = None
         self.tags = tags
         self.min_overlap_percentage = min_overlap_percentage
+        self.matching = matching
+        self.collect_indices = collect_indices
+        self.document_results = document_results
+        if indices_storage not in {"list", "numpy"}:
+            raise ValueError(f"Unknown indices storage: {indices_storage}")
+        if indices_storage == "numpy":
+            require_numpy("indices_storage='numpy'")
+        self.indices_storage = indices_storage
+        if entity_storage not in {"list", "table"}:
+            raise ValueError(f"Unknown entity storage: {entity_storage}")
+        self.entity_storage = entity_storage
+        if backend not in {"python", "numpy"}:
+            raise ValueError(f"Unknown backend: {backend}")
+        if backend == "numpy":
+            require_numpy("backend='numpy'")
+        self.backend = backend
+        self._check_backend()
         self._setup_loaders()
         self._load_data(true, pred, loader)
         self._setup_evaluation_strategies()
 
+    @classmethod
+    def from_arrays(  # pylint: disable=too-many-positional-arguments
+        cls,
+        true: Any,
+        pred: Any,
+        id2tag: Union[Sequence[str], Mapping[int, str]],
+        tags: List[str],
+        lengths: Optional[Any] = None,
+        mask: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> "Evaluator":
+        """
+        Create an evaluator from the true and predicted tag ids of a batch, as output by a token classification model.
+
+        The tag ids are decoded by an ArrayLoader straight into two SpanTables sharing a label vocabulary built from
+        the tags, without converting them to tag strings and checking the length of each document.
+
+        Args:
+            true: True tag ids, a padded 2-D array or a sequence of 1-D tag id sequences
+            pred: Predicted tag ids, in the same format and with the same shape as the true tag ids
+            id2tag: Tag of each tag id, as a list indexed by tag id or a mapping from tag id to tag
+            tags: List of valid entity tags
+            lengths: Number of tokens of each document of padded arrays
+            mask: Boolean array of the shape of padded arrays selecting the tokens to evaluate, e.g. an attention
+                mask, cannot be combined with lengths
+            **kwargs: Other arguments of the Evaluator, such as min_overlap_percentage or backend
+
+        Returns:
+            The evaluator of the decoded entities
+        """
+        true_shape, pred_shape = _tag_ids_shape(true), _tag_ids_shape(pred)
+        if true_shape != pred_shape:
+            raise ValueError(f"True and predicted tag ids have different shapes: true={true_shape}, pred={pred_shape}")
+
+        loader = ArrayLoader(id2tag)
+        vocabulary = LabelVocabulary(tags)
+        true_table = loader.load_table(true, vocabulary, lengths, mask)
+        pred_table = loader.load_table(pred, vocabulary, lengths, mask)
+        return cls(true_table, pred_table, tags, **kwargs)
+
+    @property
+    def true(self) -> Sequence[Sequence[Entity]]:
+        """The loaded true entities of each document."""
+        return self._true
+
+    @true.setter
+    def true(self, value: Sequence[Sequence[Entity]]) -> None:
+        self._true = value
+        self.clear_cache()
+
+    @property
+    def pred(self) -> Sequence[Sequence[Entity]]:
+        """The loaded predicted entities of each document."""
+        return self._pred
+
+    @pred.setter
+    def pred(self, value: Sequence[Sequence[Entity]]) -> None:
+        self._pred = value
+        self.clear_cache()
+
+    @property
+    def tags(self) -> List[str]:
+        """The entity tags to evaluate."""
+        return self._tags
+
+    @tags.setter
+    def tags(self, value: List[str]) -> None:
+        self._tags = value
+        self.clear_cache()
+
+    @property
+    def min_overlap_percentage(self) -> float:
+        """The minimum overlap percentage for partial matches."""
+        return self._min_overlap_percentage
+
+    @min_overlap_percentage.setter
+    def min_overlap_percentage(self, value: float) -> None:
+        self._min_overlap_percentage = value
+        self.clear_cache()
+        if hasattr(self, "strategies"):
+            self._setup_evaluation_strategies()
+
+    @property
+    def collect_indices(self) -> bool:
+        """Whether the indices of the entities in each category are collected."""
+        return self._collect_indices
+
+    @collect_indices.setter
+    def collect_indices(self, value: bool) -> None:
+        self._collect_indices = value
+        self.clear_cache()
+        if hasattr(self, "strategies"):
+            self._setup_evaluation_strategies()
+
+    @property
+    def document_results(self) -> bool:
+        """Whether the counters of each document are recorded."""
+        return self._document_results
+
+    @document_results.setter
+    def document_results(self, value: bool) -> None:
+        self._document_results = value
+        self.clear_cache()
+
+    def _require_indices(self, method: str) -> None:
+        """Check that the indices are collected, raising a ValueError otherwise."""
+        if not self.collect_indices:
+            raise ValueError(
+                f"{method}() requires the evaluation indices, which are not collected when collect_indices=False"
+            )
+
+    def _check_backend(self) -> None:
+        """Check that the backend supports the evaluation options, raising a ValueError otherwise."""
+        if self.backend == "numpy" and self.collect_indices:
+            raise ValueError("backend='numpy' only computes the counters, use collect_indices=False")
+        if self.backend == "numpy" and self.document_results:
+            raise ValueError("backend='numpy' only computes the counters of the corpus, use document_results=False")
+
+    def clear_cache(self) -> None:
+        """Drop the cached evaluation results, the next call to evaluate() runs the evaluation again."""
+        self._cache = None
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Get the state of the evaluation results cache.
+
+        Returns:
+            The number of cache hits and misses, whether results are currently cached and whether the last call to
+            evaluate() was served from the cache
+        """
+        return CacheInfo(
+            hits=self._cache_hits, misses=self._cache_misses, cached=self._is_cached(), last_hit=self._cache_last_hit
+        )
+
+    def _is_cached(self) -> bool:
+        """Check whether the cached results are still valid, tags can be modified in place."""
+        return self._cache is not None and self._cache_tags == tuple(self.tags)
+
+    def refresh(self, n_jobs: Optional[int] = None, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run the evaluation again, ignoring and replacing the cached results.
+
+        Args:
+            n_jobs: Number of worker processes, see evaluate()
+            chunk_size: Number of documents sent to a worker at once, see evaluate()
+
+        Returns:
+            Dictionary containing evaluation results for each strategy and entity type
+        """
+        self.clear_cache()
+        return self.evaluate(n_jobs, chunk_size)
+
     def _setup_loaders(self) -> None:
         """Setup available data loaders."""
         self.loaders: Dict[str, DataLoader] = {"conll": ConllLoader(), "list": ListLoader(), "dict": DictLoader()}
@@ -43,119 +349,339 @@ class Evaluator:
     def _setup_evaluation_strategies(self) -> None:
         """Setup evaluation strategies with overlap threshold."""
         self.strategies: Dict[str, EvaluationStrategy] = {
-            "strict": StrictEvaluation(self.min_overlap_percentage),
-            "partial": PartialEvaluation(self.min_overlap_percentage),
-            "ent_type": EntityTypeEvaluation(self.min_overlap_percentage),
-            "exact": ExactEvaluation(self.min_overlap_percentage),
+            "strict": StrictEvaluation(self.min_overlap_percentage, self.matching),
+            "partial": PartialEvaluation(self.min_overlap_percentage, self.matching),
+            "ent_type": EntityTypeEvaluation(self.min_overlap_percentage, self.matching),
+            "exact": ExactEvaluation(self.min_overlap_percentage, self.matching),
         }
+        # Produces the same results as the strategies above, in a single pass over each document
+        self.fused_strategy = FusedEvaluation(self.min_overlap_percentage, self.matching, self.collect_indices)
+        self.numpy_evaluation = (
+            NumpyEvaluation(self.min_overlap_percentage, self.matching) if self.backend == "numpy" else None
+        )
 
     def _load_data(self, true: Any, pred: Any, loader: str) -> None:
         """Load the true and predicted data."""
-        if loader == "default":
-            # Try to infer the loader based on input type
-            if isinstance(true, str):
-                loader = "conll"
-            elif isinstance(true, list) and true and isinstance(true[0], list):
-                if isinstance(true[0][0], dict):
-                    loader = "dict"
-                else:
-                    loader = "list"
-            else:
-                raise ValueError("Could not infer loader from input type")
+        vocabulary = LabelVocabulary(self.tags) if self.entity_storage == "table" else None
+        with self._phase("load") as stats:
+            self.true, self.pred = load_documents(true, pred, loader, self.loaders, vocabulary)
+            if self.instrumentation is not None:
+                stats.documents = len(self.true)
+                stats.entities = _count_entities(self.true) + _count_entities(self.pred)
+
+    def _phase(self, name: str) -> ContextManager[PhaseStats]:
+        """Time a block of code as a call of a phase when instrumented, the yielded stats are discarded otherwise."""
+        if self.instrumentation is None:
+            return nullcontext(PhaseStats())
+        return self.instrumentation.phase(name)
+
+    def evaluate(self, n_jobs: Optional[int] = None, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run the evaluation, or return the cached results of a previous run on the same data.
 
-        if loader not in self.loaders:
-            raise ValueError(f"Unknown loader: {loader}")
+        The returned dictionary is shared between calls and should not be modified.
 
-        # For list loader, check document lengths before loading
-        if loader == "list":
-            if len(true) != len(pred):
-                raise ValueError("Number of predicted documents does not equal true")
+        Args:
+            n_jobs: Number of worker processes, documents are evaluated in chunks by a process pool when greater
+                than 1, and -1 uses all the CPUs. The results are identical to a serial run.
+            chunk_size: Number of documents sent to a worker at once, by default the documents are split into about
+                four chunks per worker
 
-            # Check that each document has the same length
-            for i, (true_doc, pred_doc) in enumerate(zip(true, pred)):
-                if len(true_doc) != len(pred_doc):
-                    raise ValueError(f"Document {i} has different lengths: true={len(true_doc)}, pred={len(pred_doc)}")
+        Returns:
+            Dictionary containing evaluation results for each strategy and entity type, their indices unless
+            collect_indices is False, and the DocumentResults table of each document when document_results is True
+        """
+        if n_jobs is not None and n_jobs < 1 and n_jobs != -1:
+            raise ValueError("n_jobs must be a positive integer or -1")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        if self._cache is not None and self._is_cached():
+            self._cache_hits += 1
+            self._cache_last_hit = True
+            return self._cache
+
+        self._cache_misses += 1
+        self._cache_last_hit = False
+        self._cache_tags = tuple(self.tags)
+        self._cache = self._evaluate(n_jobs, chunk_size)
+        return self._cache
+
+    def _report_results(self) -> Dict[str, Any]:
+        """Results formatted by a report, already evaluated when the report is timed by the instrumentation."""
+        if self._reported_results is not None:
+            return self._reported_results
+        return self.evaluate()
+
+    def evaluate_thresholds(self, thresholds: Sequence[float]) -> Dict[str, Any]:
+        """
+        Evaluate the counters and metrics at several minimum overlap percentages in a single pass over the documents.
 
-        self.true = self.loaders[loader].load(true)
-        self.pred = self.loaders[loader].load(pred)
+        The overlap of each candidate pair of entities is computed once, and the results at each threshold are the
+        ones of evaluate() with that min_overlap_percentage. The results are not cached.
 
-        if len(self.true) != len(self.pred):
-            raise ValueError("Number of predicted documents does not equal true")
+        Args:
+            thresholds: Minimum overlap percentages to evaluate (1-100)
 
-    def evaluate(self) -> Dict[str, Any]:
+        Returns:
+            Dictionary with the sorted thresholds, without duplicates, the curve of the overall results of each
+            strategy, as a list with the results at each threshold, and the curve of each entity type and strategy
         """
-        Run the evaluation.
+        threshold_evaluation = OverlapThresholdEvaluation(thresholds, self.matching)
+        n_thresholds = len(threshold_evaluation.thresholds)
+        used_tags = (_used_labels(self.true) | _used_labels(self.pred)).intersection(self.tags)
+        # Change of the counters of each strategy from one threshold to the next, summed over the documents
+        overall_changes = [[0] * (len(FusedEvaluation.strategy_names) * len(COUNTERS)) for _ in range(n_thresholds)]
+        entity_changes = {tag: [list(row) for row in overall_changes] for tag in used_tags}
+
+        with self._phase("evaluate.thresholds") as stats:
+            for _, true_doc, pred_doc in _select_documents(self.true, self.pred, self.tags):
+                stats.documents += 1
+                stats.entities += len(true_doc) + len(pred_doc)
+
+                _add_threshold_runs(overall_changes, threshold_evaluation.evaluate(true_doc, pred_doc))
+                for tag, runs in threshold_evaluation.evaluate_by_label(true_doc, pred_doc).items():
+                    _add_threshold_runs(entity_changes[tag], runs)
+
+        curves: Dict[str, Any] = {"thresholds": threshold_evaluation.thresholds, "overall": {}, "entities": {}}
+        if not self.true:
+            return curves
+        overall_counters = _threshold_counters(overall_changes)
+        entity_counters = {tag: _threshold_counters(changes) for tag, changes in entity_changes.items()}
+        for position, threshold in enumerate(threshold_evaluation.thresholds):
+            # The metrics are computed from the counters at each threshold the way evaluate() reports them
+            results = EvaluationState(
+                tags=self.tags,
+                min_overlap_percentage=threshold,
+                documents=[(0, len(self.true))],
+                overall=overall_counters[position],
+                entities={tag: counters[position] for tag, counters in entity_counters.items()},
+            ).compute()
+            for name, result in results["overall"].items():
+                curves["overall"].setdefault(name, []).append(result)
+            for tag, tag_results in results["entities"].items():
+                for name, result in tag_results.items():
+                    curves["entities"].setdefault(tag, {}).setdefault(name, []).append(result)
+        return curves
+
+    def export_state(self, doc_offset: int = 0, include_indices: Optional[bool] = None) -> EvaluationState:
+        """
+        Export the counters, and optionally the indices, of the evaluation as a mergeable state.
+
+        Args:
+            doc_offset: Index of the first document of this evaluator in the whole corpus, added to the instance
+                indices so that the states of several shards can be merged
+            include_indices: Whether to include the indices of the entities in each category, by default they are
+                included when collected
 
         Returns:
-            Dictionary containing evaluation results for each strategy and entity type
+            The state of the evaluation of the documents of this evaluator
+        """
+        if doc_offset < 0:
+            raise ValueError("doc_offset must be a non-negative integer")
+        if include_indices is None:
+            include_indices = self.collect_indices
+        elif include_indices:
+            self._require_indices("export_state")
+
+        results = self.evaluate()
+        state = EvaluationState(
+            tags=self.tags,
+            min_overlap_percentage=self.min_overlap_percentage,
+            documents=[(doc_offset, doc_offset + len(self.true))] if self.true else [],
+            overall={name: _copy_counters(result) for name, result in results["overall"].items()},
+            entities={
+                tag: {name: _copy_counters(result) for name, result in tag_results.items()}
+                for tag, tag_results in results["entities"].items()
+            },
+        )
+
+        if include_indices:
+            state.overall_indices = {
+                name: _shift_indices(indices, doc_offset) for name, indices in results["overall_indices"].items()
+            }
+            state.entity_indices = {
+                tag: {name: _shift_indices(indices, doc_offset) for name, indices in tag_indices.items()}
+                for tag, tag_indices in results["entity_indices"].items()
+            }
+
+        return state
+
+    def _evaluate(self, n_jobs: Optional[int] = None, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """Run the evaluation, recorded as the 'evaluate' phase when instrumented."""
+        with self._phase("evaluate") as stats:
+            if self.instrumentation is not None:
+                stats.documents = len(self.true)
+                stats.entities = _count_entities(self.true) + _count_entities(self.pred)
+            if self.numpy_evaluation is not None:
+                return self._evaluate_vectorized(n_jobs)
+            return self._evaluate_documents(n_jobs, chunk_size)
+
+    def _evaluate_documents(
+        self,
+        n_jobs: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        document_results: Optional[bool] = None,
+        collect_indices: Optional[bool] = None,
+    ) -> Dict[str, Any]:
         """
-        results = {}
-        # Get unique tags that appear in either true or predicted data
-        used_tags = set()  # type: ignore
-        for doc in self.true:
-            used_tags.update(e.label for e in doc)
-        for doc in self.pred:
-            used_tags.update(e.label for e in doc)
-        # Only keep tags that are both used and in the allowed tags list
-        used_tags = used_tags.intersection(set(self.tags))
-
-        entity_results: Dict[str, Dict[str, EvaluationResult]] = {tag: {} for tag in used_tags}
-        indices = {}
-        entity_indices: Dict[str, Dict[str, EvaluationIndices]] = {tag: {} for tag in used_tags}
-
-        # Evaluate each document
-        for doc_idx, (true_doc, pred_doc) in enumerate(zip(self.true, self.pred)):
-            # Filter entities by valid tags
-            true_doc = [e for e in true_doc if e.label in self.tags]
-            pred_doc = [e for e in pred_doc if e.label in self.tags]
-
-            # Evaluate with each strategy
-            for strategy_name, strategy in self.strategies.items():
-                result, doc_indices = strategy.evaluate(true_doc, pred_doc, self.tags, doc_idx)
-
-                # Update overall results
-                if strategy_name not in results:
-                    results[strategy_name] = result
-                    indices[strategy_name] = doc_indices
+        Run the evaluation of each document with the Python backend.
+
+        The results of each document are recorded, and the indices collected, as set by the options of the evaluator
+        unless document_results or collect_indices are given, as done by DocumentCounters.from_evaluator() without
+        changing the options of the evaluator.
+        """
+        if document_results is None:
+            document_results = self.document_results
+        fused_strategy = self.fused_strategy
+        if collect_indices is not None and collect_indices != fused_strategy.collect_indices:
+            fused_strategy = FusedEvaluation(self.min_overlap_percentage, self.matching, collect_indices)
+        # Only keep tags that are both used in either true or predicted data and in the allowed tags list
+        used_tags = (_used_labels(self.true) | _used_labels(self.pred)).intersection(self.tags)
+        stats = EvaluationStats() if self.instrumentation is not None else None
+
+        if n_jobs is None or n_jobs == 1:
+            evaluation = _evaluate_chunk(
+                self.true,
+                self.pred,
+                self.tags,
+                used_tags,
+                fused_strategy,
+                indices_dtype=self._indices_dtype(),
+                stats=stats,
+                document_results=self._document_results_table(used_tags, document_results),
+            )
+        else:
+            evaluation = self._evaluate_parallel(used_tags, fused_strategy, n_jobs, chunk_size, stats, document_results)
+
+        if self.instrumentation is not None and stats is not None:
+            # The phases of all the documents are passed to the hooks once
+            for name, phase_stats in stats.phases.items():
+                self.instrumentation.record(name, phase_stats)
+
+        if self.indices_storage == "numpy" and fused_strategy.collect_indices:
+            for indices in evaluation["overall_indices"].values():
+                indices.compact()
+            for tag_indices in evaluation["entity_indices"].values():
+                for indices in tag_indices.values():
+                    indices.compact()
+
+        _compute_metrics(evaluation)
+        return evaluation
+
+    def _evaluate_vectorized(self, n_jobs: Optional[int] = None) -> Dict[str, Any]:
+        """Run the evaluation with the NumPy backend."""
+        self._check_backend()
+        if n_jobs is not None and n_jobs != 1:
+            raise ValueError("n_jobs is only supported by the 'python' backend")
+        assert self.numpy_evaluation is not None
+        return self.numpy_evaluation.evaluate(self.true, self.pred, self.tags)
+
+    def _document_results_table(self, used_tags: Set[str], document_results: bool) -> Optional[DocumentResults]:
+        """Empty table of the results of each document when they are recorded, for the used tags in tag order."""
+        if not document_results:
+            return None
+        return DocumentResults([tag for tag in dict.fromkeys(self.tags) if tag in used_tags])
+
+    def _indices_dtype(self) -> Optional[str]:
+        """Integer type of the NumPy columns of the indices, None when they are stored in lists."""
+        if self.indices_storage != "numpy":
+            return None
+        # Instance and entity indices are positions in Python lists, int32 only overflows with more than 2**31 items
+        return "int32" if len(self.true) < 2**31 else "int64"
+
+    def _evaluate_parallel(  # pylint: disable=too-many-positional-arguments
+        self,
+        used_tags: Set[str],
+        fused_strategy: FusedEvaluation,
+        n_jobs: int,
+        chunk_size: Optional[int],
+        stats: Optional[EvaluationStats] = None,
+        document_results: bool = False,
+    ) -> Dict[str, Any]:
+        """Evaluate chunks of documents in a process pool and merge them in document order."""
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(len(self.true) / (n_jobs * 4)))
+
+        offsets = range(0, len(self.true), chunk_size)
+        evaluation = _evaluate_chunk(
+            [],
+            [],
+            self.tags,
+            used_tags,
+            fused_strategy,
+            document_results=self._document_results_table(used_tags, document_results),
+        )
+
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            chunks = executor.map(
+                _evaluate_chunk_in_worker,
+                [self.true[offset : offset + chunk_size] for offset in offsets],
+                [self.pred[offset : offset + chunk_size] for offset in offsets],
+                repeat(self.tags),
+                repeat(used_tags),
+                repeat(fused_strategy),
+                offsets,
+                repeat(self._indices_dtype()),
+                repeat(stats is not None),
+                # Each worker fills its own copy of an empty table, which is never modified here
+                repeat(self._document_results_table(used_tags, document_results)),
+            )
+            # map() yields the chunks in submission order, so the merged indices are ordered as in a serial run
+            for chunk, chunk_stats in chunks:
+                if stats is None or chunk_stats is None:
+                    self._merge_evaluations(evaluation, chunk)
+                    continue
+                # The stats of the workers are sent back with their chunk, and merging the chunks is timed here
+                stats.merge(chunk_stats)
+                start = time.perf_counter()
+                self._merge_evaluations(evaluation, chunk)
+                stats.add("evaluate.merge_chunks", PhaseStats(calls=1, seconds=time.perf_counter() - start))
+
+        return evaluation
+
+    @staticmethod
+    def _merge_evaluations(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+        """Merge the results, and the indices when collected, of two evaluations of consecutive documents."""
+        with_indices = "overall_indices" in source
+        if "documents" in source:
+            target["documents"].extend(source["documents"])
+
+        for strategy_name, result in source["overall"].items():
+            if strategy_name not in target["overall"]:
+                target["overall"][strategy_name] = result
+                if with_indices:
+                    target["overall_indices"][strategy_name] = source["overall_indices"][strategy_name]
+            else:
+                Evaluator._merge_results(target["overall"][strategy_name], result)
+                if with_indices:
+                    Evaluator._merge_indices(
+                        target["overall_indices"][strategy_name], source["overall_indices"][strategy_name]
+                    )
+
+        for tag, tag_results in source["entities"].items():
+            for strategy_name, tag_result in tag_results.items():
+                if strategy_name not in target["entities"][tag]:
+                    target["entities"][tag][strategy_name] = tag_result
+                    if with_indices:
+                        target["entity_indices"][tag][strategy_name] = source["entity_indices"][tag][strategy_name]
                 else:
-                    self._merge_results(results[strategy_name], result)
-                    self._merge_indices(indices[strategy_name], doc_indices)
-
-                # Update entity-specific results
-                for tag in used_tags:
-                    # Filter entities for this specific tag
-                    true_tag_doc = [e for e in true_doc if e.label == tag]
-                    pred_tag_doc = [e for e in pred_doc if e.label == tag]
-
-                    # Evaluate only entities of this tag
-                    tag_result, tag_indices = strategy.evaluate(true_tag_doc, pred_tag_doc, [tag], doc_idx)
-
-                    if tag not in entity_results:
-                        entity_results[tag] = {}
-                        entity_indices[tag] = {}
-                    if strategy_name not in entity_results[tag]:
-                        entity_results[tag][strategy_name] = tag_result
-                        entity_indices[tag][strategy_name] = tag_indices
-                    else:
-                        self._merge_results(entity_results[tag][strategy_name], tag_result)
-                        self._merge_indices(entity_indices[tag][strategy_name], tag_indices)
-
-        return {
-            "overall": results,
-            "entities": entity_results,
-            "overall_indices": indices,
-            "entity_indices": entity_indices,
-        }
+                    Evaluator._merge_results(target["entities"][tag][strategy_name], tag_result)
+                    if with_indices:
+                        Evaluator._merge_indices(
+                            target["entity_indices"][tag][strategy_name], source["entity_indices"][tag][strategy_name]
+                        )
 
     @staticmethod
     def _merge_results(target: EvaluationResult, source: EvaluationResult) -> None:
-        """Merge two evaluation results."""
+        """Add the counters of an evaluation result, the metrics are computed once all the results are merged."""
         target.correct += source.correct
         target.incorrect += source.incorrect
         target.partial += source.partial
         target.missed += source.missed
         target.spurious += source.spurious
-        target.compute_metrics()
 
     @staticmethod
     def _merge_indices(target: EvaluationIndices, source: EvaluationIndices) -> None:
@@ -166,6 +692,7 @@ class Evaluator:
         target.missed_indices.extend(source.missed_indices)
         target.spurious_indices.extend(source.spurious_indices)
 
+    @_report_phase("report.csv")
     def results_to_csv(
         self, mode: str = "overall", scenario: str = "strict", file_path: Optional[str] = None
     ) -> Union[str, None]:
@@ -189,7 +716,7 @@ class Evaluator:
         if mode == "entities" and scenario not in valid_scenarios:
             raise ValueError(f"Invalid scenario: must be one of {valid_scenarios}")
 
-        results = self.evaluate()
+        results = self._report_results()
 
         if mode == "overall":
             # For overall mode, include all scenarios
@@ -244,6 +771,7 @@ class Evaluator:
         writer.writerows(csv_data)
         return output.getvalue()
 
+    @_report_phase("report.summary")
     def summary_report(self, mode: str = "overall", scenario: str = "strict", digits: int = 2) -> str:
         """
         Generate a summary report of the evaluation results.
@@ -276,7 +804,7 @@ class Evaluator:
         headers = ["correct", "incorrect", "partial", "missed", "spurious", "precision", "recall", "f1-score"]
         rows = [headers]
 
-        results = self.evaluate()
+        results = self._report_results()
         if mode == "overall":
             # Process overall results - show all scenarios
             results_data = results["overall"]
@@ -335,12 +863,14 @@ class Evaluator:
 
         return report
 
-    def summary_report_indices(  # pylint: disable=too-many-branches
-        self, mode: str = "overall", scenario: str = "strict", colors: bool = False
-    ) -> str:
+    @_report_phase("report.indices")
+    def summary_report_indices(self, mode: str = "overall", scenario: str = "strict", colors: bool = False) -> str:
         """
         Generate a summary report of the evaluation indices.
 
+        The report is built from the lines of iter_report_indices(), use it or write_report_indices() to stream the
+        report of a large corpus instead of holding it in memory.
+
         Args:
             mode: Either 'overall' for overall metrics or 'entities' for per-entity metrics.
             scenario: The scenario to report on. Must be one of: 'strict', 'ent_type', 'partial', 'exact'.
@@ -351,7 +881,61 @@ class Evaluator:
             A string containing the summary report of indices.
 
         Raises:
-            ValueError: If the scenario or mode is invalid.
+            ValueError: If the scenario or mode is invalid, or if the indices are not collected.
+        """
+        return "".join(self.iter_report_indices(mode, scenario, colors))
+
+    @_report_phase("report.indices")
+    def write_report_indices(  # pylint: disable=too-many-positional-arguments
+        self,
+        file: TextIO,
+        mode: str = "overall",
+        scenario: str = "strict",
+        colors: bool = False,
+        *,
+        limit: Optional[int] = None,
+        documents: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        """
+        Write the summary report of the evaluation indices to a file, one line at a time.
+
+        Args:
+            file: Text file-like object the report is written to
+            mode: Either 'overall' for overall metrics or 'entities' for per-entity metrics.
+            scenario: The scenario to report on. Must be one of: 'strict', 'ent_type', 'partial', 'exact'.
+            colors: Whether to use colors in the output. Defaults to False.
+            limit: Maximum number of rows of each category, as in iter_report_indices()
+            documents: Half-open (start, stop) range of the documents to report, as in iter_report_indices()
+        """
+        file.writelines(self.iter_report_indices(mode, scenario, colors, limit=limit, documents=documents))
+
+    def iter_report_indices(  # pylint: disable=too-many-positional-arguments
+        self,
+        mode: str = "overall",
+        scenario: str = "strict",
+        colors: bool = False,
+        *,
+        limit: Optional[int] = None,
+        documents: Optional[Tuple[int, int]] = None,
+    ) -> Iterator[str]:
+        """
+        Generate the summary report of the evaluation indices line by line.
+
+        Without a limit or a document range, the lines joined together are the report of summary_report_indices().
+        The options are validated when called, before the first line is generated.
+
+        Args:
+            mode: Either 'overall' for overall metrics or 'entities' for per-entity metrics.
+            scenario: The scenario to report on. Must be one of: 'strict', 'ent_type', 'partial', 'exact'.
+            colors: Whether to use colors in the output. Defaults to False.
+            limit: Maximum number of rows of each category, the rows left out are counted in a last row
+            documents: Half-open (start, stop) range of the documents to report, found by bisection in the indices
+
+        Returns:
+            An iterator over the lines of the report, each ending with a newline
+
+        Raises:
+            ValueError: If the scenario, mode, limit or document range is invalid, or if the indices are not collected.
         """
         valid_scenarios = {"strict", "ent_type", "partial", "exact"}
         valid_modes = {"overall", "entities"}
@@ -362,145 +946,338 @@ class Evaluator:
         if mode == "entities" and scenario not in valid_scenarios:
             raise ValueError(f"Invalid scenario: must be one of {valid_scenarios}")
 
-        # ANSI color codes
-        COLORS = {
-            "reset": "\033[0m",
-            "bold": "\033[1m",
-            "red": "\033[91m",
-            "green": "\033[92m",
-            "yellow": "\033[93m",
-            "blue": "\033[94m",
-            "magenta": "\033[95m",
-            "cyan": "\033[96m",
-            "white": "\033[97m",
-        }
+        if limit is not None and limit < 0:
+            raise ValueError("limit must be a non-negative integer")
+
+        if documents is not None and not 0 <= documents[0] <= documents[1]:
+            raise ValueError("documents must be a (start, stop) range of document indices with 0 <= start <= stop")
+
+        self._require_indices("summary_report_indices")
+        return self._report_indices_lines(mode, scenario, colors, limit, documents)
+
+    def _report_indices_lines(  # pylint: disable=too-many-positional-arguments
+        self, mode: str, scenario: str, colors: bool, limit: Optional[int], documents: Optional[Tuple[int, int]]
+    ) -> Iterator[str]:
+        """Generate the lines of the summary report of the evaluation indices."""
 
         def colorize(text: str, color: str) -> str:
             """Helper function to colorize text if colors are enabled."""
             if colors:
-                return f"{COLORS[color]}{text}{COLORS['reset']}"
+                return f"{_REPORT_COLORS[color]}{text}{_REPORT_COLORS['reset']}"
             return text
 
-        def get_prediction_info(pred: Union[Entity, str]) -> str:
-            """Helper function to get prediction info based on pred type."""
-            if isinstance(pred, Entity):
-                return f"Label={pred.label}, Start={pred.start}, End={pred.end}"
-            # String (BIO tag)
-            return f"Tag={pred}"
-
-        results = self.evaluate()
-        report = ""
+        results = self._report_results()
+        # The report of an evaluation without any predicted entity has no prediction to describe
+        has_predictions = self.pred != [[]]
 
         # Create headers for the table
         headers = ["Category", "Instance", "Entity", "Details"]
         header_fmt = "{:<20} {:<10} {:<8} {:<25}"
         row_fmt = "{:<20} {:<10} {:<8} {:<10}"
 
-        if mode == "overall":
-            # Get the indices from the overall results
-            indices_data = results["overall_indices"][scenario]
-            report += f"\n{colorize('Indices for error schema', 'bold')} '{colorize(scenario, 'cyan')}':\n\n"
-            report += colorize(header_fmt.format(*headers), "bold") + "\n"
-            report += colorize("-" * 78, "white") + "\n"
+        def table_lines(indices_data: EvaluationIndices, labels: Set[str]) -> Iterator[str]:
+            """Generate the header and the rows of the table of the indices of a scenario, over entities of labels."""
+            yield colorize(header_fmt.format(*headers), "bold") + "\n"
+            yield colorize("-" * 78, "white") + "\n"
 
-            for category, indices in indices_data.__dict__.items():
-                if not category.endswith("_indices"):
-                    continue
+            for category in INDEX_CATEGORIES:
+                indices = getattr(indices_data, category)
                 category_name = category.replace("_indices", "").replace("_", " ").capitalize()
+                # The indices of the missed entities point into the true entities, the others into the predictions
+                source = self.true if category == "missed_indices" else self.pred
+                described = category == "missed_indices" or has_predictions
+                category_label = colorize(category_name, _CATEGORY_COLORS.get(category_name, "white"))
+
+                # The indices are collected in document order, so a range of documents is a range of positions
+                first, last = 0, len(indices)
+                if documents is not None:
+                    first = bisect_left(indices, (documents[0], -1))
+                    last = bisect_left(indices, (documents[1], -1), lo=first)
+                shown = last if limit is None else min(last, first + limit)
+
+                if first == last:
+                    yield row_fmt.format(category_label, "-", "-", "None") + "\n"
+                    continue
 
-                # Color mapping for categories
-                category_colors = {
-                    "Correct": "green",
-                    "Incorrect": "red",
-                    "Partial": "yellow",
-                    "Missed": "magenta",
-                    "Spurious": "blue",
-                }
-
-                if indices:
-                    for instance_index, entity_index in indices:
-                        if self.pred != [[]]:
-                            pred = self.pred[instance_index][entity_index]
-                            prediction_info = get_prediction_info(pred)
-                            report += (
-                                row_fmt.format(
-                                    colorize(category_name, category_colors.get(category_name, "white")),
-                                    f"{instance_index}",
-                                    f"{entity_index}",
-                                    prediction_info,
-                                )
-                                + "\n"
-                            )
-                        else:
-                            report += (
-                                row_fmt.format(
-                                    colorize(category_name, category_colors.get(category_name, "white")),
-                                    f"{instance_index}",
-                                    f"{entity_index}",
-                                    "No prediction info",
-                                )
-                                + "\n"
-                            )
-                else:
-                    report += (
-                        row_fmt.format(
-                            colorize(category_name, category_colors.get(category_name, "white")), "-", "-", "None"
-                        )
-                        + "\n"
-                    )
+                for position in range(first, shown):
+                    instance_index, entity_index = indices[position]
+                    if described:
+                        # An entity index is a position among the entities of the evaluated labels of the document
+                        entities = [entity for entity in source[instance_index] if entity.label in labels]
+                        prediction_info = _prediction_info(entities[entity_index])
+                    else:
+                        prediction_info = "No prediction info"
+                    yield row_fmt.format(category_label, f"{instance_index}", f"{entity_index}", prediction_info) + "\n"
+
+                if shown < last:
+                    yield row_fmt.format(category_label, "...", "...", f"{last - shown} more") + "\n"
+
+        if mode == "overall":
+            # Get the indices from the overall results
+            yield "\n"
+            yield f"{colorize('Indices for error schema', 'bold')} '{colorize(scenario, 'cyan')}':\n"
+            yield "\n"
+            yield from table_lines(results["overall_indices"][scenario], set(self.tags))
         else:
             # Get the indices from the entity-specific results
             for entity_type, entity_results in results["entity_indices"].items():
-                report += f"\n{colorize('Entity Type', 'bold')}: {colorize(entity_type, 'cyan')}\n"
-                report += f"{colorize('Error Schema', 'bold')}: '{colorize(scenario, 'cyan')}'\n\n"
-                report += colorize(header_fmt.format(*headers), "bold") + "\n"
-                report += colorize("-" * 78, "white") + "\n"
-
-                error_data = entity_results[scenario]
-                for category, indices in error_data.__dict__.items():
-                    if not category.endswith("_indices"):
-                        continue
-                    category_name = category.replace("_indices", "").replace("_", " ").capitalize()
-
-                    # Color mapping for categories
-                    category_colors = {
-                        "Correct": "green",
-                        "Incorrect": "red",
-                        "Partial": "yellow",
-                        "Missed": "magenta",
-                        "Spurious": "blue",
-                    }
-
-                    if indices:
-                        for instance_index, entity_index in indices:
-                            if self.pred != [[]]:
-                                pred = self.pred[instance_index][entity_index]
-                                prediction_info = get_prediction_info(pred)
-                                report += (
-                                    row_fmt.format(
-                                        colorize(category_name, category_colors.get(category_name, "white")),
-                                        f"{instance_index}",
-                                        f"{entity_index}",
-                                        prediction_info,
-                                    )
-                                    + "\n"
-                                )
-                            else:
-                                report += (
-                                    row_fmt.format(
-                                        colorize(category_name, category_colors.get(category_name, "white")),
-                                        f"{instance_index}",
-                                        f"{entity_index}",
-                                        "No prediction info",
-                                    )
-                                    + "\n"
-                                )
-                    else:
-                        report += (
-                            row_fmt.format(
-                                colorize(category_name, category_colors.get(category_name, "white")), "-", "-", "None"
-                            )
-                            + "\n"
+                yield "\n"
+                yield f"{colorize('Entity Type', 'bold')}: {colorize(entity_type, 'cyan')}\n"
+                yield f"{colorize('Error Schema', 'bold')}: '{colorize(scenario, 'cyan')}'\n"
+                yield "\n"
+                yield from table_lines(entity_results[scenario], {entity_type})
+
+
+def _evaluate_chunk(  # pylint: disable=too-many-positional-arguments,too-many-branches
+    true: Sequence[Sequence[Entity]],
+    pred: Sequence[Sequence[Entity]],
+    tags: List[str],
+    used_tags: Set[str],
+    fused_strategy: FusedEvaluation,
+    offset: int = 0,
+    indices_dtype: Optional[str] = None,
+    true_by_label: Optional[Sequence[Dict[str, List[Entity]]]] = None,
+    stats: Optional[EvaluationStats] = None,
+    document_results: Optional[DocumentResults] = None,
+) -> Dict[str, Any]:
+    """
+    Evaluate a chunk of documents.
+
+    This is a module level function so that it can be sent to worker processes.
+
+    Args:
+        true: True entities of each document in the chunk
+        pred: Predicted entities of each document in the chunk
+        tags: List of valid entity tags
+        used_tags: Valid tags used in the whole corpus, each gets an entry in the per-entity results
+        fused_strategy: Evaluation of all the strategies
+        offset: Index of the first document of the chunk in the corpus
+        indices_dtype: Integer type of the NumPy columns the indices are accumulated in, None keeps lists of tuples
+        true_by_label: True entities of each document bucketed by label, when the true entities are already filtered
+            by the valid tags and bucketed, as done once by a GoldSet
+        stats: When given, the time spent filtering, matching and merging the entities of the documents is added to it
+        document_results: When given, the counters of each document are recorded in this table
+
+    Returns:
+        Dictionary containing evaluation results for each strategy and entity type, as returned by Evaluator.evaluate
+    """
+    results: Dict[str, EvaluationResult] = {}
+    indices: Dict[str, EvaluationIndices] = {}
+    entity_results: Dict[str, Dict[str, EvaluationResult]] = {tag: {} for tag in used_tags}
+    entity_indices: Dict[str, Dict[str, EvaluationIndices]] = {tag: {} for tag in used_tags}
+
+    timer = PhaseTimer(list(EVALUATION_PHASES)) if stats is not None else None
+    n_entities = 0
+
+    # Evaluate each document, the bucketed true entities are already filtered
+    documents = _select_documents(true, pred, tags, offset, true_selected=true_by_label is not None)
+    for doc_idx, true_doc, pred_doc in documents:
+        if timer is not None:
+            # The entities of the document are filtered since the end of the previous document
+            timer.lap(0)
+            n_entities += len(true_doc) + len(pred_doc)
+
+        # Evaluate with every strategy at once, over all entities and then over the entities of each tag
+        doc_outcomes = fused_strategy.evaluate(true_doc, pred_doc, tags, doc_idx)
+        if timer is not None:
+            timer.lap(1)
+        tag_outcomes = fused_strategy.evaluate_by_label(
+            true_doc, pred_doc, doc_idx, None if true_by_label is None else true_by_label[doc_idx - offset]
+        )
+        if timer is not None:
+            timer.lap(2)
+
+        # The counters are recorded before the results of the document are merged in place
+        if document_results is not None:
+            document_results.add(doc_idx, doc_outcomes, tag_outcomes)
+
+        for strategy_name, (result, doc_indices) in doc_outcomes.items():
+            # Update overall results
+            if strategy_name not in results:
+                results[strategy_name] = result
+                if doc_indices is not None:
+                    indices[strategy_name] = (
+                        ColumnarEvaluationIndices.from_indices(doc_indices, indices_dtype)
+                        if indices_dtype
+                        else doc_indices
+                    )
+            else:
+                Evaluator._merge_results(results[strategy_name], result)
+                if doc_indices is not None:
+                    Evaluator._merge_indices(indices[strategy_name], doc_indices)
+
+            # Update entity-specific results, only the tags with entities in this document can change
+            for tag, outcomes in tag_outcomes.items():
+                tag_result, tag_indices = outcomes[strategy_name]
+
+                if strategy_name not in entity_results[tag]:
+                    entity_results[tag][strategy_name] = tag_result
+                    if tag_indices is not None:
+                        entity_indices[tag][strategy_name] = (
+                            ColumnarEvaluationIndices.from_indices(tag_indices, indices_dtype)
+                            if indices_dtype
+                            else tag_indices
                         )
+                else:
+                    Evaluator._merge_results(entity_results[tag][strategy_name], tag_result)
+                    if tag_indices is not None:
+                        Evaluator._merge_indices(entity_indices[tag][strategy_name], tag_indices)
+
+        if timer is not None:
+            timer.lap(3)
+
+    if timer is not None and stats is not None:
+        timer.add_to(stats, len(true), n_entities)
+
+    evaluation: Dict[str, Any] = {"overall": results, "entities": entity_results}
+    if fused_strategy.collect_indices:
+        evaluation["overall_indices"] = indices
+        evaluation["entity_indices"] = entity_indices
+    if document_results is not None:
+        evaluation["documents"] = document_results
+    return evaluation
+
+
+def _prediction_info(pred: Union[Entity, str]) -> str:
+    """Describe a predicted or missed entity, or the tag of a token, in a row of the report of the indices."""
+    if isinstance(pred, Entity):
+        return f"Label={pred.label}, Start={pred.start}, End={pred.end}"
+    # String (BIO tag)
+    return f"Tag={pred}"
+
+
+def _evaluate_chunk_in_worker(  # pylint: disable=too-many-positional-arguments
+    true: Sequence[Sequence[Entity]],
+    pred: Sequence[Sequence[Entity]],
+    tags: List[str],
+    used_tags: Set[str],
+    fused_strategy: FusedEvaluation,
+    offset: int,
+    indices_dtype: Optional[str],
+    timed: bool,
+    document_results: Optional[DocumentResults] = None,
+) -> Tuple[Dict[str, Any], Optional[EvaluationStats]]:
+    """Evaluate a chunk of documents in a worker process, and return the stats of its phases with its results."""
+    stats = EvaluationStats() if timed else None
+    evaluation = _evaluate_chunk(
+        true,
+        pred,
+        tags,
+        used_tags,
+        fused_strategy,
+        offset,
+        indices_dtype,
+        stats=stats,
+        document_results=document_results,
+    )
+    return evaluation, stats
+
+
+def _count_entities(documents: Sequence[Sequence[Any]]) -> int:
+    """Count the entities of all the documents."""
+    if isinstance(documents, SpanTable):
+        return documents.n_entities
+    return sum(len(doc) for doc in documents)
+
+
+def _compute_metrics(evaluation: Dict[str, Any]) -> None:
+    """Compute the metrics of the merged counters of an evaluation, with the partial credit of each strategy."""
+    for strategy_name, result in evaluation["overall"].items():
+        result.compute_metrics(partial_or_type=strategy_name in PARTIAL_CREDIT_STRATEGIES)
+    for tag_results in evaluation["entities"].values():
+        for strategy_name, tag_result in tag_results.items():
+            tag_result.compute_metrics(partial_or_type=strategy_name in PARTIAL_CREDIT_STRATEGIES)
+
+
+def _add_threshold_runs(
+    changes: List[List[int]], runs: List[Tuple[int, Dict[str, Tuple[EvaluationResult, Any]]]]
+) -> None:
+    """Add the changes of the counters of a document at the first threshold of each run of its results."""
+    previous = [0] * len(changes[0])
+    for position, outcomes in runs:
+        counters = [getattr(result, counter) for result, _ in outcomes.values() for counter in COUNTERS]
+        row = changes[position]
+        for index, (count, previous_count) in enumerate(zip(counters, previous)):
+            row[index] += count - previous_count
+        previous = counters
+
+
+def _threshold_counters(changes: List[List[int]]) -> List[Dict[str, EvaluationResult]]:
+    """Sum the changes of the counters up to each threshold into the counters of each strategy at each threshold."""
+    counters = [0] * len(changes[0])
+    results = []
+    for row in changes:
+        counters = [count + change for count, change in zip(counters, row)]
+        results.append(
+            {
+                name: EvaluationResult(*counters[position * len(COUNTERS) : (position + 1) * len(COUNTERS)])
+                for position, name in enumerate(FusedEvaluation.strategy_names)
+            }
+        )
+    return results
 
-        return report
+
+def _copy_counters(result: EvaluationResult) -> EvaluationResult:
+    """Copy the counters of an evaluation result, without its metrics."""
+    return EvaluationResult(*(getattr(result, counter) for counter in COUNTERS))
+
+
+def _shift_indices(indices: EvaluationIndices, doc_offset: int) -> EvaluationIndices:
+    """Copy evaluation indices, adding an offset to their instance indices."""
+    return EvaluationIndices(
+        *(
+            [(instance + doc_offset, entity) for instance, entity in getattr(indices, f"{counter}_indices")]
+            for counter in COUNTERS
+        )
+    )
+
+
+def _tag_ids_shape(tag_ids: Any) -> Tuple[int, ...]:
+    """Get the shape of a padded tag id array, or the length of each document of a sequence of tag id sequences."""
+    if isinstance(tag_ids, (list, tuple)):
+        return tuple(len(doc) for doc in tag_ids)
+    return tuple(getattr(tag_ids, "shape", ()))
+
+
+def _used_labels(documents: Sequence[Sequence[Entity]]) -> Set[str]:
+    """Get the labels of the entities of all the documents."""
+    if isinstance(documents, SpanTable):
+        return documents.used_labels()
+    return {e.label for doc in documents for e in doc}
+
+
+def _select_documents(
+    true: Sequence[Sequence[Entity]],
+    pred: Sequence[Sequence[Entity]],
+    tags: List[str],
+    offset: int = 0,
+    true_selected: bool = False,
+) -> Iterator[Tuple[int, List[Entity], List[Entity]]]:
+    """
+    Iterate over the pairs of true and predicted documents, keeping the entities with a valid tag.
+
+    Args:
+        true: True entities of each document
+        pred: Predicted entities of each document
+        tags: List of valid entity tags
+        offset: Index of the first document in the corpus
+        true_selected: Whether the true documents given as lists are already filtered by the valid tags
+
+    Returns:
+        The index of each document, with its true and predicted entities of the valid tags
+    """
+    valid_tags = set(tags)
+    # Documents of span tables are filtered on their label ids
+    true_mask = true.vocabulary.mask(tags) if isinstance(true, SpanTable) else None
+    pred_mask = pred.vocabulary.mask(tags) if isinstance(pred, SpanTable) else None
+    for doc_idx, (true_doc, pred_doc) in enumerate(zip(true, pred), start=offset):
+        if not true_selected or not isinstance(true_doc, list):
+            true_doc = _select_entities(true_doc, valid_tags, true_mask)
+        yield doc_idx, true_doc, _select_entities(pred_doc, valid_tags, pred_mask)
+
+
+def _select_entities(document: Sequence[Entity], valid_tags: Set[str], mask: Optional[bytearray]) -> List[Entity]:
+    """Keep the entities with a valid tag, using the label id mask of span table documents."""
+    if mask is not None and isinstance(document, DocumentSpans):
+        return document.select(mask)
+    return [e for e in document if e.label in valid_tags]
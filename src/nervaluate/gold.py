@@ -0,0 +1,164 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+from .entities import Entity
+from .evaluator import _compute_metrics, _evaluate_chunk, _select_entities, _used_labels
+from .loaders import ConllLoader, DataLoader, DictLoader, ListLoader, _infer_loader, _load_single
+from .spans import SpanTable
+from .strategies import FusedEvaluation
+
+
+class GoldSet:
+    """
+    True entities prepared once for the evaluation of many prediction sets.
+
+    Comparing several models, checkpoints or decoding settings evaluates different predictions against the same true
+    entities. A GoldSet loads the true entities, keeps the ones with a valid tag and buckets them by label once, then
+    evaluate() and evaluate_many() only load and filter the predictions. The results of each prediction set are the
+    same as the ones of Evaluator.evaluate() on the true entities and these predictions.
+    """
+
+    def __init__(  # pylint: disable=too-many-positional-arguments
+        self,
+        true: Any,
+        tags: List[str],
+        loader: str = "default",
+        min_overlap_percentage: float = 1.0,
+        *,
+        matching: str = "pairwise",
+    ) -> None:
+        """
+        Load and prepare the true entities.
+
+        Args:
+            true: True entities in any supported format, or a SpanTable such as a memory-mapped span store
+            tags: List of valid entity tags
+            loader: Name of the loader of the true entities, 'default' infers it from their type
+            min_overlap_percentage: Minimum overlap percentage for partial matches (1-100)
+            matching: Matching engine used by the strategies, 'pairwise' or 'sweep'
+        """
+        self.tags = tags
+        self.min_overlap_percentage = min_overlap_percentage
+        self.matching = matching
+        self.loaders: Dict[str, DataLoader] = {"conll": ConllLoader(), "list": ListLoader(), "dict": DictLoader()}
+
+        # As with an Evaluator, the loader inferred from the true entities also loads the predictions
+        if loader == "default" and not isinstance(true, SpanTable):
+            loader = _infer_loader(true)
+        self.loader = loader
+
+        # Token level tags are checked against the length of the predicted documents, as done by load_documents
+        self.document_lengths: Optional[List[int]] = None
+        if loader == "list" and not isinstance(true, SpanTable):
+            self.document_lengths = [len(doc) for doc in true]
+
+        documents = true if isinstance(true, SpanTable) else _load_single(true, loader, self.loaders, None)
+        valid_tags = set(tags)
+        mask = documents.vocabulary.mask(tags) if isinstance(documents, SpanTable) else None
+
+        self.documents: List[List[Entity]] = [_select_entities(doc, valid_tags, mask) for doc in documents]
+        self.documents_by_label = [FusedEvaluation.bucket_by_label(doc) for doc in self.documents]
+        self.used_tags = _used_labels(self.documents)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def evaluate(self, pred: Any, loader: str = "default", *, collect_indices: bool = True) -> Dict[str, Any]:
+        """
+        Evaluate a prediction set against the true entities.
+
+        Args:
+            pred: Predicted entities in any supported format, or a SpanTable
+            loader: Name of the loader of the predictions, 'default' uses the loader of the true entities
+            collect_indices: Whether to collect the indices of the entities in each category
+
+        Returns:
+            Dictionary containing evaluation results for each strategy and entity type, as returned by
+            Evaluator.evaluate
+        """
+        pred_docs = self._load_predictions(pred, loader)
+        used_tags = self.used_tags | _used_labels(pred_docs).intersection(self.tags)
+        fused_strategy = FusedEvaluation(self.min_overlap_percentage, self.matching, collect_indices)
+
+        evaluation = _evaluate_chunk(
+            self.documents, pred_docs, self.tags, used_tags, fused_strategy, true_by_label=self.documents_by_label
+        )
+        _compute_metrics(evaluation)
+        return evaluation
+
+    def evaluate_many(
+        self,
+        predictions: Union[Mapping[Any, Any], Sequence[Any]],
+        loader: str = "default",
+        n_jobs: Optional[int] = None,
+        *,
+        collect_indices: bool = True,
+    ) -> Union[Dict[Any, Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Evaluate several prediction sets against the true entities.
+
+        Args:
+            predictions: Prediction sets by name, or a sequence of prediction sets
+            loader: Name of the loader of the predictions, 'default' uses the loader of the true entities
+            n_jobs: Number of worker processes, the prediction sets are evaluated by a process pool when greater than
+                1, and -1 uses all the CPUs. The true entities are sent once to each worker.
+            collect_indices: Whether to collect the indices of the entities in each category
+
+        Returns:
+            The results of each prediction set, as returned by Evaluator.evaluate, by name when the predictions are
+            given by name and in the same order otherwise
+        """
+        if n_jobs is not None and n_jobs < 1 and n_jobs != -1:
+            raise ValueError("n_jobs must be a positive integer or -1")
+
+        names = list(predictions) if isinstance(predictions, Mapping) else None
+        prediction_sets = [predictions[name] for name in names] if names is not None else list(predictions)
+
+        if n_jobs is None or n_jobs == 1 or len(prediction_sets) < 2:
+            results = [self.evaluate(pred, loader, collect_indices=collect_indices) for pred in prediction_sets]
+        else:
+            if n_jobs == -1:
+                n_jobs = os.cpu_count() or 1
+            max_workers = min(n_jobs, len(prediction_sets))
+            with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(self,)) as executor:
+                results = list(
+                    executor.map(_evaluate_in_worker, prediction_sets, repeat(loader), repeat(collect_indices))
+                )
+
+        if names is not None:
+            return dict(zip(names, results))
+        return results
+
+    def _load_predictions(self, pred: Any, loader: str) -> Sequence[Sequence[Entity]]:
+        """Load a prediction set and check that it has the documents of the true entities."""
+        if loader == "default":
+            loader = self.loader
+        if self.document_lengths is not None and not isinstance(pred, SpanTable):
+            if len(pred) != len(self.document_lengths):
+                raise ValueError("Number of predicted documents does not equal true")
+            for i, (true_length, pred_doc) in enumerate(zip(self.document_lengths, pred)):
+                if true_length != len(pred_doc):
+                    raise ValueError(f"Document {i} has different lengths: true={true_length}, pred={len(pred_doc)}")
+
+        pred_docs = pred if isinstance(pred, SpanTable) else _load_single(pred, loader, self.loaders, None)
+        if len(pred_docs) != len(self.documents):
+            raise ValueError("Number of predicted documents does not equal true")
+        return pred_docs
+
+
+# Gold set of a worker process, received once by the initializer of the process pool
+_WORKER_GOLD: Optional[GoldSet] = None
+
+
+def _init_worker(gold: GoldSet) -> None:
+    """Keep the gold set in the worker process."""
+    global _WORKER_GOLD  # pylint: disable=global-statement
+    _WORKER_GOLD = gold
+
+
+def _evaluate_in_worker(pred: Any, loader: str, collect_indices: bool) -> Dict[str, Any]:
+    """Evaluate a prediction set against the gold set of the worker process."""
+    assert _WORKER_GOLD is not None
+    return _WORKER_GOLD.evaluate(pred, loader, collect_indices=collect_indices)
@@ -0,0 +1,139 @@
+from dataclasses import replace
+from typing import Any, Dict, List, Sequence
+
+from .entities import Entity, EvaluationResult
+from .evaluator import Evaluator, _compute_metrics, _copy_counters, _evaluate_chunk, _used_labels
+from .loaders import ConllLoader, DataLoader, DictLoader, ListLoader, load_documents
+from .state import EvaluationState
+from .strategies import FusedEvaluation
+
+
+class IncrementalEvaluator:
+    """
+    Evaluator that accumulates results over batches of documents.
+
+    Each call to update() evaluates a batch of documents and adds it to running per-strategy and per-tag counters, so
+    its cost only depends on the size of the batch. compute() returns the results for all the documents seen so far,
+    which are the same as the overall and per-entity results of an Evaluator on the concatenated batches.
+
+    Only the counters are kept, not the indices of the entities in each category.
+    """
+
+    def __init__(  # pylint: disable=too-many-positional-arguments
+        self,
+        tags: List[str],
+        loader: str = "default",
+        min_overlap_percentage: float = 1.0,
+        *,
+        matching: str = "pairwise",
+    ) -> None:
+        """
+        Initialize the incremental evaluator.
+
+        Args:
+            tags: List of valid entity tags
+            loader: Name of the loader used for each batch
+            min_overlap_percentage: Minimum overlap percentage for partial matches (1-100)
+            matching: Matching engine used by the strategies, 'pairwise' or 'sweep'
+        """
+        self.tags = tags
+        self.loader = loader
+        self.min_overlap_percentage = min_overlap_percentage
+        self.matching = matching
+        self.loaders: Dict[str, DataLoader] = {"conll": ConllLoader(), "list": ListLoader(), "dict": DictLoader()}
+        self.fused_strategy = FusedEvaluation(min_overlap_percentage, matching, collect_indices=False)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all the documents seen so far."""
+        self.n_documents = 0
+        self._results: Dict[str, EvaluationResult] = {}
+        self._entity_results: Dict[str, Dict[str, EvaluationResult]] = {}
+
+    def update(self, true_batch: Any, pred_batch: Any) -> None:
+        """
+        Evaluate a batch of documents and add it to the running results.
+
+        Args:
+            true_batch: True entities of the batch in any format supported by the loader
+            pred_batch: Predicted entities of the batch in the same format
+        """
+        if isinstance(true_batch, list) and isinstance(pred_batch, list) and not true_batch and not pred_batch:
+            return
+        true_docs, pred_docs = load_documents(true_batch, pred_batch, self.loader, self.loaders)
+        self.update_entities(true_docs, pred_docs)
+
+    def update_entities(self, true_docs: Sequence[Sequence[Entity]], pred_docs: Sequence[Sequence[Entity]]) -> None:
+        """
+        Evaluate a batch of already loaded documents and add it to the running results.
+
+        Args:
+            true_docs: True entities of each document of the batch
+            pred_docs: Predicted entities of each document of the batch
+        """
+        if len(true_docs) != len(pred_docs):
+            raise ValueError("Number of predicted documents does not equal true")
+
+        used_tags = (_used_labels(true_docs) | _used_labels(pred_docs)).intersection(self.tags)
+
+        batch = _evaluate_chunk(true_docs, pred_docs, self.tags, used_tags, self.fused_strategy, self.n_documents)
+
+        for strategy_name, result in batch["overall"].items():
+            if strategy_name not in self._results:
+                self._results[strategy_name] = result
+            else:
+                Evaluator._merge_results(self._results[strategy_name], result)
+
+        for tag, tag_results in batch["entities"].items():
+            running = self._entity_results.setdefault(tag, {})
+            for strategy_name, tag_result in tag_results.items():
+                if strategy_name not in running:
+                    running[strategy_name] = tag_result
+                else:
+                    Evaluator._merge_results(running[strategy_name], tag_result)
+
+        self.n_documents += len(true_docs)
+
+    def compute(self) -> Dict[str, Any]:
+        """
+        Get the results for all the documents seen so far.
+
+        The cost does not depend on the number of documents, and the returned results are not modified by later
+        updates.
+
+        Returns:
+            Dictionary containing evaluation results for each strategy and entity type
+        """
+        results = {strategy_name: replace(result) for strategy_name, result in self._results.items()}
+        entity_results = {
+            tag: {strategy_name: replace(result) for strategy_name, result in tag_results.items()}
+            for tag, tag_results in self._entity_results.items()
+        }
+
+        evaluation = {"overall": results, "entities": entity_results}
+        _compute_metrics(evaluation)
+        return evaluation
+
+    def export_state(self, doc_offset: int = 0) -> EvaluationState:
+        """
+        Export the counters for all the documents seen so far as a mergeable state.
+
+        Args:
+            doc_offset: Index of the first document seen by this evaluator in the whole corpus
+
+        Returns:
+            The state of the evaluation, without indices
+        """
+        if doc_offset < 0:
+            raise ValueError("doc_offset must be a non-negative integer")
+
+        return EvaluationState(
+            tags=self.tags,
+            min_overlap_percentage=self.min_overlap_percentage,
+            documents=[(doc_offset, doc_offset + self.n_documents)] if self.n_documents else [],
+            overall={name: _copy_counters(result) for name, result in self._results.items()},
+            entities={
+                tag: {name: _copy_counters(result) for name, result in tag_results.items()}
+                for tag, tag_results in self._entity_results.items()
+            },
+        )
@@ -0,0 +1,153 @@
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Called with the name of a phase and the stats of one of its calls
+StatsHook = Callable[[str, "PhaseStats"], None]
+
+
+@dataclass
+class PhaseStats:
+    """Wall time, number of calls and number of documents and entities processed by a phase of the evaluation."""
+
+    calls: int = 0
+    seconds: float = 0.0
+    documents: int = 0
+    entities: int = 0
+
+    @property
+    def documents_per_second(self) -> float:
+        """Throughput of the phase in documents per second."""
+        return self.documents / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def entities_per_second(self) -> float:
+        """Throughput of the phase in entities per second."""
+        return self.entities / self.seconds if self.seconds > 0 else 0.0
+
+    def add(self, other: "PhaseStats") -> None:
+        """Add the calls, time, documents and entities of other stats of the same phase."""
+        self.calls += other.calls
+        self.seconds += other.seconds
+        self.documents += other.documents
+        self.entities += other.entities
+
+
+@dataclass
+class EvaluationStats:
+    """Stats of each phase of the evaluation, by phase name."""
+
+    phases: Dict[str, PhaseStats] = field(default_factory=dict)
+
+    def add(self, name: str, stats: PhaseStats) -> None:
+        """Add the stats of a call, or of several calls, of a phase."""
+        if name not in self.phases:
+            self.phases[name] = PhaseStats()
+        self.phases[name].add(stats)
+
+    def merge(self, other: "EvaluationStats") -> None:
+        """Add the stats of all the phases of other stats, such as the stats of a worker process."""
+        for name, stats in other.phases.items():
+            self.add(name, stats)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Get the stats as plain dictionaries, with the throughput of each phase."""
+        return {
+            name: {
+                "calls": stats.calls,
+                "seconds": stats.seconds,
+                "documents": stats.documents,
+                "entities": stats.entities,
+                "documents_per_second": stats.documents_per_second,
+                "entities_per_second": stats.entities_per_second,
+            }
+            for name, stats in self.phases.items()
+        }
+
+
+class Instrumentation:
+    """
+    Opt-in recorder of the time spent in each phase of an evaluation.
+
+    An Evaluator created with an Instrumentation records the loading of the data, the matching of the entities of each
+    document, the matching of the entities of each tag, the merging of the per-document results and each report. The
+    stats accumulate over calls until reset(). Each hook is called with the name and the stats of every recorded call,
+    to forward them to a metrics system. The phases run for each document are passed to the hooks once per evaluation,
+    with one call per document.
+    """
+
+    def __init__(self, hooks: Optional[Iterable[StatsHook]] = None) -> None:
+        """
+        Initialize the instrumentation.
+
+        Args:
+            hooks: Functions called with the name of a phase and its stats each time a call of the phase is recorded
+        """
+        self.stats = EvaluationStats()
+        self.hooks: List[StatsHook] = list(hooks or [])
+
+    def add_hook(self, hook: StatsHook) -> None:
+        """Register a function called with the name and the stats of each recorded call."""
+        self.hooks.append(hook)
+
+    def reset(self) -> None:
+        """Forget the stats recorded so far, the hooks are kept."""
+        self.stats = EvaluationStats()
+
+    def record(self, name: str, stats: PhaseStats) -> None:
+        """Record the stats of a call, or of several calls, of a phase and pass them to the hooks."""
+        self.stats.add(name, stats)
+        for hook in self.hooks:
+            hook(name, stats)
+
+    @contextmanager
+    def phase(self, name: str, documents: int = 0, entities: int = 0) -> Iterator[PhaseStats]:
+        """
+        Time a block of code as a call of a phase.
+
+        Args:
+            name: Name of the phase
+            documents: Number of documents processed by the block
+            entities: Number of entities processed by the block
+
+        Yields:
+            The stats of the call, whose counts can be updated within the block
+        """
+        stats = PhaseStats(calls=1, documents=documents, entities=entities)
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds = time.perf_counter() - start
+            self.record(name, stats)
+
+
+class PhaseTimer:
+    """
+    Accumulate the time of consecutive phases repeated in a loop, such as the phases of the evaluation of a document.
+
+    Each call to lap() adds the time since the previous lap, or since the timer was created, to a phase.
+    """
+
+    def __init__(self, names: List[str]) -> None:
+        """
+        Initialize the timer.
+
+        Args:
+            names: Names of the phases, in the order of their indices in lap()
+        """
+        self.names = names
+        self.seconds = [0.0] * len(names)
+        self._last = time.perf_counter()
+
+    def lap(self, index: int) -> None:
+        """Add the time since the previous lap to the phase at an index, and start timing the next phase."""
+        now = time.perf_counter()
+        self.seconds[index] += now - self._last
+        self._last = now
+
+    def add_to(self, stats: EvaluationStats, documents: int, entities: int) -> None:
+        """Add the accumulated time of each phase, with one call per document."""
+        for name, seconds in zip(self.names, self.seconds):
+            stats.add(name, PhaseStats(calls=documents, seconds=seconds, documents=documents, entities=entities))
@@ -1,7 +1,20 @@
+import io
+import os
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from array import array
+from itertools import chain, zip_longest
+from typing import IO, List, Dict, Any, Iterable, Iterator, Mapping, Optional, Sequence, Tuple, Union
 
+from .columnar import require_numpy
 from .entities import Entity
+from .spans import SpanTable
+from .store import write_span_store
+from .vocabulary import LabelVocabulary
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
 
 
 class DataLoader(ABC):
@@ -11,11 +24,31 @@ class DataLoader(ABC):
     def load(self, data: Any) -> List[List[Entity]]:
         """Load data into a list of entity lists."""
 
+    def load_table(self, data: Any, vocabulary: Optional[LabelVocabulary] = None) -> SpanTable:
+        """
+        Load data into a SpanTable, which stores the entities of all the documents in flat arrays.
+
+        Args:
+            data: Data in the format of the loader
+            vocabulary: Vocabulary the label ids are taken from, a new one is created by default
+        """
+        return SpanTable.from_documents(self.load(data), vocabulary)
+
+    def write_store(self, data: Any, path: Union[str, os.PathLike]) -> None:
+        """
+        Load data and write its entities to a binary span store, which open_span_store() maps in memory.
+
+        Args:
+            data: Data in the format of the loader
+            path: Path of the store file, overwritten if it exists
+        """
+        write_span_store(path, self.load_table(data))
+
 
 class ConllLoader(DataLoader):
     """Loader for CoNLL format data."""
 
-    def load(self, data: str) -> List[List[Entity]]:  # pylint: disable=too-many-branches
+    def load(self, data: str) -> List[List[Entity]]:
         """Load CoNLL format data into a list of Entity lists."""
         if not isinstance(data, str):
             raise ValueError("ConllLoader expects string input")
@@ -23,69 +56,131 @@ class ConllLoader(DataLoader):
         if not data:
             return []
 
-        result: List[List[Entity]] = []
         # Strip trailing whitespace and newlines to avoid empty documents
         documents = data.rstrip().split("\n\n")
 
-        for doc in documents:
-            if not doc.strip():
-                result.append([])
-                continue
-
-            current_doc = []
-            start_offset = None
-            end_offset = None
-            ent_type = None
-            has_entities = False
-
-            for offset, line in enumerate(doc.split("\n")):
-                if not line.strip():
+        return [self._parse_document(doc.split("\n")) for doc in documents]
+
+    def iter_load(self, source: Union[str, os.PathLike, IO[str], Iterable[str]]) -> Iterator[List[Entity]]:
+        """
+        Lazily load CoNLL format data, yielding the entities of one document at a time.
+
+        Only the lines of the current document are kept in memory, and the documents are the same as the ones
+        returned by load() on the whole content. As in load() and the Evaluator, a string is CoNLL content, and a file
+        is given by a path object such as pathlib.Path.
+
+        Args:
+            source: CoNLL content, a path to a CoNLL file, an open file object, or any iterable of lines
+
+        Yields:
+            The list of entities of each document
+        """
+        if isinstance(source, os.PathLike):
+            with open(source, encoding="utf-8") as file:
+                yield from self.iter_load(file)
+            return
+        if isinstance(source, str):
+            source = source.split("\n")
+
+        doc_lines: List[str] = []
+        # The last document with content is held back, with the whitespace-only documents that follow it, since
+        # load() strips trailing whitespace from the end of the content
+        held_back: Optional[List[str]] = None
+        blank_documents = 0
+        after_separator = True
+        empty_content = True
+
+        for index, line in enumerate(chain(source, [None])):
+            if line is not None:
+                # Like load(""), a single empty line is empty content
+                empty_content = empty_content and index == 0 and not line
+                line = line[:-1] if line.endswith("\n") else line
+
+                # An empty line separates documents, unless it directly follows a separator. This mirrors how
+                # load() splits the content on "\n\n".
+                if line or after_separator:
+                    doc_lines.append(line)
+                    after_separator = False
                     continue
+                after_separator = True
+
+            if any(doc_line.strip() for doc_line in doc_lines):
+                if held_back is not None:
+                    yield self._parse_document(held_back)
+                yield from ([] for _ in range(blank_documents))
+                held_back = doc_lines
+                blank_documents = 0
+            else:
+                blank_documents += 1
+            doc_lines = []
+
+        if held_back is not None:
+            while not held_back[-1].strip():
+                held_back.pop()
+            held_back[-1] = held_back[-1].rstrip()
+            yield self._parse_document(held_back)
+        elif not empty_content:
+            # Content made only of whitespace is a single empty document
+            yield []
+
+    @staticmethod
+    def _parse_document(lines: List[str]) -> List[Entity]:  # pylint: disable=too-many-branches
+        """Parse the lines of a single CoNLL document into a list of entities."""
+        if all(not line.strip() for line in lines):
+            return []
 
-                parts = line.split("\t")
-                if len(parts) < 2:
-                    raise ValueError(f"Invalid CoNLL format: line '{line}' does not contain a tab separator")
+        current_doc = []
+        start_offset = None
+        end_offset = None
+        ent_type = None
+        has_entities = False
 
-                token_tag = parts[1]
+        for offset, line in enumerate(lines):
+            if not line.strip():
+                continue
 
-                if token_tag == "O":
-                    if ent_type is not None and start_offset is not None:
-                        end_offset = offset - 1
-                        if isinstance(start_offset, int) and isinstance(end_offset, int):
-                            current_doc.append(Entity(label=ent_type, start=start_offset, end=end_offset))
-                        start_offset = None
-                        end_offset = None
-                        ent_type = None
+            parts = line.split("\t")
+            if len(parts) < 2:
+                raise ValueError(f"Invalid CoNLL format: line '{line}' does not contain a tab separator")
 
-                elif ent_type is None:
-                    if not (token_tag.startswith("B-") or token_tag.startswith("I-")):
-                        raise ValueError(f"Invalid tag format: {token_tag}")
-                    ent_type = token_tag[2:]  # Remove B- or I- prefix
-                    start_offset = offset
-                    has_entities = True
+            token_tag = parts[1]
 
-                elif ent_type != token_tag[2:] or (ent_type == token_tag[2:] and token_tag[:1] == "B"):
+            if token_tag == "O":
+                if ent_type is not None and start_offset is not None:
                     end_offset = offset - 1
                     if isinstance(start_offset, int) and isinstance(end_offset, int):
                         current_doc.append(Entity(label=ent_type, start=start_offset, end=end_offset))
-
-                    # start of a new entity
-                    if not (token_tag.startswith("B-") or token_tag.startswith("I-")):
-                        raise ValueError(f"Invalid tag format: {token_tag}")
-                    ent_type = token_tag[2:]
-                    start_offset = offset
+                    start_offset = None
                     end_offset = None
-                    has_entities = True
+                    ent_type = None
 
-            # Catches an entity that goes up until the last token
-            if ent_type is not None and start_offset is not None and end_offset is None:
-                if isinstance(start_offset, int):
-                    current_doc.append(Entity(label=ent_type, start=start_offset, end=len(doc.split("\n")) - 1))
+            elif ent_type is None:
+                if not (token_tag.startswith("B-") or token_tag.startswith("I-")):
+                    raise ValueError(f"Invalid tag format: {token_tag}")
+                ent_type = token_tag[2:]  # Remove B- or I- prefix
+                start_offset = offset
                 has_entities = True
 
-            result.append(current_doc if has_entities else [])
+            elif ent_type != token_tag[2:] or (ent_type == token_tag[2:] and token_tag[:1] == "B"):
+                end_offset = offset - 1
+                if isinstance(start_offset, int) and isinstance(end_offset, int):
+                    current_doc.append(Entity(label=ent_type, start=start_offset, end=end_offset))
+
+                # start of a new entity
+                if not (token_tag.startswith("B-") or token_tag.startswith("I-")):
+                    raise ValueError(f"Invalid tag format: {token_tag}")
+                ent_type = token_tag[2:]
+                start_offset = offset
+                end_offset = None
+                has_entities = True
 
-        return result
+        # Catches an entity that goes up until the last token
+        if ent_type is not None and start_offset is not None and end_offset is None:
+            if isinstance(start_offset, int):
+                current_doc.append(Entity(label=ent_type, start=start_offset, end=len(lines) - 1))
+            has_entities = True
+
+        return current_doc if has_entities else []
 
 
 class ListLoader(DataLoader):
@@ -151,6 +246,200 @@ class ListLoader(DataLoader):
         return result
 
 
+class ArrayLoader(DataLoader):
+    """
+    Loader for integer tag id arrays, as output by token classification models.
+
+    The tag ids are decoded with the same BIO/IOB semantics as ListLoader, which gives the same entities as loading the
+    corresponding tag strings, but the entity boundaries of the whole batch are found with vectorized NumPy operations
+    instead of a loop over the tokens. The data is either a padded 2-D array of tag ids, with the length of each
+    document, or a sequence of 1-D tag id sequences.
+    """
+
+    def __init__(self, id2tag: Union[Sequence[str], Mapping[int, str]]) -> None:
+        """
+        Initialize the loader.
+
+        Args:
+            id2tag: Tag of each tag id, as a list indexed by tag id or a mapping from tag id to tag
+        """
+        require_numpy("ArrayLoader")
+        tags: List[Optional[str]]
+        if isinstance(id2tag, Mapping):
+            if any(not isinstance(tag_id, int) or tag_id < 0 for tag_id in id2tag):
+                raise ValueError("Tag ids must be non-negative integers")
+            tags = [None] * (max(id2tag) + 1 if id2tag else 0)
+            for tag_id in id2tag:
+                tags[tag_id] = id2tag[tag_id]
+        else:
+            tags = list(id2tag)
+        self.tags = tags
+
+        # Properties of each tag id, looked up for all the tokens at once
+        self.labels: List[str] = []
+        label_ids: Dict[str, int] = {}
+        self._known = np.zeros(len(tags), dtype=bool)
+        self._outside = np.zeros(len(tags), dtype=bool)
+        self._begin = np.zeros(len(tags), dtype=bool)
+        self._valid_start = np.zeros(len(tags), dtype=bool)
+        self._label = np.full(len(tags), -1, dtype=np.int64)
+        for tag_id, tag in enumerate(tags):
+            if tag is None:
+                continue
+            if not isinstance(tag, str):
+                raise ValueError(f"Invalid tag type: {type(tag)}")
+            self._known[tag_id] = True
+            if tag == "O":
+                self._outside[tag_id] = True
+                continue
+            label = tag[2:]
+            if label not in label_ids:
+                label_ids[label] = len(self.labels)
+                self.labels.append(label)
+            self._label[tag_id] = label_ids[label]
+            self._begin[tag_id] = tag[:1] == "B"
+            self._valid_start[tag_id] = tag.startswith("B-") or tag.startswith("I-")
+
+    def load(self, data: Any, lengths: Optional[Any] = None, mask: Optional[Any] = None) -> List[List[Entity]]:
+        """
+        Load tag id arrays into a list of entity lists.
+
+        Args:
+            data: Padded 2-D array of tag ids, or sequence of 1-D tag id sequences
+            lengths: Number of tokens of each document of a padded array, the padding is ignored. By default, all the
+                tokens of each row are used.
+            mask: Boolean array of the same shape as a padded array, only the selected tokens are decoded and the
+                entity offsets are positions among them, e.g. an attention mask or a mask of the first sub-token of
+                each word. Cannot be combined with lengths.
+        """
+        doc, start, end, label, n_documents = self.decode(data, lengths, mask)
+
+        labels = np.array(self.labels, dtype=object)[label].tolist()
+        entities = list(map(Entity, labels, start.tolist(), end.tolist()))
+        bounds = np.searchsorted(doc, np.arange(n_documents + 1)).tolist()
+        return [entities[bounds[i] : bounds[i + 1]] for i in range(n_documents)]
+
+    def load_table(
+        self,
+        data: Any,
+        vocabulary: Optional[LabelVocabulary] = None,
+        lengths: Optional[Any] = None,
+        mask: Optional[Any] = None,
+    ) -> SpanTable:
+        """Load tag id arrays into a SpanTable, without creating Entity objects, see load()."""
+        doc, start, end, label, n_documents = self.decode(data, lengths, mask)
+
+        table = SpanTable(vocabulary)
+        # Add the labels to the vocabulary in order of appearance, as when loading the entities one by one
+        used, first = np.unique(label, return_index=True)
+        lookup = np.zeros(len(self.labels), dtype=np.int32)
+        for label_id in used[np.argsort(first)].tolist():
+            lookup[label_id] = table.label_id(self.labels[label_id])
+
+        table.label_ids = array("i", lookup[label].astype(np.int32).tobytes())
+        table.starts = array("q", start.astype(np.int64).tobytes())
+        table.ends = array("q", end.astype(np.int64).tobytes())
+        table.offsets = array("q", np.searchsorted(doc, np.arange(n_documents + 1)).astype(np.int64).tobytes())
+        return table
+
+    def decode(
+        self, data: Any, lengths: Optional[Any] = None, mask: Optional[Any] = None
+    ) -> Tuple[Any, Any, Any, Any, int]:
+        """
+        Decode tag id arrays into flat entity arrays.
+
+        Args:
+            data: Padded 2-D array of tag ids, or sequence of 1-D tag id sequences
+            lengths: Number of tokens of each document of a padded array
+            mask: Tokens of a padded array to decode
+
+        Returns:
+            The document, start, end and index in `labels` of each entity, ordered by document and start, and the
+            number of documents
+        """
+        tokens, lengths = _flatten_tag_ids(data, lengths, mask)
+        known = (tokens >= 0) & (tokens < len(self.tags))
+        known[known] = self._known[tokens[known]]
+        if not known.all():
+            raise ValueError(f"Unknown tag id: {tokens[~known][0]}")
+
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        first = np.zeros(len(tokens), dtype=bool)
+        first[offsets[:-1][lengths > 0]] = True
+
+        # A token continues the entity of the previous token of its document when it has the same label and is not a
+        # B tag, every other token which is not O starts an entity
+        outside = self._outside[tokens]
+        label = self._label[tokens]
+        continues = np.zeros(len(tokens), dtype=bool)
+        continues[1:] = ~outside[1:] & ~outside[:-1] & (label[1:] == label[:-1]) & ~self._begin[tokens[1:]]
+        continues &= ~first
+        starts = ~outside & ~continues
+
+        invalid = np.flatnonzero(starts & ~self._valid_start[tokens])
+        if invalid.size:
+            raise ValueError(f"Invalid tag format: {self.tags[tokens[invalid[0]]]}")
+
+        # An entity ends before the next token of the batch unless that token continues it
+        ends = ~outside
+        ends[:-1] &= ~continues[1:]
+
+        start_positions = np.flatnonzero(starts)
+        end_positions = np.flatnonzero(ends)
+        doc = np.searchsorted(offsets, start_positions, side="right") - 1
+        return (
+            doc,
+            start_positions - offsets[doc],
+            end_positions - offsets[doc],
+            label[start_positions],
+            len(lengths),
+        )
+
+
+def _flatten_tag_ids(  # pylint: disable=too-many-branches
+    data: Any, lengths: Optional[Any], mask: Optional[Any] = None
+) -> Tuple[Any, Any]:
+    """Concatenate the tag ids of all the documents, returning them with the length of each document."""
+    if not isinstance(data, (list, tuple, np.ndarray)) and hasattr(data, "__array__"):
+        # Tensors of other array libraries
+        data = np.asarray(data)
+
+    if mask is not None:
+        if lengths is not None:
+            raise ValueError("Pass either lengths or mask, not both")
+        mask = np.asarray(mask, dtype=bool)
+        if not isinstance(data, np.ndarray) or data.ndim != 2 or mask.shape != data.shape:
+            raise ValueError("mask must have the same shape as a padded 2-D array of tag ids")
+        tokens = data[mask]
+        lengths = mask.sum(axis=1, dtype=np.int64)
+    elif isinstance(data, np.ndarray) and data.ndim == 2:
+        if lengths is None:
+            lengths = np.full(data.shape[0], data.shape[1], dtype=np.int64)
+        lengths = np.asarray(lengths, dtype=np.int64)
+        if lengths.shape != (data.shape[0],):
+            raise ValueError("lengths must have one value per document")
+        if lengths.size and (lengths.min() < 0 or lengths.max() > data.shape[1]):
+            raise ValueError("lengths must be between 0 and the number of columns of the tag ids")
+        tokens = data[np.arange(data.shape[1]) < lengths[:, None]]
+    elif isinstance(data, (list, tuple)) or (isinstance(data, np.ndarray) and data.ndim == 1 and data.dtype == object):
+        if lengths is not None:
+            raise ValueError("lengths are only supported with a padded 2-D array of tag ids")
+        documents = [np.asarray(doc) for doc in data]
+        if any(doc.ndim != 1 for doc in documents):
+            raise ValueError("Each document must be a 1-D sequence of tag ids")
+        if any(doc.size and not np.issubdtype(doc.dtype, np.integer) for doc in documents):
+            raise ValueError("Tag ids must be integers")
+        lengths = np.array([len(doc) for doc in documents], dtype=np.int64)
+        tokens = np.concatenate([doc.astype(np.int64, copy=False) for doc in documents] or [np.empty(0, np.int64)])
+    else:
+        raise ValueError("ArrayLoader expects a 2-D array or a sequence of 1-D tag id sequences")
+
+    if tokens.size and not np.issubdtype(tokens.dtype, np.integer):
+        raise ValueError("Tag ids must be integers")
+    return tokens.astype(np.int64, copy=False), lengths
+
+
 class DictLoader(DataLoader):
     """Loader for dictionary format data."""
 
@@ -162,28 +451,165 @@ class DictLoader(DataLoader):
         if not data:
             return []
 
-        result = []
-
-        for doc in data:
-            if not isinstance(doc, list):
-                raise ValueError("Each document must be a list of entity dictionaries")
-
-            current_doc = []
-            for entity in doc:
-                if not isinstance(entity, dict):
-                    raise ValueError(f"Invalid entity type: {type(entity)}")
-
-                required_keys = {"label", "start", "end"}
-                if not all(key in entity for key in required_keys):
-                    raise ValueError(f"Entity missing required keys: {required_keys}")
+        return [[Entity(*span) for span in self._iter_spans(doc)] for doc in data]
 
-                if not isinstance(entity["label"], str):
-                    raise ValueError("Entity label must be a string")
-
-                if not isinstance(entity["start"], int) or not isinstance(entity["end"], int):
-                    raise ValueError("Entity start and end must be integers")
-
-                current_doc.append(Entity(label=entity["label"], start=entity["start"], end=entity["end"]))
-            result.append(current_doc)
+    def load_table(self, data: List[List[Dict[str, Any]]], vocabulary: Optional[LabelVocabulary] = None) -> SpanTable:
+        """Load dictionary format data into a SpanTable, without creating Entity objects."""
+        if not isinstance(data, list):
+            raise ValueError("DictLoader expects list input")
 
-        return result
+        table = SpanTable(vocabulary)
+        for doc in data:
+            table.append_spans(self._iter_spans(doc))
+        return table
+
+    @staticmethod
+    def _iter_spans(doc: List[Dict[str, Any]]) -> Iterator[Tuple[str, int, int]]:
+        """Validate the entity dictionaries of a document and yield their (label, start, end) tuples."""
+        if not isinstance(doc, list):
+            raise ValueError("Each document must be a list of entity dictionaries")
+
+        for entity in doc:
+            if not isinstance(entity, dict):
+                raise ValueError(f"Invalid entity type: {type(entity)}")
+
+            required_keys = {"label", "start", "end"}
+            if not all(key in entity for key in required_keys):
+                raise ValueError(f"Entity missing required keys: {required_keys}")
+
+            if not isinstance(entity["label"], str):
+                raise ValueError("Entity label must be a string")
+
+            if not isinstance(entity["start"], int) or not isinstance(entity["end"], int):
+                raise ValueError("Entity start and end must be integers")
+
+            yield entity["label"], entity["start"], entity["end"]
+
+
+def load_documents(
+    true: Any,
+    pred: Any,
+    loader: str = "default",
+    loaders: Optional[Dict[str, DataLoader]] = None,
+    vocabulary: Optional[LabelVocabulary] = None,
+) -> Tuple[Sequence[Sequence[Entity]], Sequence[Sequence[Entity]]]:
+    """
+    Load the true and predicted data with the same loader.
+
+    A SpanTable, such as a memory-mapped span store, is used as is, and only the other data is loaded. CoNLL data given
+    as a path object, an open file or an iterator over lines is read one document at a time, while a string is always
+    CoNLL content.
+
+    Args:
+        true: True entities in any supported format
+        pred: Predicted entities in any supported format
+        loader: Name of the loader to use, 'default' infers it from the type of the true data
+        loaders: Available loaders by name, defaults to the 'conll', 'list' and 'dict' loaders
+        vocabulary: When given, the documents are loaded into two SpanTables taking their label ids from it
+
+    Returns:
+        The true and predicted entities of each document
+    """
+    if loaders is None:
+        loaders = {"conll": ConllLoader(), "list": ListLoader(), "dict": DictLoader()}
+
+    if isinstance(true, SpanTable) or isinstance(pred, SpanTable):
+        return _load_with_span_table(true, pred, loader, loaders, vocabulary)
+
+    if loader == "default":
+        loader = _infer_loader(true)
+
+    if loader not in loaders:
+        raise ValueError(f"Unknown loader: {loader}")
+
+    # For list loader, check document lengths before loading
+    if loader == "list":
+        if len(true) != len(pred):
+            raise ValueError("Number of predicted documents does not equal true")
+
+        # Check that each document has the same length
+        for i, (true_doc, pred_doc) in enumerate(zip(true, pred)):
+            if len(true_doc) != len(pred_doc):
+                raise ValueError(f"Document {i} has different lengths: true={len(true_doc)}, pred={len(pred_doc)}")
+
+    conll_loader = loaders[loader]
+    if isinstance(conll_loader, ConllLoader) and (_is_conll_stream(true) or _is_conll_stream(pred)):
+        true_read: Union[List[List[Entity]], SpanTable] = [] if vocabulary is None else SpanTable(vocabulary)
+        pred_read: Union[List[List[Entity]], SpanTable] = [] if vocabulary is None else SpanTable(vocabulary)
+        # Each document is added to the loaded data as it is read, span tables only keep its spans
+        for true_doc, pred_doc in _iter_conll_streams(conll_loader, true, pred):
+            true_read.append(true_doc)
+            pred_read.append(pred_doc)
+        return true_read, pred_read
+
+    true_docs: Sequence[Sequence[Entity]]
+    pred_docs: Sequence[Sequence[Entity]]
+    if vocabulary is None:
+        true_docs, pred_docs = loaders[loader].load(true), loaders[loader].load(pred)
+    else:
+        true_docs, pred_docs = loaders[loader].load_table(true, vocabulary), loaders[loader].load_table(
+            pred, vocabulary
+        )
+
+    if len(true_docs) != len(pred_docs):
+        raise ValueError("Number of predicted documents does not equal true")
+
+    return true_docs, pred_docs
+
+
+def _infer_loader(true: Any) -> str:
+    """Infer the name of the loader from the type of the true data, the list loader when no document has entities."""
+    if isinstance(true, str) or _is_conll_stream(true):
+        return "conll"
+    if isinstance(true, list) and true and isinstance(true[0], list):
+        # Documents without entities fit any format, such as the empty documents of a batch
+        first = next((document[0] for document in true if document), None)
+        if isinstance(first, dict):
+            return "dict"
+        return "list"
+    raise ValueError("Could not infer loader from input type")
+
+
+def _load_with_span_table(
+    true: Any, pred: Any, loader: str, loaders: Dict[str, DataLoader], vocabulary: Optional[LabelVocabulary]
+) -> Tuple[Sequence[Sequence[Entity]], Sequence[Sequence[Entity]]]:
+    """Load the true or predicted data which is not already a span table, span tables need no loading."""
+    if not isinstance(true, SpanTable):
+        true = _load_single(true, loader, loaders, vocabulary)
+    elif not isinstance(pred, SpanTable):
+        pred = _load_single(pred, loader, loaders, vocabulary)
+    if len(true) != len(pred):
+        raise ValueError("Number of predicted documents does not equal true")
+    return true, pred
+
+
+def _load_single(
+    data: Any, loader: str, loaders: Dict[str, DataLoader], vocabulary: Optional[LabelVocabulary]
+) -> Sequence[Sequence[Entity]]:
+    """Load the true or predicted data on its own."""
+    if loader == "default":
+        loader = _infer_loader(data)
+    if loader not in loaders:
+        raise ValueError(f"Unknown loader: {loader}")
+
+    data_loader = loaders[loader]
+    if isinstance(data_loader, ConllLoader) and _is_conll_stream(data):
+        if vocabulary is None:
+            return list(data_loader.iter_load(data))
+        return SpanTable.from_documents(data_loader.iter_load(data), vocabulary)
+    if vocabulary is None:
+        return data_loader.load(data)
+    return data_loader.load_table(data, vocabulary)
+
+
+def _is_conll_stream(data: Any) -> bool:
+    """Check whether the data is a path to a CoNLL file, an open file or an iterator over lines."""
+    return isinstance(data, (os.PathLike, io.IOBase, Iterator))
+
+
+def _iter_conll_streams(conll_loader: ConllLoader, true: Any, pred: Any) -> Iterator[Tuple[List[Entity], List[Entity]]]:
+    """Read the true and predicted CoNLL documents in lockstep, without loading the whole content in memory."""
+    for true_doc, pred_doc in zip_longest(conll_loader.iter_load(true), conll_loader.iter_load(pred)):
+        if true_doc is None or pred_doc is None:
+            raise ValueError("Number of predicted documents does not equal true")
+        yield true_doc, pred_doc
@@ -0,0 +1,90 @@
+import heapq
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from typing import Dict, List, Sequence, Tuple
+
+from .entities import Entity
+
+
+class MatchingEngine(ABC):
+    """
+    Abstract base class for matching engines.
+
+    A matching engine decides, for every predicted entity, which true entities are worth comparing against it. The
+    evaluation strategies then walk these candidates in increasing true index order, so any engine that returns every
+    true entity overlapping a prediction produces exactly the same greedy matches.
+    """
+
+    @abstractmethod
+    def candidates(self, true_entities: List[Entity], pred_entities: List[Entity]) -> List[Sequence[int]]:
+        """
+        Find the candidate true entities for each predicted entity.
+
+        Returns:
+            One sequence of true entity indices per predicted entity, sorted in increasing order
+        """
+
+
+class PairwiseMatching(MatchingEngine):
+    """
+    Pairwise matching engine - every predicted entity is compared against every true entity.
+
+    This is the original O(n·m) behaviour of the evaluation strategies.
+    """
+
+    def candidates(self, true_entities: List[Entity], pred_entities: List[Entity]) -> List[Sequence[int]]:
+        all_true = range(len(true_entities))
+        return [all_true] * len(pred_entities)
+
+
+class SweepMatching(MatchingEngine):
+    """
+    Sort-and-sweep matching engine - only overlapping entities are compared.
+
+    Both span lists are sorted by their start offset and swept with two pointers. A true entity overlaps a predicted
+    entity either because it starts inside the prediction, which is a range lookup on the sorted starts, or because it
+    started before the prediction and is still open, which is tracked with a heap of the currently open true entities.
+    The cost is O((n+m) log(n+m)) plus the number of overlapping pairs, instead of O(n·m).
+
+    Entity spans are expected to be inclusive, with start <= end.
+    """
+
+    def candidates(self, true_entities: List[Entity], pred_entities: List[Entity]) -> List[Sequence[int]]:
+        true_order = sorted(range(len(true_entities)), key=lambda idx: true_entities[idx].start)
+        true_starts = [true_entities[idx].start for idx in true_order]
+        pred_order = sorted(range(len(pred_entities)), key=lambda idx: pred_entities[idx].start)
+
+        result: List[Sequence[int]] = [[] for _ in pred_entities]
+        open_true: List[Tuple[int, int]] = []  # heap of (end, true_idx) for true entities starting before the pred
+        pointer = 0
+
+        for pred_idx in pred_order:
+            pred = pred_entities[pred_idx]
+
+            # Open every true entity that starts before this prediction
+            while pointer < len(true_order) and true_starts[pointer] < pred.start:
+                true_idx = true_order[pointer]
+                heapq.heappush(open_true, (true_entities[true_idx].end, true_idx))
+                pointer += 1
+
+            # Close the true entities that end before this prediction, predictions are visited by increasing start
+            while open_true and open_true[0][0] < pred.start:
+                heapq.heappop(open_true)
+
+            found = [true_idx for _, true_idx in open_true]
+            # True entities starting inside the prediction
+            found.extend(true_order[pointer : bisect_right(true_starts, pred.end, lo=pointer)])
+            found.sort()
+            result[pred_idx] = found
+
+        return result
+
+
+MATCHING_ENGINES: Dict[str, MatchingEngine] = {"pairwise": PairwiseMatching(), "sweep": SweepMatching()}
+
+
+def get_matching_engine(name: str) -> MatchingEngine:
+    """Get a matching engine by name."""
+    if name not in MATCHING_ENGINES:
+        raise ValueError(f"Unknown matching engine: {name}")
+    return MATCHING_ENGINES[name]
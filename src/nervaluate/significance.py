@@ -0,0 +1,155 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .bootstrap import METRICS, _batches, _resample_features
+from .columnar import require_numpy
+from .counters import DocumentCounters, metrics_from_counts, partial_weights
+from .evaluator import Evaluator
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+SIGNIFICANCE_METHODS = ("randomization", "bootstrap")
+
+
+@dataclass
+class SignificanceResult:
+    """Represents the metric of two systems on the same corpus and the p-value of their difference."""
+
+    score_a: float
+    score_b: float
+    difference: float
+    p_value: float
+
+
+def paired_significance_test(  # pylint: disable=too-many-positional-arguments
+    system_a: Union[Evaluator, DocumentCounters],
+    system_b: Union[Evaluator, DocumentCounters],
+    method: str = "randomization",
+    n_rounds: int = 10000,
+    seed: Optional[int] = None,
+    metric: str = "f1",
+) -> Dict[str, Any]:
+    """
+    Test whether the difference between the metrics of two systems evaluated against the same gold is significant.
+
+    Each document is evaluated once per system. The approximate randomization test swaps the outputs of the two systems
+    on a random subset of the documents in each round, and the paired bootstrap resamples the documents with
+    replacement and evaluates both systems on the same resample. The counters of all the rounds are matrix products of
+    the swaps, or of the number of times each document is drawn, with the counters of the documents.
+
+    Args:
+        system_a: Counters of each document for the first system, or an evaluator whose documents are evaluated to get
+            them
+        system_b: Counters of each document for the second system, on the same documents as the first one
+        method: 'randomization' for the paired approximate randomization test, 'bootstrap' for the paired bootstrap
+        n_rounds: Number of permutation or resampling rounds
+        seed: Seed of the random generator, the same seed gives the same p-values
+        metric: Metric to compare, among 'precision', 'recall' and 'f1'
+
+    Returns:
+        Dictionary with the same 'overall' and 'entities' structure as Evaluator.evaluate(), mapping each strategy to
+        the SignificanceResult of the two-sided test of the difference of the metric. The entity types are those of
+        either system.
+    """
+    require_numpy("paired_significance_test")
+    if method not in SIGNIFICANCE_METHODS:
+        raise ValueError(f"Unknown significance method: {method}, must be one of {list(SIGNIFICANCE_METHODS)}")
+    if n_rounds < 1:
+        raise ValueError("n_rounds must be a positive integer")
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric}, must be one of {list(METRICS)}")
+    counters_a, counters_b = _paired_counters(system_a, system_b)
+
+    features_a, features_b = counters_a.features(), counters_b.features()
+    if method == "randomization":
+        rounds_a, rounds_b = _permute_features(features_a, features_b, n_rounds, seed)
+    else:
+        resampled = _resample_features(np.concatenate([features_a, features_b], axis=1), n_rounds, seed)
+        rounds_a, rounds_b = resampled[:, : features_a.shape[1]], resampled[:, features_a.shape[1] :]
+
+    weights = partial_weights(counters_a.strategies)
+    position = METRICS.index(metric)
+
+    def scores(counters: DocumentCounters, rows: Any) -> Tuple[Any, Any]:
+        """Compute the metric of each strategy, and of each strategy and tag, for rows of summed features."""
+        overall, entities = counters.split_features(rows)
+        return (
+            metrics_from_counts(overall, weights)[position],
+            metrics_from_counts(entities, weights[:, None])[position],
+        )
+
+    observed_a = scores(counters_a, features_a.sum(axis=0, keepdims=True))
+    observed_b = scores(counters_b, features_b.sum(axis=0, keepdims=True))
+    rounds_scores_a, rounds_scores_b = scores(counters_a, rounds_a), scores(counters_b, rounds_b)
+    p_values = [
+        _p_value(method, observed_b[index][0] - observed_a[index][0], rounds_scores_b[index] - rounds_scores_a[index])
+        for index in range(2)
+    ]
+
+    def result(index: int, key: Tuple[int, ...]) -> SignificanceResult:
+        """Get the result of a strategy, or of a strategy and a tag, from the overall (0) or entity (1) arrays."""
+        score_a, score_b = float(observed_a[index][0][key]), float(observed_b[index][0][key])
+        return SignificanceResult(score_a, score_b, score_b - score_a, float(p_values[index][key]))
+
+    return {
+        "overall": {name: result(0, (strategy,)) for strategy, name in enumerate(counters_a.strategies)},
+        "entities": {
+            tag: {name: result(1, (strategy, tag_position)) for strategy, name in enumerate(counters_a.strategies)}
+            for tag_position, tag in enumerate(counters_a.tags)
+        },
+    }
+
+
+def _paired_counters(
+    system_a: Union[Evaluator, DocumentCounters], system_b: Union[Evaluator, DocumentCounters]
+) -> Tuple[DocumentCounters, DocumentCounters]:
+    """Get the counters of both systems, for the same strategies and the entity types of either system."""
+    counters_a = DocumentCounters.from_evaluator(system_a) if isinstance(system_a, Evaluator) else system_a
+    counters_b = DocumentCounters.from_evaluator(system_b) if isinstance(system_b, Evaluator) else system_b
+    if counters_a.n_documents != counters_b.n_documents:
+        raise ValueError(
+            f"Both systems must be evaluated on the same documents, got {counters_a.n_documents} and "
+            f"{counters_b.n_documents} documents"
+        )
+    if counters_a.n_documents == 0:
+        raise ValueError("The significance test requires at least one document")
+    if tuple(counters_a.strategies) != tuple(counters_b.strategies):
+        raise ValueError("Both systems must be evaluated with the same strategies")
+
+    tags = list(dict.fromkeys([*counters_a.tags, *counters_b.tags]))
+    return counters_a.with_tags(tags), counters_b.with_tags(tags)
+
+
+def _permute_features(features_a: Any, features_b: Any, n_rounds: int, seed: Optional[int]) -> Tuple[Any, Any]:
+    """Sum the features of each system over the documents after swapping the systems on random documents."""
+    rng = np.random.default_rng(seed)
+    differences = features_b - features_a
+    # Swapping a document whose counters are the same for both systems changes nothing, so only the others are drawn
+    differences = differences[np.any(differences != 0, axis=1)]
+    total_a, total_b = features_a.sum(axis=0), features_b.sum(axis=0)
+
+    swapped = np.empty((n_rounds, features_a.shape[1]))
+    for start, size in _batches(n_rounds, len(differences)):
+        swaps = rng.integers(0, 2, size=(size, len(differences))).astype(np.float64)
+        swapped[start : start + size] = swaps @ differences
+    return total_a + swapped, total_b - swapped
+
+
+def _p_value(method: str, observed: Any, differences: Any) -> Any:
+    """
+    Compute the two-sided p-values of observed differences from the differences of the rounds.
+
+    The randomization test counts the rounds whose difference is at least as large as the observed one, with the
+    observed assignment counted as a round. The bootstrap differences are centred on the observed difference, so the
+    test counts the rounds that deviate from it by at least the observed difference.
+    """
+    # Differences equal up to the rounding of the sums must count as large as the observed one
+    tolerance = 1e-12
+    if method == "randomization":
+        extreme = np.abs(differences) >= np.abs(observed) - tolerance
+        return (extreme.sum(axis=0) + 1) / (len(differences) + 1)
+    extreme = np.abs(differences - observed) >= np.abs(observed) - tolerance
+    return extreme.mean(axis=0)
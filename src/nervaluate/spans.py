@@ -0,0 +1,204 @@
+from array import array
+from typing import Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union, overload
+
+from .entities import Entity
+from .vocabulary import LabelVocabulary
+
+
+class DocumentSpans(Sequence[Entity]):
+    """
+    Read-only view on the entities of one document of a SpanTable.
+
+    Entities are created on access, so a view costs the same whatever the number of entities in the document.
+    """
+
+    __slots__ = ("table", "begin", "end")
+
+    def __init__(self, table: "SpanTable", begin: int, end: int) -> None:
+        self.table = table
+        self.begin = begin
+        self.end = end
+
+    def __len__(self) -> int:
+        return self.end - self.begin
+
+    @overload
+    def __getitem__(self, index: int) -> Entity: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Entity]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Entity, List[Entity]]:
+        if isinstance(index, slice):
+            return [self.table.entity(self.begin + row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("entity index out of range")
+        return self.table.entity(self.begin + index)
+
+    def __iter__(self) -> Iterator[Entity]:
+        table = self.table
+        labels, label_ids, starts, ends = table.labels, table.label_ids, table.starts, table.ends
+        for row in range(self.begin, self.end):
+            yield Entity(labels[label_ids[row]], starts[row], ends[row])
+
+    def select(self, mask: bytearray) -> List[Entity]:
+        """
+        Get the entities whose label is selected by a mask, without creating the other entities.
+
+        Args:
+            mask: Mask indexed by label id, as returned by LabelVocabulary.mask()
+        """
+        table = self.table
+        labels, label_ids, starts, ends = table.labels, table.label_ids, table.starts, table.ends
+        return [
+            Entity(labels[label_ids[row]], starts[row], ends[row])
+            for row in range(self.begin, self.end)
+            if mask[label_ids[row]]
+        ]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(entity == other_entity for entity, other_entity in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"DocumentSpans({list(self)!r})"
+
+
+class SpanTable(Sequence[DocumentSpans]):
+    """
+    Struct-of-arrays storage of the entities of a corpus.
+
+    The label id, start and end of every entity are stored in flat stdlib arrays, 20 bytes per entity instead of a
+    Python object each, and the documents are delimited by offsets into these arrays. Labels are interned in a
+    LabelVocabulary, which can be shared between tables.
+
+    The table behaves like a list of documents, each document being a DocumentSpans view which behaves like a list of
+    Entity, so it can be used wherever a list of entity lists is expected, including as the true or predicted entities
+    of an Evaluator. Slicing a table returns a new table sharing the same vocabulary.
+    """
+
+    def __init__(self, vocabulary: Optional[LabelVocabulary] = None) -> None:
+        """
+        Initialize an empty table.
+
+        Args:
+            vocabulary: Label vocabulary, the labels of added entities are added to it. A new vocabulary is created
+                by default, tables compared or evaluated together can share one.
+        """
+        self.vocabulary = vocabulary if vocabulary is not None else LabelVocabulary()
+        self.label_ids = array("i")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.offsets = array("q", [0])
+
+    @classmethod
+    def from_documents(
+        cls, documents: Iterable[Iterable[Entity]], vocabulary: Optional[LabelVocabulary] = None
+    ) -> "SpanTable":
+        """Create a table from the entities of each document."""
+        table = cls(vocabulary)
+        for document in documents:
+            table.append(document)
+        return table
+
+    @property
+    def labels(self) -> List[str]:
+        """Labels of the vocabulary, indexed by label id."""
+        return self.vocabulary.labels
+
+    def label_id(self, label: str) -> int:
+        """Get the id of a label, adding it to the vocabulary if needed."""
+        return self.vocabulary.add(label)
+
+    def used_labels(self) -> Set[str]:
+        """Get the labels of the entities of the table."""
+        labels = self.labels
+        return {labels[label_id] for label_id in set(self.label_ids)}
+
+    def append(self, document: Iterable[Entity]) -> None:
+        """Add a document at the end of the table."""
+        self.append_spans((entity.label, entity.start, entity.end) for entity in document)
+
+    def append_spans(self, spans: Iterable[Tuple[str, int, int]]) -> None:
+        """Add a document given as (label, start, end) tuples at the end of the table."""
+        label_ids, starts, ends = self.label_ids, self.starts, self.ends
+        label_id = self.vocabulary.add
+        for label, start, end in spans:
+            label_ids.append(label_id(label))
+            starts.append(start)
+            ends.append(end)
+        self.offsets.append(len(starts))
+
+    def entity(self, row: int) -> Entity:
+        """Get the entity stored at a row of the table."""
+        return Entity(self.labels[self.label_ids[row]], self.starts[row], self.ends[row])
+
+    def to_documents(self) -> List[List[Entity]]:
+        """Convert the table to a list of entity lists."""
+        return [list(document) for document in self]
+
+    @property
+    def n_entities(self) -> int:
+        """Total number of entities in the table."""
+        return len(self.starts)
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes used by the arrays of the table."""
+        return sum(column.itemsize * len(column) for column in (self.label_ids, self.starts, self.ends, self.offsets))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> DocumentSpans: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "SpanTable": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[DocumentSpans, "SpanTable"]:
+        if isinstance(index, slice):
+            return self._slice(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("document index out of range")
+        return DocumentSpans(self, self.offsets[index], self.offsets[index + 1])
+
+    def __iter__(self) -> Iterator[DocumentSpans]:
+        offsets = self.offsets
+        for index in range(len(self)):
+            yield DocumentSpans(self, offsets[index], offsets[index + 1])
+
+    def _slice(self, index: slice) -> "SpanTable":
+        """Copy a range of documents into a new table sharing the same vocabulary."""
+        table = SpanTable(self.vocabulary)
+        first, last, step = index.indices(len(self))
+        if step != 1:
+            for document_index in range(first, last, step):
+                table.append(self[document_index])
+            return table
+        last = max(first, last)
+        begin, end = self.offsets[first], self.offsets[last]
+        table.label_ids = self.label_ids[begin:end]
+        table.starts = self.starts[begin:end]
+        table.ends = self.ends[begin:end]
+        table.offsets = array("q", (offset - begin for offset in self.offsets[first : last + 1]))
+        return table
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(
+                document == other_document for document, other_document in zip(self, other)
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"SpanTable({len(self)} documents, {self.n_entities} entities, {len(self.labels)} labels)"
@@ -0,0 +1,252 @@
+import json
+from dataclasses import dataclass, field, replace
+from functools import reduce
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .entities import EvaluationIndices, EvaluationResult
+
+STATE_VERSION = 1
+
+COUNTERS = ("correct", "incorrect", "partial", "missed", "spurious")
+
+# Strategies whose precision and recall count a partial match as half a correct match
+PARTIAL_CREDIT_STRATEGIES = frozenset({"partial", "ent_type"})
+
+
+@dataclass
+class EvaluationState:
+    """
+    Represents the mergeable state of an evaluation over a set of documents.
+
+    A state holds the counters of each strategy, overall and per entity type, and optionally the indices of the
+    entities in each category, with instance indices relative to the whole corpus. States computed on disjoint sets of
+    documents, for instance on several machines, can be merged in any order and grouping into the state of the union
+    of the documents, and the metrics are then computed from the merged counters.
+    """
+
+    tags: List[str]
+    min_overlap_percentage: float = 1.0
+    documents: List[Tuple[int, int]] = field(default_factory=list)
+    overall: Dict[str, EvaluationResult] = field(default_factory=dict)
+    entities: Dict[str, Dict[str, EvaluationResult]] = field(default_factory=dict)
+    overall_indices: Optional[Dict[str, EvaluationIndices]] = None
+    entity_indices: Optional[Dict[str, Dict[str, EvaluationIndices]]] = None
+    version: int = STATE_VERSION
+
+    def __post_init__(self) -> None:
+        self.tags = sorted(set(self.tags))
+
+    @property
+    def n_documents(self) -> int:
+        """Number of documents covered by the state."""
+        return sum(end - start for start, end in self.documents)
+
+    def merge(self, other: "EvaluationState") -> "EvaluationState":
+        """
+        Merge two states computed on disjoint sets of documents.
+
+        Indices are only kept if both states have them.
+
+        Returns:
+            A new state covering the documents of both states, neither state is modified
+        """
+        if self.version != other.version:
+            raise ValueError(f"Cannot merge states with different versions: {self.version} and {other.version}")
+        if self.tags != other.tags:
+            raise ValueError("Cannot merge states with different tags")
+        if self.min_overlap_percentage != other.min_overlap_percentage:
+            raise ValueError("Cannot merge states with different min_overlap_percentage")
+
+        merged = EvaluationState(
+            tags=self.tags,
+            min_overlap_percentage=self.min_overlap_percentage,
+            documents=_merge_document_ranges(self.documents, other.documents),
+            overall=_merge_counters(self.overall, other.overall),
+            entities={
+                tag: _merge_counters(self.entities.get(tag, {}), other.entities.get(tag, {}))
+                for tag in sorted(self.entities.keys() | other.entities.keys())
+            },
+        )
+
+        if self.overall_indices is not None and other.overall_indices is not None:
+            merged.overall_indices = _merge_indices(self.overall_indices, other.overall_indices)
+        if self.entity_indices is not None and other.entity_indices is not None:
+            merged.entity_indices = {
+                tag: _merge_indices(self.entity_indices.get(tag, {}), other.entity_indices.get(tag, {}))
+                for tag in sorted(self.entity_indices.keys() | other.entity_indices.keys())
+            }
+
+        return merged
+
+    def compute(self) -> Dict[str, Any]:
+        """
+        Compute the metrics from the counters.
+
+        Returns:
+            Dictionary containing evaluation results for each strategy and entity type, with the same keys as
+            Evaluator.evaluate() when the state has indices
+        """
+        results: Dict[str, Any] = {
+            "overall": {name: self._finalize(name, result) for name, result in self.overall.items()},
+            "entities": {
+                tag: {name: self._finalize(name, result) for name, result in tag_results.items()}
+                for tag, tag_results in self.entities.items()
+            },
+        }
+        if self.overall_indices is not None:
+            results["overall_indices"] = _copy_indices(self.overall_indices)
+        if self.entity_indices is not None:
+            results["entity_indices"] = {tag: _copy_indices(indices) for tag, indices in self.entity_indices.items()}
+        return results
+
+    def _finalize(self, strategy_name: str, result: EvaluationResult) -> EvaluationResult:
+        """Copy a result and compute its metrics the way Evaluator.evaluate() reports them."""
+        result = replace(result)
+        result.compute_metrics(partial_or_type=strategy_name in PARTIAL_CREDIT_STRATEGIES)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the state to a compact dictionary of built-in types.
+
+        Counters are stored as [correct, incorrect, partial, missed, spurious] lists, and the indices of each category
+        as flat [instance, entity, instance, entity, ...] lists.
+        """
+        data: Dict[str, Any] = {
+            "version": self.version,
+            "tags": self.tags,
+            "min_overlap_percentage": self.min_overlap_percentage,
+            "documents": [list(document_range) for document_range in self.documents],
+            "overall": {name: _counters_to_list(result) for name, result in self.overall.items()},
+            "entities": {
+                tag: {name: _counters_to_list(result) for name, result in tag_results.items()}
+                for tag, tag_results in self.entities.items()
+            },
+        }
+        if self.overall_indices is not None:
+            data["overall_indices"] = {
+                name: _indices_to_dict(indices) for name, indices in self.overall_indices.items()
+            }
+        if self.entity_indices is not None:
+            data["entity_indices"] = {
+                tag: {name: _indices_to_dict(indices) for name, indices in tag_indices.items()}
+                for tag, tag_indices in self.entity_indices.items()
+            }
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EvaluationState":
+        """Create a state from a dictionary produced by to_dict()."""
+        if data.get("version") != STATE_VERSION:
+            raise ValueError(f"Unsupported state version: {data.get('version')}")
+
+        state = cls(
+            tags=data["tags"],
+            min_overlap_percentage=data["min_overlap_percentage"],
+            documents=[(document_range[0], document_range[1]) for document_range in data["documents"]],
+            overall={name: EvaluationResult(*counters) for name, counters in data["overall"].items()},
+            entities={
+                tag: {name: EvaluationResult(*counters) for name, counters in tag_results.items()}
+                for tag, tag_results in data["entities"].items()
+            },
+        )
+        if "overall_indices" in data:
+            state.overall_indices = {
+                name: _indices_from_dict(indices) for name, indices in data["overall_indices"].items()
+            }
+        if "entity_indices" in data:
+            state.entity_indices = {
+                tag: {name: _indices_from_dict(indices) for name, indices in tag_indices.items()}
+                for tag, tag_indices in data["entity_indices"].items()
+            }
+        return state
+
+    def to_json(self) -> str:
+        """Serialize the state to a JSON string."""
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, data: str) -> "EvaluationState":
+        """Create a state from a JSON string produced by to_json()."""
+        return cls.from_dict(json.loads(data))
+
+
+def merge_states(states: Iterable[EvaluationState]) -> EvaluationState:
+    """
+    Merge several states computed on disjoint sets of documents.
+
+    Returns:
+        A state covering the documents of all the states
+    """
+    states = list(states)
+    if not states:
+        raise ValueError("At least one state is required")
+    return reduce(EvaluationState.merge, states)
+
+
+def _merge_document_ranges(first: List[Tuple[int, int]], second: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Merge two lists of [start, end) document ranges, coalescing adjacent ranges."""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(first + second):
+        if merged and start < merged[-1][1]:
+            raise ValueError(f"Cannot merge states covering the same documents: {merged[-1]} and {(start, end)}")
+        if merged and start == merged[-1][1]:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _merge_counters(
+    first: Dict[str, EvaluationResult], second: Dict[str, EvaluationResult]
+) -> Dict[str, EvaluationResult]:
+    """Sum the counters of each strategy."""
+    merged = {}
+    for name in list(first) + [name for name in second if name not in first]:
+        result = EvaluationResult()
+        for source in (first.get(name), second.get(name)):
+            if source is not None:
+                for counter in COUNTERS:
+                    setattr(result, counter, getattr(result, counter) + getattr(source, counter))
+        merged[name] = result
+    return merged
+
+
+def _merge_indices(
+    first: Dict[str, EvaluationIndices], second: Dict[str, EvaluationIndices]
+) -> Dict[str, EvaluationIndices]:
+    """Merge the indices of each strategy, ordered by instance index."""
+    merged = {}
+    empty = EvaluationIndices()
+    for name in list(first) + [name for name in second if name not in first]:
+        indices = EvaluationIndices()
+        for counter in COUNTERS:
+            category = f"{counter}_indices"
+            # Each document comes from a single state, the stable sort keeps the order within a document
+            combined = getattr(first.get(name, empty), category) + getattr(second.get(name, empty), category)
+            setattr(indices, category, sorted(combined, key=lambda position: position[0]))
+        merged[name] = indices
+    return merged
+
+
+def _copy_indices(indices: Dict[str, EvaluationIndices]) -> Dict[str, EvaluationIndices]:
+    """Copy the index lists of each strategy."""
+    return {
+        name: EvaluationIndices(*(list(getattr(source, f"{counter}_indices")) for counter in COUNTERS))
+        for name, source in indices.items()
+    }
+
+
+def _counters_to_list(result: EvaluationResult) -> List[int]:
+    return [getattr(result, counter) for counter in COUNTERS]
+
+
+def _indices_to_dict(indices: EvaluationIndices) -> Dict[str, List[int]]:
+    return {
+        counter: [value for position in getattr(indices, f"{counter}_indices") for value in position]
+        for counter in COUNTERS
+    }
+
+
+def _indices_from_dict(data: Dict[str, List[int]]) -> EvaluationIndices:
+    return EvaluationIndices(*(list(zip(data[counter][::2], data[counter][1::2])) for counter in COUNTERS))
@@ -0,0 +1,203 @@
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, BinaryIO, Iterable, List, Sequence, Set, Tuple, Union
+
+from .entities import Entity
+from .spans import SpanTable
+from .vocabulary import LabelVocabulary
+
+STORE_MAGIC = b"NVSPANS\x00"
+STORE_VERSION = 1
+# Magic, version, number of documents, entities and labels, size of the label table and CRC32 of the payload
+_HEADER = struct.Struct("<8sIIIIII")
+
+
+def write_span_store(path: Union[str, os.PathLike], documents: Union[SpanTable, Iterable[Iterable[Entity]]]) -> None:
+    """
+    Write the entities of a corpus to a binary span store, which open_span_store() maps in memory.
+
+    The store starts with a header holding a version and a CRC32 checksum of the payload. The payload is the label
+    table, the UTF-8 encoded labels prefixed by their sizes, followed by four little-endian int32 arrays: the offsets of
+    the documents into the entity arrays, and the label id, start and end of each entity.
+
+    Args:
+        path: Path of the store file, overwritten if it exists
+        documents: Entities of each document, as a SpanTable or as lists of Entity
+    """
+    table = documents if isinstance(documents, SpanTable) else SpanTable.from_documents(documents)
+    rows = slice(table.offsets[0], table.offsets[-1])
+
+    encoded_labels = [label.encode("utf-8") for label in table.labels]
+    label_table = _to_int32([len(label) for label in encoded_labels], "label sizes").tobytes() + b"".join(
+        encoded_labels
+    )
+    label_table += b"\x00" * (-len(label_table) % 4)
+
+    arrays = [
+        _to_int32([offset - rows.start for offset in table.offsets], "document offsets"),
+        _to_int32(table.label_ids[rows], "label ids"),
+        _to_int32(table.starts[rows], "entity starts"),
+        _to_int32(table.ends[rows], "entity ends"),
+    ]
+    payload = [label_table] + [column.tobytes() for column in arrays]
+
+    checksum = 0
+    for chunk in payload:
+        checksum = zlib.crc32(chunk, checksum)
+
+    header = _HEADER.pack(
+        STORE_MAGIC, STORE_VERSION, len(table), rows.stop - rows.start, len(table.labels), len(label_table), checksum
+    )
+    with open(path, "wb") as file:
+        file.write(header)
+        for chunk in payload:
+            file.write(chunk)
+
+
+def open_span_store(path: Union[str, os.PathLike], verify: bool = True) -> "MappedSpanTable":
+    """
+    Open a binary span store written by write_span_store().
+
+    Args:
+        path: Path of the store file
+        verify: Whether to check the checksum of the payload, which reads the whole file
+
+    Returns:
+        A read-only SpanTable whose arrays are mapped from the file
+    """
+    return MappedSpanTable(path, verify)
+
+
+class MappedSpanTable(SpanTable):
+    """
+    Read-only SpanTable backed by a memory-mapped span store.
+
+    The entity arrays are int32 views on the mapped file, so opening a store does not read the entities, and the
+    operating system shares their pages between all the processes mapping the same file. Slicing a mapped table with a
+    step of 1 returns a view on the same mapping, and a mapped table is pickled as its path and document range, so
+    process pool workers map the file themselves instead of receiving a copy of the entities.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], verify: bool = True) -> None:
+        """
+        Map a span store.
+
+        Args:
+            path: Path of the store file
+            verify: Whether to check the checksum of the payload, which reads the whole file
+        """
+        if sys.byteorder != "little":  # pragma: no cover
+            raise ValueError("Span stores can only be mapped on little-endian platforms")
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as file:
+            mapping = _map_file(file)
+
+        header = _read_header(mapping)
+        _, _, n_documents, n_entities, n_labels, labels_size, checksum = header
+        view = memoryview(mapping)
+        if verify and zlib.crc32(view[_HEADER.size :]) != checksum:
+            raise ValueError("Span store checksum mismatch, the file is corrupted")
+
+        position = _HEADER.size
+        label_sizes = view[position : position + 4 * n_labels].cast("i")
+        labels: List[str] = []
+        label_position = position + 4 * n_labels
+        for size in label_sizes:
+            labels.append(bytes(view[label_position : label_position + size]).decode("utf-8"))
+            label_position += size
+        position += labels_size
+
+        super().__init__(LabelVocabulary(labels))
+        self.offsets = _int32_view(view, position, n_documents + 1)
+        position += 4 * (n_documents + 1)
+        self.label_ids = _int32_view(view, position, n_entities)
+        self.starts = _int32_view(view, position + 4 * n_entities, n_entities)
+        self.ends = _int32_view(view, position + 8 * n_entities, n_entities)
+        self._documents = (0, n_documents)
+
+    @property
+    def n_entities(self) -> int:
+        """Total number of entities in the table."""
+        return self.offsets[-1] - self.offsets[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes of the mapped arrays used by the table."""
+        return 4 * (len(self.offsets) + 3 * self.n_entities)
+
+    def used_labels(self) -> Set[str]:
+        """Get the labels of the entities of the table."""
+        labels = self.labels
+        return {labels[label_id] for label_id in set(self.label_ids[self.offsets[0] : self.offsets[-1]])}
+
+    def append_spans(self, spans: Iterable[Tuple[str, int, int]]) -> None:
+        """Mapped tables are read-only."""
+        raise ValueError("Memory-mapped span tables are read-only")
+
+    def _slice(self, index: slice) -> SpanTable:
+        """Create a view on a range of documents, sharing the mapping and the vocabulary."""
+        first, last, step = index.indices(len(self))
+        if step != 1:
+            return super()._slice(index)
+        last = max(first, last)
+        table = MappedSpanTable.__new__(MappedSpanTable)
+        table.path = self.path
+        table.vocabulary = self.vocabulary
+        table.label_ids, table.starts, table.ends = self.label_ids, self.starts, self.ends
+        table.offsets = self.offsets[first : last + 1]
+        table._documents = (self._documents[0] + first, self._documents[0] + last)
+        return table
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str, int, int]]:
+        return _open_documents, (self.path, *self._documents)
+
+    def __repr__(self) -> str:
+        return f"MappedSpanTable({self.path!r}, {len(self)} documents, {self.n_entities} entities)"
+
+
+def _open_documents(path: str, first: int, last: int) -> SpanTable:
+    """Map a span store and get a view on a range of its documents, the store was verified when first opened."""
+    return MappedSpanTable(path, verify=False)[first:last]
+
+
+def _int32_view(view: memoryview, position: int, length: int) -> Any:
+    """Get an int32 array view on a mapped store, which behaves like the stdlib arrays of a SpanTable."""
+    return view[position : position + 4 * length].cast("i")
+
+
+def _map_file(file: BinaryIO) -> Any:
+    """Map a whole file read-only, an empty file cannot be mapped."""
+    if os.fstat(file.fileno()).st_size == 0:
+        raise ValueError("Not a span store, the file is empty")
+    return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _read_header(mapping: Any) -> Tuple[Any, ...]:
+    """Read and validate the header of a span store."""
+    if len(mapping) < _HEADER.size or mapping[: len(STORE_MAGIC)] != STORE_MAGIC:
+        raise ValueError("Not a span store, the file does not start with the expected magic bytes")
+    header = _HEADER.unpack_from(mapping)
+    version, n_documents, n_entities, n_labels, labels_size = header[1:6]
+    if version != STORE_VERSION:
+        raise ValueError(f"Unsupported span store version: {version}")
+    expected_size = _HEADER.size + labels_size + 4 * (n_documents + 1 + 3 * n_entities)
+    if labels_size < 4 * n_labels or len(mapping) != expected_size:
+        raise ValueError("Span store size does not match its header, the file is truncated or corrupted")
+    return header
+
+
+def _to_int32(values: Sequence[int], name: str) -> array:
+    """Convert values to a little-endian int32 array, raising a ValueError when they do not fit."""
+    try:
+        column = array("i", values)
+    except OverflowError as error:
+        raise ValueError(f"The {name} do not fit in the int32 arrays of a span store") from error
+    if column.itemsize != 4:  # pragma: no cover
+        raise ValueError("Span stores require a 4-byte C int")
+    if sys.byteorder != "little":  # pragma: no cover
+        column.byteswap()
+    return column
@@ -1,22 +1,29 @@
+import math
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from .entities import Entity, EvaluationResult, EvaluationIndices
+from .matching import get_matching_engine
 
 
 class EvaluationStrategy(ABC):
     """Abstract base class for evaluation strategies."""
 
-    def __init__(self, min_overlap_percentage: float = 1.0):
+    def __init__(self, min_overlap_percentage: float = 1.0, matching: str = "pairwise"):
         """
         Initialize strategy with minimum overlap threshold.
 
         Args:
             min_overlap_percentage: Minimum overlap percentage required (1-100)
+            matching: Name of the matching engine used to find candidate true entities ('pairwise' or 'sweep')
         """
         if not 1.0 <= min_overlap_percentage <= 100.0:
             raise ValueError("min_overlap_percentage must be between 1.0 and 100.0")
         self.min_overlap_percentage = min_overlap_percentage
+        self.matching = matching
+        self.matching_engine = get_matching_engine(matching)
 
     @staticmethod
     def _calculate_overlap_percentage(pred: Entity, true: Entity) -> float:
@@ -74,13 +81,16 @@ class StrictEvaluation(EvaluationStrategy):
         indices = EvaluationIndices()
         matched_true = set()
 
+        candidates = self.matching_engine.candidates(true_entities, pred_entities)
+
         for pred_idx, pred in enumerate(pred_entities):
             found_match = False
             found_incorrect = False
 
-            for true_idx, true in enumerate(true_entities):
+            for true_idx in candidates[pred_idx]:
                 if true_idx in matched_true:
                     continue
+                true = true_entities[true_idx]
 
                 # Check for perfect match (same boundaries and label)
                 if pred.label == true.label and pred.start == true.start and pred.end == true.end:
@@ -129,12 +139,15 @@ class PartialEvaluation(EvaluationStrategy):
         indices = EvaluationIndices()
         matched_true = set()
 
+        candidates = self.matching_engine.candidates(true_entities, pred_entities)
+
         for pred_idx, pred in enumerate(pred_entities):
             found_match = False
 
-            for true_idx, true in enumerate(true_entities):
+            for true_idx in candidates[pred_idx]:
                 if true_idx in matched_true:
                     continue
+                true = true_entities[true_idx]
 
                 # Check for sufficient overlap with min threshold
                 if self._has_sufficient_overlap(pred, true):
@@ -183,13 +196,16 @@ class EntityTypeEvaluation(EvaluationStrategy):
         indices = EvaluationIndices()
         matched_true = set()
 
+        candidates = self.matching_engine.candidates(true_entities, pred_entities)
+
         for pred_idx, pred in enumerate(pred_entities):
             found_match = False
             found_incorrect = False
 
-            for true_idx, true in enumerate(true_entities):
+            for true_idx in candidates[pred_idx]:
                 if true_idx in matched_true:
                     continue
+                true = true_entities[true_idx]
 
                 # Check for sufficient overlap with min threshold
                 if self._has_sufficient_overlap(pred, true):
@@ -239,13 +255,16 @@ class ExactEvaluation(EvaluationStrategy):
         indices = EvaluationIndices()
         matched_true = set()
 
+        candidates = self.matching_engine.candidates(true_entities, pred_entities)
+
         for pred_idx, pred in enumerate(pred_entities):
             found_match = False
             found_incorrect = False
 
-            for true_idx, true in enumerate(true_entities):
+            for true_idx in candidates[pred_idx]:
                 if true_idx in matched_true:
                     continue
+                true = true_entities[true_idx]
 
                 # Check for exact boundary match (regardless of label)
                 if pred.start == true.start and pred.end == true.end:
@@ -273,3 +292,349 @@ class ExactEvaluation(EvaluationStrategy):
 
         result.compute_metrics()
         return result, indices
+
+
+class FusedEvaluation:
+    """
+    Fused evaluation - evaluates the strict, partial, ent_type and exact strategies in a single pass.
+
+    All four strategies greedily match each predicted entity to the first unmatched true entity with sufficient
+    overlap (a perfect boundary match always has 100% overlap), so they share the same matching and only differ in
+    how a matched pair is classified. The overlap of each candidate pair is therefore computed once, and the boundary
+    and label equality once per matched pair, instead of once per strategy.
+
+    Entity spans are expected to be inclusive, with start <= end.
+    """
+
+    strategy_names = ("strict", "partial", "ent_type", "exact")
+
+    def __init__(self, min_overlap_percentage: float = 1.0, matching: str = "pairwise", collect_indices: bool = True):
+        """
+        Initialize the fused evaluation with minimum overlap threshold.
+
+        Args:
+            min_overlap_percentage: Minimum overlap percentage required (1-100)
+            matching: Name of the matching engine used to find candidate true entities ('pairwise' or 'sweep')
+            collect_indices: Whether to collect the indices of the entities in each category, only the counters are
+                computed otherwise
+        """
+        if not 1.0 <= min_overlap_percentage <= 100.0:
+            raise ValueError("min_overlap_percentage must be between 1.0 and 100.0")
+        self.min_overlap_percentage = min_overlap_percentage
+        self.matching = matching
+        self.matching_engine = get_matching_engine(matching)
+        self.collect_indices = collect_indices
+
+    def evaluate(  # pylint: disable=too-many-locals,too-many-branches,unused-argument
+        self, true_entities: List[Entity], pred_entities: List[Entity], tags: List[str], instance_index: int = 0
+    ) -> Dict[str, Tuple[EvaluationResult, Optional[EvaluationIndices]]]:
+        """
+        Evaluate the predicted entities against the true entities with every strategy.
+
+        Returns:
+            Dictionary mapping each strategy name to its evaluation result and indices, the indices are None when
+            collect_indices is False
+        """
+        if not self.collect_indices:
+            return self._count(true_entities, pred_entities)
+
+        strict, partial, ent_type, exact = (EvaluationResult() for _ in self.strategy_names)
+        strict_idx, partial_idx, ent_type_idx, exact_idx = (EvaluationIndices() for _ in self.strategy_names)
+        all_outcomes = ((strict, strict_idx), (partial, partial_idx), (ent_type, ent_type_idx), (exact, exact_idx))
+        matched_true = set()
+        min_overlap_percentage = self.min_overlap_percentage
+        candidates = self.matching_engine.candidates(true_entities, pred_entities)
+
+        for pred_idx, pred in enumerate(pred_entities):
+            position = (instance_index, pred_idx)
+            match = None
+
+            for true_idx in candidates[pred_idx]:
+                if true_idx in matched_true:
+                    continue
+                true = true_entities[true_idx]
+                if pred.start > true.end or pred.end < true.start:
+                    continue
+                # Same computation as EvaluationStrategy._calculate_overlap_percentage
+                overlap_span = min(pred.end, true.end) - max(pred.start, true.start) + 1
+                if (overlap_span / (true.end - true.start + 1)) * 100.0 >= min_overlap_percentage:
+                    matched_true.add(true_idx)
+                    match = true
+                    break
+
+            if match is None:
+                for result, indices in all_outcomes:
+                    result.spurious += 1
+                    indices.spurious_indices.append(position)
+                continue
+
+            same_boundaries = pred.start == match.start and pred.end == match.end
+            same_label = pred.label == match.label
+
+            if same_boundaries:
+                exact.correct += 1
+                exact_idx.correct_indices.append(position)
+                partial.correct += 1
+                partial_idx.correct_indices.append(position)
+            else:
+                exact.incorrect += 1
+                exact_idx.incorrect_indices.append(position)
+                partial.partial += 1
+                partial_idx.partial_indices.append(position)
+
+            if same_label:
+                ent_type.correct += 1
+                ent_type_idx.correct_indices.append(position)
+            else:
+                ent_type.incorrect += 1
+                ent_type_idx.incorrect_indices.append(position)
+
+            if same_boundaries and same_label:
+                strict.correct += 1
+                strict_idx.correct_indices.append(position)
+            else:
+                strict.incorrect += 1
+                strict_idx.incorrect_indices.append(position)
+
+        for true_idx in range(len(true_entities)):
+            if true_idx not in matched_true:
+                position = (instance_index, true_idx)
+                for result, indices in all_outcomes:
+                    result.missed += 1
+                    indices.missed_indices.append(position)
+
+        strict.compute_metrics()
+        partial.compute_metrics(partial_or_type=True)
+        ent_type.compute_metrics(partial_or_type=True)
+        exact.compute_metrics()
+
+        return {
+            "strict": (strict, strict_idx),
+            "partial": (partial, partial_idx),
+            "ent_type": (ent_type, ent_type_idx),
+            "exact": (exact, exact_idx),
+        }
+
+    def _count(
+        self, true_entities: List[Entity], pred_entities: List[Entity]
+    ) -> Dict[str, Tuple[EvaluationResult, Optional[EvaluationIndices]]]:
+        """Same as evaluate(), without building the index lists."""
+        matched_true = set()
+        min_overlap_percentage = self.min_overlap_percentage
+        candidates = self.matching_engine.candidates(true_entities, pred_entities)
+        matches: List[Optional[Entity]] = []
+
+        for pred_idx, pred in enumerate(pred_entities):
+            match = None
+
+            for true_idx in candidates[pred_idx]:
+                if true_idx in matched_true:
+                    continue
+                true = true_entities[true_idx]
+                if pred.start > true.end or pred.end < true.start:
+                    continue
+                overlap_span = min(pred.end, true.end) - max(pred.start, true.start) + 1
+                if (overlap_span / (true.end - true.start + 1)) * 100.0 >= min_overlap_percentage:
+                    matched_true.add(true_idx)
+                    match = true
+                    break
+
+            matches.append(match)
+
+        return self.count_matches(pred_entities, matches, len(true_entities) - len(matched_true))
+
+    @staticmethod
+    def count_matches(
+        pred_entities: Sequence[Entity], matches: Sequence[Optional[Entity]], missed: int
+    ) -> Dict[str, Tuple[EvaluationResult, Optional[EvaluationIndices]]]:
+        """
+        Classify the matches of the predicted entities with every strategy and count them.
+
+        Args:
+            pred_entities: Predicted entities
+            matches: True entity matched to each predicted entity, None for the spurious ones
+            missed: Number of true entities matched to no predicted entity
+
+        Returns:
+            Dictionary mapping each strategy name to its evaluation result, without indices
+        """
+        strict, partial, ent_type, exact = (EvaluationResult() for _ in FusedEvaluation.strategy_names)
+        spurious = 0
+
+        for pred, match in zip(pred_entities, matches):
+            if match is None:
+                spurious += 1
+                continue
+
+            same_boundaries = pred.start == match.start and pred.end == match.end
+            same_label = pred.label == match.label
+
+            if same_boundaries:
+                exact.correct += 1
+                partial.correct += 1
+            else:
+                exact.incorrect += 1
+                partial.partial += 1
+
+            if same_label:
+                ent_type.correct += 1
+            else:
+                ent_type.incorrect += 1
+
+            if same_boundaries and same_label:
+                strict.correct += 1
+            else:
+                strict.incorrect += 1
+
+        for result in (strict, partial, ent_type, exact):
+            result.spurious = spurious
+            result.missed = missed
+
+        strict.compute_metrics()
+        partial.compute_metrics(partial_or_type=True)
+        ent_type.compute_metrics(partial_or_type=True)
+        exact.compute_metrics()
+
+        return {
+            "strict": (strict, None),
+            "partial": (partial, None),
+            "ent_type": (ent_type, None),
+            "exact": (exact, None),
+        }
+
+    def evaluate_by_label(
+        self,
+        true_entities: List[Entity],
+        pred_entities: List[Entity],
+        instance_index: int = 0,
+        true_by_label: Optional[Dict[str, List[Entity]]] = None,
+    ) -> Dict[str, Dict[str, Tuple[EvaluationResult, Optional[EvaluationIndices]]]]:
+        """
+        Evaluate the entities of each label separately, with every strategy.
+
+        The entities are bucketed by label in a single pass, and each bucket is evaluated once. This is equivalent to
+        filtering both entity lists by each label and calling evaluate() on them, entity indices are positions within
+        the filtered lists.
+
+        Args:
+            true_entities: True entities
+            pred_entities: Predicted entities
+            instance_index: Index of the document
+            true_by_label: True entities already bucketed by bucket_by_label(), to bucket them only once when they are
+                evaluated against several predictions
+
+        Returns:
+            Dictionary mapping each label found in either list to the evaluation result and indices of each strategy
+        """
+        if true_by_label is None:
+            true_by_label = self.bucket_by_label(true_entities)
+        pred_by_label = self.bucket_by_label(pred_entities)
+
+        return {
+            label: self.evaluate(true_by_label.get(label, []), pred_by_label.get(label, []), [label], instance_index)
+            for label in true_by_label.keys() | pred_by_label.keys()
+        }
+
+    @staticmethod
+    def bucket_by_label(entities: List[Entity]) -> Dict[str, List[Entity]]:
+        """Group entities by label, keeping their order."""
+        by_label: Dict[str, List[Entity]] = defaultdict(list)
+        for entity in entities:
+            by_label[entity.label].append(entity)
+        return by_label
+
+
+class OverlapThresholdEvaluation:
+    """
+    Overlap threshold evaluation - evaluates every strategy at several minimum overlap percentages in a single pass.
+
+    The overlap percentage of each overlapping candidate pair is computed once. A threshold only decides which of these
+    pairs can be matched, so all the thresholds between two consecutive distinct overlaps of a document produce the
+    same greedy matches. The matching is run once per run of consecutive thresholds with the same matchable pairs,
+    instead of once per threshold, and gives the results of FusedEvaluation with each threshold.
+    """
+
+    def __init__(self, thresholds: Sequence[float], matching: str = "pairwise"):
+        """
+        Initialize the evaluation with the thresholds to evaluate.
+
+        Args:
+            thresholds: Minimum overlap percentages to evaluate (1-100), they are sorted and duplicates are dropped
+            matching: Name of the matching engine used to find candidate true entities ('pairwise' or 'sweep')
+        """
+        if not thresholds:
+            raise ValueError("thresholds must contain at least one minimum overlap percentage")
+        if not all(1.0 <= threshold <= 100.0 for threshold in thresholds):
+            raise ValueError("min_overlap_percentage must be between 1.0 and 100.0")
+        self.thresholds = sorted(set(thresholds))
+        self.matching = matching
+        self.matching_engine = get_matching_engine(matching)
+
+    def evaluate(
+        self, true_entities: List[Entity], pred_entities: List[Entity]
+    ) -> List[Tuple[int, Dict[str, Tuple[EvaluationResult, Optional[EvaluationIndices]]]]]:
+        """
+        Evaluate the predicted entities against the true entities with every strategy, at every threshold.
+
+        Returns:
+            The results of each run of consecutive thresholds with the same matches, as pairs of the position of the
+            first threshold of the run and the evaluation result of each strategy, without indices. The first run
+            starts at the first threshold and each run ends where the next one starts.
+        """
+        candidates = self.matching_engine.candidates(true_entities, pred_entities)
+        overlaps: List[List[Tuple[int, float]]] = []
+        for pred_idx, pred in enumerate(pred_entities):
+            pred_overlaps = []
+            for true_idx in candidates[pred_idx]:
+                true = true_entities[true_idx]
+                if pred.start > true.end or pred.end < true.start:
+                    continue
+                # Same computation as EvaluationStrategy._calculate_overlap_percentage
+                overlap_span = min(pred.end, true.end) - max(pred.start, true.start) + 1
+                pred_overlaps.append((true_idx, (overlap_span / (true.end - true.start + 1)) * 100.0))
+            overlaps.append(pred_overlaps)
+
+        # A threshold makes the pairs matchable whose overlap is at least the smallest distinct overlap above it
+        distinct = sorted({overlap for pred_overlaps in overlaps for _, overlap in pred_overlaps})
+        runs = []
+        previous = -1
+        for position, threshold in enumerate(self.thresholds):
+            cutoff_position = bisect_left(distinct, threshold, lo=max(previous, 0))
+            if cutoff_position != previous:
+                cutoff = distinct[cutoff_position] if cutoff_position < len(distinct) else math.inf
+                runs.append((position, self._match(true_entities, pred_entities, overlaps, cutoff)))
+                previous = cutoff_position
+        return runs
+
+    @staticmethod
+    def _match(
+        true_entities: List[Entity], pred_entities: List[Entity], overlaps: List[List[Tuple[int, float]]], cutoff: float
+    ) -> Dict[str, Tuple[EvaluationResult, Optional[EvaluationIndices]]]:
+        """Greedily match each predicted entity to the first unmatched true entity overlapping it by the cutoff."""
+        matched_true = set()
+        matches: List[Optional[Entity]] = []
+        for pred_overlaps in overlaps:
+            match = None
+            for true_idx, overlap in pred_overlaps:
+                if overlap >= cutoff and true_idx not in matched_true:
+                    matched_true.add(true_idx)
+                    match = true_entities[true_idx]
+                    break
+            matches.append(match)
+        return FusedEvaluation.count_matches(pred_entities, matches, len(true_entities) - len(matched_true))
+
+    def evaluate_by_label(
+        self, true_entities: List[Entity], pred_entities: List[Entity]
+    ) -> Dict[str, List[Tuple[int, Dict[str, Tuple[EvaluationResult, Optional[EvaluationIndices]]]]]]:
+        """
+        Evaluate the entities of each label separately, with every strategy, at every threshold.
+
+        Returns:
+            Dictionary mapping each label found in either list to its runs of results, as returned by evaluate()
+        """
+        true_by_label = FusedEvaluation.bucket_by_label(true_entities)
+        pred_by_label = FusedEvaluation.bucket_by_label(pred_entities)
+        return {
+            label: self.evaluate(true_by_label.get(label, []), pred_by_label.get(label, []))
+            for label in true_by_label.keys() | pred_by_label.keys()
+        }
@@ -0,0 +1,333 @@
+from typing import Any, Dict, List, Sequence, Set
+
+from .columnar import require_numpy
+from .entities import Entity, EvaluationResult
+from .spans import SpanTable
+from .state import EvaluationState
+from .strategies import FusedEvaluation
+from .vocabulary import LabelVocabulary
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+
+class NumpyEvaluation:
+    """
+    Vectorized evaluation of all the strategies with NumPy, producing the same counters as FusedEvaluation.
+
+    The true and predicted entities of the whole corpus are packed into flat (document, start, end, label) arrays. The
+    candidate true entities of each predicted entity are found in a window of the true entities of its document
+    sorted by start, and the overlap percentages, boundary equality and label equality of all the candidate pairs are
+    computed at once. The counters of each strategy, overall and per tag, are then reduced with np.bincount.
+
+    The strategies greedily match each predicted entity, in order, to the first unmatched true entity with sufficient
+    overlap. This matching is computed for all the documents at once by rounds: each predicted entity takes its first
+    candidate not taken by an earlier predicted entity in the previous round. The first n predicted entities of a
+    document are settled after n rounds, and a document is settled when a round changes none of its matches, which
+    most documents are after a few rounds. The documents still unsettled after max_rounds, where long chains of
+    predicted entities compete for the same true entities, are evaluated with FusedEvaluation.
+
+    Only the counters are computed, not the indices of the entities in each category.
+    """
+
+    def __init__(self, min_overlap_percentage: float = 1.0, matching: str = "pairwise", max_rounds: int = 32):
+        """
+        Initialize the vectorized evaluation with minimum overlap threshold.
+
+        Args:
+            min_overlap_percentage: Minimum overlap percentage required (1-100)
+            matching: Matching engine of the FusedEvaluation used for the unsettled documents
+            max_rounds: Maximum number of vectorized matching rounds
+        """
+        require_numpy("NumpyEvaluation")
+        if max_rounds < 1:
+            raise ValueError("max_rounds must be a positive integer")
+        self.fused_strategy = FusedEvaluation(min_overlap_percentage, matching, collect_indices=False)
+        self.min_overlap_percentage = min_overlap_percentage
+        self.max_rounds = max_rounds
+
+    def evaluate(
+        self, true: Sequence[Sequence[Entity]], pred: Sequence[Sequence[Entity]], tags: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Evaluate a corpus with every strategy.
+
+        Args:
+            true: True entities of each document
+            pred: Predicted entities of each document
+            tags: List of valid entity tags
+
+        Returns:
+            Dictionary containing evaluation results for each strategy and entity type, as returned by
+            Evaluator.evaluate() with collect_indices=False
+        """
+        if len(true) != len(pred):
+            raise ValueError("Number of predicted documents does not equal true")
+        if not true:
+            return {"overall": {}, "entities": {}}
+
+        # Tags get the ids 0 to len(tags) - 1, entities with a larger id are filtered out
+        vocabulary = LabelVocabulary(tags)
+        n_tags = len(vocabulary)
+        true_spans = _pack(true, vocabulary, n_tags)
+        pred_spans = _pack(pred, vocabulary, n_tags)
+
+        used_ids = np.union1d(true_spans["label"], pred_spans["label"])
+        used_tags = {vocabulary.label(label_id) for label_id in used_ids.tolist()}
+
+        pair_pred, pair_true = self._candidate_pairs(true_spans, pred_spans)
+        same_label = pred_spans["label"][pair_pred] == true_spans["label"][pair_true]
+        n_true = len(true_spans["doc"])
+        # Matching among all the true entities, and among the true entities of the same label for the entities results
+        *matches, unsettled = _greedy_matches(pair_pred, pair_true, n_true, self.max_rounds)
+        *label_matches, label_unsettled = _greedy_matches(
+            pair_pred[same_label], pair_true[same_label], n_true, self.max_rounds
+        )
+
+        ambiguous = np.zeros(len(true), dtype=bool)
+        ambiguous[true_spans["doc"][unsettled | label_unsettled]] = True
+        ambiguous_docs = np.flatnonzero(ambiguous)
+
+        true_kept = ~ambiguous[true_spans["doc"]]
+        pred_kept = ~ambiguous[pred_spans["doc"]]
+        matches = _keep_pairs(matches, pred_kept)
+        label_matches = _keep_pairs(label_matches, pred_kept)
+
+        counters = _count_overall(true_spans, pred_spans, matches, true_kept, pred_kept)
+        entity_counters = _count_by_label(
+            true_spans, pred_spans, label_matches, true_kept, pred_kept, n_tags, vocabulary
+        )
+        entity_counters = {tag: results for tag, results in entity_counters.items() if tag in used_tags}
+
+        if ambiguous_docs.size:
+            self._evaluate_ambiguous(true, pred, tags, used_tags, ambiguous_docs, counters, entity_counters)
+
+        state = EvaluationState(
+            tags=tags,
+            min_overlap_percentage=self.min_overlap_percentage,
+            documents=[(0, len(true))],
+            overall=counters,
+            entities=entity_counters,
+        )
+        return state.compute()
+
+    def _candidate_pairs(self, true_spans: Dict[str, Any], pred_spans: Dict[str, Any]) -> Any:
+        """
+        Find the (predicted, true) pairs of the same document with sufficient overlap.
+
+        Returns:
+            The packed indices of the predicted and true entity of each pair, ordered by predicted entity
+        """
+        if true_spans["doc"].size == 0 or pred_spans["doc"].size == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        origin = min(true_spans["start"].min(), pred_spans["start"].min())
+        max_length = int((true_spans["end"] - true_spans["start"]).max()) + 1
+        max_position = max(true_spans["end"].max(), pred_spans["end"].max(), true_spans["start"].max()) - origin
+        # Keys sort the true entities by document and then by start, documents never overlap
+        stride = int(max_position) + max_length + 2
+
+        order = np.lexsort((true_spans["start"], true_spans["doc"]))
+        keys = true_spans["doc"][order] * stride + (true_spans["start"][order] - origin)
+
+        # An overlapping true entity starts at most max_length - 1 positions before the predicted one, and at the
+        # latest where the predicted one ends
+        window_start = np.maximum(pred_spans["start"] - origin - (max_length - 1), 0)
+        window_end = np.maximum(pred_spans["end"] - origin, -1)
+        low = np.searchsorted(keys, pred_spans["doc"] * stride + window_start, side="left")
+        high = np.searchsorted(keys, pred_spans["doc"] * stride + window_end, side="right")
+        counts = np.maximum(high - low, 0)
+
+        pair_pred = np.repeat(np.arange(len(counts)), counts)
+        first_pair = np.repeat(np.cumsum(counts) - counts, counts)
+        pair_true = order[np.repeat(low, counts) + np.arange(len(pair_pred)) - first_pair]
+
+        pred_start, pred_end = pred_spans["start"][pair_pred], pred_spans["end"][pair_pred]
+        true_start, true_end = true_spans["start"][pair_true], true_spans["end"][pair_true]
+        overlapping = (pred_start <= true_end) & (pred_end >= true_start)
+        # Same computation as EvaluationStrategy._calculate_overlap_percentage
+        overlap_span = np.minimum(pred_end, true_end) - np.maximum(pred_start, true_start) + 1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            percentage = (overlap_span / (true_end - true_start + 1)) * 100.0
+        candidate = overlapping & (percentage >= self.min_overlap_percentage)
+
+        return pair_pred[candidate], pair_true[candidate]
+
+    def _evaluate_ambiguous(  # pylint: disable=too-many-positional-arguments
+        self,
+        true: Sequence[Sequence[Entity]],
+        pred: Sequence[Sequence[Entity]],
+        tags: List[str],
+        used_tags: Set[str],
+        ambiguous_docs: Any,
+        counters: Dict[str, EvaluationResult],
+        entity_counters: Dict[str, Dict[str, EvaluationResult]],
+    ) -> None:
+        """Evaluate the ambiguous documents with the greedy matching and add their counters."""
+        fused = self.fused_strategy
+        valid_tags = set(tags)
+        for doc_idx in ambiguous_docs.tolist():
+            true_doc = [e for e in true[doc_idx] if e.label in valid_tags]
+            pred_doc = [e for e in pred[doc_idx] if e.label in valid_tags]
+
+            for strategy_name, (result, _) in fused.evaluate(true_doc, pred_doc, tags, doc_idx).items():
+                _add_counters(counters[strategy_name], result)
+
+            for tag, outcomes in fused.evaluate_by_label(true_doc, pred_doc, doc_idx).items():
+                if tag not in used_tags:
+                    continue
+                tag_counters = entity_counters.setdefault(tag, _empty_counters())
+                for strategy_name, (result, _) in outcomes.items():
+                    _add_counters(tag_counters[strategy_name], result)
+
+
+def _pack(documents: Sequence[Sequence[Entity]], vocabulary: LabelVocabulary, n_tags: int) -> Dict[str, Any]:
+    """
+    Pack the entities with a valid tag into flat arrays.
+
+    Returns:
+        The document, start, end and label id of each entity, ordered by document and then as in the document
+    """
+    if isinstance(documents, SpanTable):
+        lookup = np.array([vocabulary.add(label) for label in documents.labels], dtype=np.int64)
+        offsets = np.asarray(documents.offsets, dtype=np.int64)
+        # Tables sliced from a memory-mapped store share its arrays, their offsets are rows of these arrays
+        rows = slice(int(offsets[0]), int(offsets[-1]))
+        doc = np.repeat(np.arange(len(documents), dtype=np.int64), np.diff(offsets))
+        start = np.asarray(documents.starts)[rows].astype(np.int64, copy=False)
+        end = np.asarray(documents.ends)[rows].astype(np.int64, copy=False)
+        label = lookup[np.asarray(documents.label_ids)[rows]] if len(lookup) else np.empty(0, np.int64)
+    else:
+        add = vocabulary.add
+        doc_ids: List[int] = []
+        starts: List[int] = []
+        ends: List[int] = []
+        labels: List[int] = []
+        for doc_idx, document in enumerate(documents):
+            for entity in document:
+                doc_ids.append(doc_idx)
+                starts.append(entity.start)
+                ends.append(entity.end)
+                labels.append(add(entity.label))
+        doc = np.array(doc_ids, dtype=np.int64)
+        start = np.array(starts, dtype=np.int64)
+        end = np.array(ends, dtype=np.int64)
+        label = np.array(labels, dtype=np.int64)
+
+    valid = label < n_tags
+    return {"doc": doc[valid], "start": start[valid], "end": end[valid], "label": label[valid]}
+
+
+def _greedy_matches(pair_pred: Any, pair_true: Any, n_true: int, max_rounds: int) -> Any:
+    """
+    Match each predicted entity to its first candidate not matched to an earlier predicted entity.
+
+    Packed indices follow the document order, so the first candidate of a predicted entity is the one with the smallest
+    index, and the earlier predicted entities have a smaller index.
+
+    Returns:
+        The matched predicted and true entities, and a mask of the true entities whose match was not settled after
+        max_rounds, the matches of their documents are not reliable
+    """
+    order = np.lexsort((pair_true, pair_pred))
+    pair_pred, pair_true = pair_pred[order], pair_true[order]
+    no_owner = int(pair_pred[-1]) + 1 if len(pair_pred) else 0
+    # Predicted entity matched to each true entity in the previous round
+    owner = np.full(n_true, no_owner, dtype=np.int64)
+    for _ in range(max_rounds):
+        free = owner[pair_true] >= pair_pred
+        matched_pred, matched_true = _first_pairs(pair_pred[free], pair_true[free])
+        new_owner = np.full(n_true, no_owner, dtype=np.int64)
+        np.minimum.at(new_owner, matched_true, matched_pred)
+        unsettled = new_owner != owner
+        owner = new_owner
+        if not unsettled.any():
+            break
+    return matched_pred, matched_true, unsettled
+
+
+def _first_pairs(pair_pred: Any, pair_true: Any) -> Any:
+    """Keep the first pair of each predicted entity, the pairs being sorted by predicted entity."""
+    first = np.ones(len(pair_pred), dtype=bool)
+    first[1:] = pair_pred[1:] != pair_pred[:-1]
+    return pair_pred[first], pair_true[first]
+
+
+def _keep_pairs(pairs: Any, pred_kept: Any) -> Any:
+    """Keep the pairs whose predicted entity is kept."""
+    pair_pred, pair_true = pairs
+    kept = pred_kept[pair_pred]
+    return pair_pred[kept], pair_true[kept]
+
+
+def _count_overall(
+    true_spans: Dict[str, Any], pred_spans: Dict[str, Any], matches: Any, true_kept: Any, pred_kept: Any
+) -> Dict[str, EvaluationResult]:
+    """Count the outcomes of each strategy over all the entities."""
+    matched_pred, matched_true = matches
+    same_boundaries = (pred_spans["start"][matched_pred] == true_spans["start"][matched_true]) & (
+        pred_spans["end"][matched_pred] == true_spans["end"][matched_true]
+    )
+    same_label = pred_spans["label"][matched_pred] == true_spans["label"][matched_true]
+
+    matched = len(matched_pred)
+    exact_matches = int(same_boundaries.sum())
+    type_matches = int(same_label.sum())
+    strict_matches = int((same_boundaries & same_label).sum())
+    spurious = int(pred_kept.sum()) - matched
+    missed = int(true_kept.sum()) - matched
+
+    return {
+        "strict": EvaluationResult(strict_matches, matched - strict_matches, 0, missed, spurious),
+        "partial": EvaluationResult(exact_matches, 0, matched - exact_matches, missed, spurious),
+        "ent_type": EvaluationResult(type_matches, matched - type_matches, 0, missed, spurious),
+        "exact": EvaluationResult(exact_matches, matched - exact_matches, 0, missed, spurious),
+    }
+
+
+def _count_by_label(  # pylint: disable=too-many-positional-arguments,too-many-locals
+    true_spans: Dict[str, Any],
+    pred_spans: Dict[str, Any],
+    matches: Any,
+    true_kept: Any,
+    pred_kept: Any,
+    n_tags: int,
+    vocabulary: LabelVocabulary,
+) -> Dict[str, Dict[str, EvaluationResult]]:
+    """Count the outcomes of each strategy over the entities of each tag, matched within their tag only."""
+    matched_pred, matched_true = matches
+    same_boundaries = (pred_spans["start"][matched_pred] == true_spans["start"][matched_true]) & (
+        pred_spans["end"][matched_pred] == true_spans["end"][matched_true]
+    )
+
+    labels = pred_spans["label"][matched_pred]
+    matched = np.bincount(labels, minlength=n_tags)
+    exact_matches = np.bincount(labels, weights=same_boundaries, minlength=n_tags).astype(np.int64)
+    spurious = np.bincount(pred_spans["label"][pred_kept], minlength=n_tags) - matched
+    missed = np.bincount(true_spans["label"][true_kept], minlength=n_tags) - matched
+
+    entity_counters = {}
+    for label_id in range(n_tags):
+        label_matched, label_exact = int(matched[label_id]), int(exact_matches[label_id])
+        label_missed, label_spurious = int(missed[label_id]), int(spurious[label_id])
+        entity_counters[vocabulary.label(label_id)] = {
+            "strict": EvaluationResult(label_exact, label_matched - label_exact, 0, label_missed, label_spurious),
+            "partial": EvaluationResult(label_exact, 0, label_matched - label_exact, label_missed, label_spurious),
+            "ent_type": EvaluationResult(label_matched, 0, 0, label_missed, label_spurious),
+            "exact": EvaluationResult(label_exact, label_matched - label_exact, 0, label_missed, label_spurious),
+        }
+    return entity_counters
+
+
+def _empty_counters() -> Dict[str, EvaluationResult]:
+    return {strategy_name: EvaluationResult() for strategy_name in FusedEvaluation.strategy_names}
+
+
+def _add_counters(target: EvaluationResult, source: EvaluationResult) -> None:
+    target.correct += source.correct
+    target.incorrect += source.incorrect
+    target.partial += source.partial
+    target.missed += source.missed
+    target.spurious += source.spurious
@@ -0,0 +1,72 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class LabelVocabulary:
+    """
+    Bidirectional mapping between entity labels and integer ids.
+
+    Labels get consecutive ids in the order they are added, so a vocabulary built from the evaluated tags gives them
+    the ids 0 to len(tags) - 1. Each label is stored once, and the entities created from label ids all share that
+    string, which makes label comparisons identity checks.
+    """
+
+    def __init__(self, labels: Iterable[str] = ()) -> None:
+        """
+        Initialize the vocabulary.
+
+        Args:
+            labels: Initial labels, typically the evaluated tags
+        """
+        self.labels: List[str] = []
+        self._ids: Dict[str, int] = {}
+        for label in labels:
+            self.add(label)
+
+    def add(self, label: str) -> int:
+        """Get the id of a label, adding it to the vocabulary if needed."""
+        label_id = self._ids.get(label)
+        if label_id is None:
+            label_id = self._ids[label] = len(self.labels)
+            self.labels.append(label)
+        return label_id
+
+    def get(self, label: str) -> Optional[int]:
+        """Get the id of a label, or None if it is not in the vocabulary."""
+        return self._ids.get(label)
+
+    def label(self, label_id: int) -> str:
+        """Get the label of an id."""
+        return self.labels[label_id]
+
+    def mask(self, labels: Iterable[str]) -> bytearray:
+        """
+        Get a mask of the given labels, indexed by label id.
+
+        Returns:
+            A bytearray with one byte per label of the vocabulary, set to 1 for the given labels
+        """
+        mask = bytearray(len(self.labels))
+        for label in labels:
+            label_id = self._ids.get(label)
+            if label_id is not None:
+                mask[label_id] = 1
+        return mask
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __contains__(self, label: object) -> bool:
+        return label in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.labels)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LabelVocabulary):
+            return NotImplemented
+        return self.labels == other.labels
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"LabelVocabulary({self.labels!r})"
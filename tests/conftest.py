@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from nervaluate.entities import Entity
+
+LABELS = ["PER", "ORG", "LOC", "MISC"]
+
+
+def random_entities(rng, n_entities, doc_length, labels):
+    """Generate random, possibly overlapping and unsorted, entities."""
+    entities = []
+    for _ in range(n_entities):
+        start = rng.randrange(doc_length)
+        end = min(doc_length - 1, start + rng.randrange(8))
+        entities.append(Entity(label=rng.choice(labels), start=start, end=end))
+    return entities
+
+
+def perturb(rng, entities, doc_length, labels):
+    """Derive predictions from true entities by shifting boundaries, relabelling, dropping and adding entities."""
+    pred = []
+    for entity in entities:
+        roll = rng.random()
+        if roll < 0.15:
+            continue
+        start, end, label = entity.start, entity.end, entity.label
+        if roll < 0.45:
+            start = max(0, start + rng.randint(-2, 2))
+            end = max(start, end + rng.randint(-2, 2))
+        if rng.random() < 0.2:
+            label = rng.choice(labels)
+        pred.append(Entity(label=label, start=start, end=end))
+    pred.extend(random_entities(rng, rng.randrange(4), doc_length, labels))
+    rng.shuffle(pred)
+    return pred
+
+
+def to_dicts(documents):
+    """Convert documents of entities to the input of the dict loader."""
+    return [[{"label": e.label, "start": e.start, "end": e.end} for e in doc] for doc in documents]
+
+
+@pytest.fixture
+def random_corpus():
+    """
+    Build random corpora of true entities and of predictions derived from them by perturb().
+
+    The fixture is a function of the seed, the number of documents, the maximum number of true entities of a document
+    and the labels, the labels outside of the evaluated tags being filtered out by the evaluation. The documents are
+    returned in the dict format, or as lists of entities with as_dicts=False.
+    """
+
+    def make(seed, n_docs, max_entities=8, labels=tuple(LABELS), as_dicts=True):
+        rng = random.Random(seed)
+        labels = list(labels)
+        true, pred = [], []
+        for _ in range(n_docs):
+            doc_length = rng.randint(1, 40)
+            true_doc = random_entities(rng, rng.randrange(max_entities), doc_length, labels)
+            true.append(true_doc)
+            pred.append(perturb(rng, true_doc, doc_length, labels))
+        if as_dicts:
+            return to_dicts(true), to_dicts(pred)
+        return true, pred
+
+    return make
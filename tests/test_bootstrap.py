@@ -0,0 +1,100 @@
+import pytest
+
+from nervaluate.bootstrap import bootstrap_confidence_intervals, resample_counts
+from nervaluate.counters import STRATEGIES, DocumentCounters
+from nervaluate.evaluator import Evaluator
+from nervaluate.state import COUNTERS
+
+np = pytest.importorskip("numpy")
+
+TAGS = ["PER", "ORG", "LOC"]
+
+
+@pytest.fixture(name="corpus")
+def fixture_corpus(random_corpus):
+    return random_corpus(7, 40, max_entities=6)
+
+
+def test_document_counters(corpus):
+    """Test that the counters of the documents sum to the counters of the evaluation."""
+    true, pred = corpus
+    evaluator = Evaluator(true, pred, TAGS, "dict")
+    counters = DocumentCounters.from_evaluator(evaluator)
+    results = evaluator.evaluate()
+
+    assert counters.overall.shape == (40, len(STRATEGIES), len(COUNTERS))
+    assert set(counters.tags) == set(results["entities"])
+    for position, name in enumerate(STRATEGIES):
+        result = results["overall"][name]
+        assert counters.overall[:, position].sum(axis=0).tolist() == [getattr(result, c) for c in COUNTERS]
+        for tag_position, tag in enumerate(counters.tags):
+            result = results["entities"][tag][name]
+            totals = counters.entities[:, position, tag_position].sum(axis=0)
+            assert totals.tolist() == [getattr(result, c) for c in COUNTERS]
+
+    documents = Evaluator(true, pred, TAGS, "dict", document_results=True).evaluate(n_jobs=2, chunk_size=7)["documents"]
+    recorded = DocumentCounters.from_document_results(documents)
+    assert recorded.tags == counters.tags
+    assert np.array_equal(recorded.overall, counters.overall)
+    assert np.array_equal(recorded.entities, counters.entities)
+    sharded = DocumentCounters.from_evaluator(Evaluator(true, pred, TAGS, "dict"), n_jobs=2, chunk_size=7)
+    assert np.array_equal(sharded.overall, counters.overall)
+    # The indices are not collected for the counters, and the options of the evaluator are left unchanged
+    evaluator = Evaluator(true, pred, TAGS, "dict")
+    evaluation = evaluator._evaluate_documents(document_results=True, collect_indices=False)
+    assert "overall_indices" not in evaluation
+    assert evaluator.collect_indices and not evaluator.document_results
+    numpy_backend = Evaluator(true, pred, TAGS, "dict", collect_indices=False, backend="numpy")
+    assert np.array_equal(DocumentCounters.from_evaluator(numpy_backend).entities, counters.entities)
+
+    # The counters of an evaluator recording the results of each document come from its cached evaluation
+    evaluator = Evaluator(true, pred, TAGS, "dict", document_results=True)
+    evaluator.evaluate()
+    assert np.array_equal(DocumentCounters.from_evaluator(evaluator).entities, counters.entities)
+    assert evaluator.cache_info().hits == 1
+
+
+def test_bootstrap_matches_resampled_evaluations(corpus):
+    """Test that the resampled metrics are the metrics of an evaluation of the resampled corpus."""
+    true, pred = corpus
+    evaluator = Evaluator(true, pred, TAGS, "dict", collect_indices=False)
+    counters = DocumentCounters.from_evaluator(evaluator)
+    samples = resample_counts(counters, 5, seed=3)
+
+    drawn = np.random.default_rng(3).integers(0, 40, size=(5, 40))
+    for sample, documents in zip(samples, drawn):
+        resampled = Evaluator([true[i] for i in documents], [pred[i] for i in documents], TAGS, "dict").evaluate()
+        for position, name in enumerate(STRATEGIES):
+            result = resampled["overall"][name]
+            assert sample[position * 5 : position * 5 + 5].tolist() == [getattr(result, c) for c in COUNTERS]
+
+
+def test_bootstrap_confidence_intervals(corpus):
+    """Test the estimates, the bounds and the reproducibility of the intervals."""
+    true, pred = corpus
+    evaluator = Evaluator(true, pred, TAGS, "dict")
+    results = evaluator.evaluate()
+
+    intervals = bootstrap_confidence_intervals(evaluator, n_resamples=200, seed=0)
+    assert intervals == bootstrap_confidence_intervals(DocumentCounters.from_evaluator(evaluator), 200, seed=0)
+    assert intervals != bootstrap_confidence_intervals(evaluator, n_resamples=200, seed=1)
+
+    for name, metrics in intervals["overall"].items():
+        for metric, interval in metrics.items():
+            assert interval.estimate == getattr(results["overall"][name], metric)
+            assert interval.lower <= interval.upper
+    for tag, tag_intervals in intervals["entities"].items():
+        assert tag_intervals["strict"]["f1"].estimate == results["entities"][tag]["strict"].f1
+
+    narrow = bootstrap_confidence_intervals(evaluator, n_resamples=200, confidence=0.5, seed=0, metrics=["f1"])
+    assert list(narrow["overall"]["strict"]) == ["f1"]
+    assert narrow["overall"]["strict"]["f1"].lower >= intervals["overall"]["strict"]["f1"].lower
+
+    with pytest.raises(ValueError, match="n_resamples must be a positive integer"):
+        bootstrap_confidence_intervals(evaluator, n_resamples=0)
+    with pytest.raises(ValueError, match="confidence must be between 0 and 1"):
+        bootstrap_confidence_intervals(evaluator, confidence=1.0)
+    with pytest.raises(ValueError, match="Unknown metrics"):
+        bootstrap_confidence_intervals(evaluator, metrics=["accuracy"])
+    with pytest.raises(ValueError, match="at least one document"):
+        bootstrap_confidence_intervals(Evaluator([], [], TAGS, "dict"))
@@ -0,0 +1,111 @@
+import pickle
+
+import pytest
+
+from nervaluate.columnar import ColumnarEvaluationIndices, IndexColumn
+from nervaluate.entities import EvaluationIndices
+from nervaluate.evaluator import Evaluator
+
+np = pytest.importorskip("numpy")
+
+
+def test_index_column_behaves_like_a_list():
+    """Test that a column can be used like a list of (instance, entity) tuples."""
+    column = IndexColumn([(0, 1), (0, 3)])
+    column.append((1, 0))
+    column.extend([(2, 2), (2, 5)])
+
+    assert len(column) == 5
+    assert column == [(0, 1), (0, 3), (1, 0), (2, 2), (2, 5)]
+    assert [(0, 1), (0, 3), (1, 0), (2, 2), (2, 5)] == column
+    assert column[2] == (1, 0)
+    assert column[-1] == (2, 5)
+    assert column[1:3] == [(0, 3), (1, 0)]
+    assert (2, 2) in column
+    assert column.index((1, 0)) == 2
+    assert list(column) == [(0, 1), (0, 3), (1, 0), (2, 2), (2, 5)]
+    assert all(isinstance(value, int) for pair in column for value in pair)
+    assert column != [(0, 1)]
+    assert len(IndexColumn()) == 0
+    assert not IndexColumn()
+
+
+def test_index_column_views():
+    """Test that the instance and entity columns are read-only views on the buffer."""
+    column = IndexColumn([(0, 1), (4, 3)], dtype="int32")
+
+    array = column.to_numpy()
+    assert array.dtype == np.int32
+    assert array.shape == (2, 2)
+    assert np.shares_memory(array, column.instances)
+    assert column.instances.tolist() == [0, 4]
+    assert column.entities.tolist() == [1, 3]
+    with pytest.raises(ValueError):
+        array[0, 0] = 7
+
+    with pytest.raises(ValueError, match="signed integer dtype"):
+        IndexColumn(dtype="float64")
+
+
+def test_index_column_growth():
+    """Test that the buffer grows over several blocks and can be compacted."""
+    pairs = [(index // 7, index % 7) for index in range(50_000)]
+    column = IndexColumn()
+    for start in range(0, len(pairs), 13):
+        column.extend(pairs[start : start + 13])
+
+    assert column == pairs
+    assert column.nbytes >= len(pairs) * 16
+
+    column.compact()
+    assert column.nbytes == len(pairs) * 16
+
+    other = IndexColumn(pairs[:10])
+    other.extend(column)
+    assert other == pairs[:10] + pairs
+
+    assert pickle.loads(pickle.dumps(column)) == column
+
+
+def test_columnar_evaluation_indices():
+    """Test that columnar indices compare equal to the list indices they were built from."""
+    indices = EvaluationIndices(correct_indices=[(0, 0), (1, 2)], missed_indices=[(1, 0)])
+    columnar = ColumnarEvaluationIndices.from_indices(indices, dtype="int32")
+
+    assert isinstance(columnar.correct_indices, IndexColumn)
+    assert columnar == indices
+    assert indices == columnar
+    assert columnar != EvaluationIndices()
+
+
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_evaluator_numpy_indices_storage(random_corpus, n_jobs):
+    """Test that storing the indices in NumPy columns gives the same results and reports."""
+    tags = ["PER", "ORG", "LOC"]
+    true, pred = random_corpus(31, 30)
+
+    expected = Evaluator(true, pred, tags, loader="dict").evaluate()
+    results = Evaluator(true, pred, tags, loader="dict", indices_storage="numpy").evaluate(n_jobs=n_jobs, chunk_size=7)
+
+    assert results["overall"] == expected["overall"]
+    assert results["entities"] == expected["entities"]
+    for strategy_name, indices in results["overall_indices"].items():
+        assert isinstance(indices, ColumnarEvaluationIndices)
+        assert indices == expected["overall_indices"][strategy_name]
+    for tag, tag_indices in results["entity_indices"].items():
+        for strategy_name, indices in tag_indices.items():
+            assert indices == expected["entity_indices"][tag][strategy_name]
+
+
+def test_evaluator_numpy_indices_report():
+    """Test that the indices report is unchanged with NumPy columns."""
+    true = [["O", "B-PER", "I-PER", "O", "B-ORG"], ["B-LOC", "O", "B-PER"]]
+    pred = [["O", "B-PER", "O", "O", "B-LOC"], ["B-LOC", "O", "B-ORG"]]
+    tags = ["PER", "ORG", "LOC"]
+    evaluator = Evaluator(true, pred, tags, loader="list", indices_storage="numpy")
+
+    assert evaluator.summary_report_indices() == Evaluator(true, pred, tags, loader="list").summary_report_indices()
+    assert evaluator.export_state().to_dict() == Evaluator(true, pred, tags, loader="list").export_state().to_dict()
+
+    with pytest.raises(ValueError, match="Unknown indices storage"):
+        Evaluator(true, pred, tags, loader="list", indices_storage="arrow")
@@ -0,0 +1,81 @@
+import pytest
+
+from nervaluate.documents import DocumentResults
+from nervaluate.entities import EvaluationResult
+from nervaluate.evaluator import Evaluator
+
+TAGS = ["PER", "ORG", "LOC"]
+
+
+@pytest.fixture(name="corpus")
+def fixture_corpus(random_corpus):
+    return random_corpus(5, 40, max_entities=6)
+
+
+def test_document_results(corpus):
+    """Test that the results of each document are the results of its evaluation alone."""
+    true, pred = corpus
+    results = Evaluator(true, pred, TAGS, "dict", document_results=True).evaluate()
+    documents = results["documents"]
+
+    assert isinstance(documents, DocumentResults)
+    assert len(documents) == 40
+    assert set(documents.tags) == set(results["entities"])
+    for index in range(40):
+        alone = Evaluator([true[index]], [pred[index]], TAGS, "dict").evaluate()
+        assert documents.results(index) == {"overall": alone["overall"], "entities": alone["entities"]}
+        assert documents.result(index, "partial") == alone["overall"]["partial"]
+        for tag in documents.tags:
+            expected = alone["entities"][tag]["exact"] if tag in alone["entities"] else EvaluationResult()
+            assert documents.result(index, "exact", tag) == expected
+
+    assert "documents" not in Evaluator(true, pred, TAGS, "dict").evaluate()
+    parallel = Evaluator(true, pred, TAGS, "dict", document_results=True).evaluate(n_jobs=2, chunk_size=7)
+    assert [parallel["documents"].results(index) for index in range(40)] == [
+        documents.results(index) for index in range(40)
+    ]
+
+
+def test_document_results_top_k(corpus, monkeypatch):
+    """Test that the queries select the documents a full sort of their results selects."""
+    true, pred = corpus
+    documents = Evaluator(true, pred, TAGS, "dict", collect_indices=False, document_results=True).evaluate()[
+        "documents"
+    ]
+
+    by_f1 = sorted(range(40), key=lambda index: documents.result(index, "strict").f1)
+    assert [index for index, _ in documents.nsmallest(5, "f1")] == by_f1[:5]
+    assert [result for _, result in documents.nsmallest(5, "f1")] == [
+        documents.result(index, "strict") for index in by_f1[:5]
+    ]
+
+    by_spurious = sorted(range(40), key=lambda index: documents.result(index, "strict").spurious, reverse=True)
+    assert [index for index, _ in documents.nlargest(3, "spurious")] == by_spurious[:3]
+
+    with_per = [index for index in range(40) if "PER" in documents.results(index)["entities"]]
+    by_recall = sorted(with_per, key=lambda index: documents.result(index, "partial", "PER").recall)
+    assert [index for index, _ in documents.nsmallest(100, "recall", "partial", "PER")] == by_recall
+    assert not documents.nlargest(0)
+    assert not DocumentResults(TAGS).nsmallest(5, "f1", tag="PER")
+
+    # The rows are ranked on their counters, results are only built for the selected documents
+    built = []
+    monkeypatch.setattr(EvaluationResult, "compute_metrics", lambda result, partial_or_type=False: built.append(result))
+    documents.nlargest(3, "f1", "partial")
+    documents.nsmallest(2, "precision", tag="PER")
+    assert len(built) == 5
+    monkeypatch.undo()
+
+    with pytest.raises(ValueError, match="Unknown key"):
+        documents.nsmallest(5, "accuracy")
+    with pytest.raises(ValueError, match="Unknown strategy"):
+        documents.nsmallest(5, "f1", "lenient")
+    with pytest.raises(ValueError, match="Unknown tag"):
+        documents.nlargest(5, "missed", tag="DATE")
+    with pytest.raises(ValueError, match="k must be a non-negative integer"):
+        documents.nlargest(-1)
+    with pytest.raises(IndexError, match="Document index out of range"):
+        documents.result(40)
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError, match="document_results=False"):
+        Evaluator(true, pred, TAGS, "dict", collect_indices=False, backend="numpy", document_results=True)
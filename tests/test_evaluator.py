@@ -1,7 +1,12 @@
 import csv
 import io
+
 import pytest
+from nervaluate.entities import EvaluationIndices, EvaluationResult
 from nervaluate.evaluator import Evaluator
+from nervaluate.gold import GoldSet
+from nervaluate.incremental import IncrementalEvaluator
+from nervaluate.strategies import EntityTypeEvaluation, ExactEvaluation, PartialEvaluation, StrictEvaluation
 
 
 @pytest.fixture
@@ -353,3 +358,374 @@ def test_evaluator_min_overlap_backward_compatibility():
         assert default_result.partial == explicit_result.partial
         assert default_result.spurious == explicit_result.spurious
         assert default_result.missed == explicit_result.missed
+
+
+def test_evaluator_entity_results_match_per_tag_evaluation(random_corpus):
+    """Test that per-entity results equal evaluating each strategy on the entities of each tag separately."""
+    tags = ["PER", "ORG", "LOC"]
+    true, pred = random_corpus(5, 30)
+
+    evaluator = Evaluator(true, pred, tags, loader="dict")
+    results = evaluator.evaluate()
+
+    strategies = {
+        "strict": StrictEvaluation(),
+        "partial": PartialEvaluation(),
+        "ent_type": EntityTypeEvaluation(),
+        "exact": ExactEvaluation(),
+    }
+    for tag in tags:
+        for name, strategy in strategies.items():
+            expected_result, expected_indices = EvaluationResult(), EvaluationIndices()
+            for doc_idx, (true_doc, pred_doc) in enumerate(zip(evaluator.true, evaluator.pred)):
+                true_tag_doc = [e for e in true_doc if e.label == tag]
+                pred_tag_doc = [e for e in pred_doc if e.label == tag]
+                result, indices = strategy.evaluate(true_tag_doc, pred_tag_doc, [tag], doc_idx)
+                Evaluator._merge_results(expected_result, result)
+                Evaluator._merge_indices(expected_indices, indices)
+            expected_result.compute_metrics(partial_or_type=name in {"partial", "ent_type"})
+
+            assert results["entities"][tag][name] == expected_result
+            assert results["entity_indices"][tag][name] == expected_indices
+
+
+def test_evaluator_entity_results_of_tags_found_on_one_side():
+    """Test that the entity types found in the predictions only, or in no document, are bucketed as expected."""
+    true = [[{"label": "PER", "start": 0, "end": 1}, {"label": "MISC", "start": 5, "end": 6}], []]
+    pred = [
+        [{"label": "PER", "start": 0, "end": 1}, {"label": "LOC", "start": 3, "end": 4}],
+        [{"label": "LOC", "start": 0, "end": 0}],
+    ]
+    results = Evaluator(true, pred, ["PER", "ORG", "LOC"], loader="dict").evaluate()
+
+    # ORG is in no document and MISC is not an evaluated tag
+    assert set(results["entities"]) == {"PER", "LOC"}
+    loc = results["entities"]["LOC"]["strict"]
+    assert (loc.spurious, loc.possible, loc.recall) == (2, 0, 0)
+    assert results["entities"]["PER"]["strict"].f1 == 1.0
+    assert results["overall"]["strict"].spurious == 2
+
+
+def test_evaluator_partial_credit_over_several_documents():
+    """Test that partial matches count as half a correct match in the merged partial and ent_type results."""
+    true = [
+        [{"label": "PER", "start": 0, "end": 2}],
+        [{"label": "LOC", "start": 5, "end": 5}],
+        [{"label": "ORG", "start": 0, "end": 3}],
+    ]
+    pred = [
+        [{"label": "PER", "start": 0, "end": 1}],
+        [{"label": "LOC", "start": 5, "end": 5}],
+        [{"label": "PER", "start": 1, "end": 3}],
+    ]
+    tags = ["PER", "ORG", "LOC"]
+    results = Evaluator(true, pred, tags, loader="dict").evaluate()
+
+    partial = results["overall"]["partial"]
+    assert (partial.correct, partial.partial, partial.actual, partial.possible) == (1, 2, 3, 3)
+    assert partial.precision == partial.recall == pytest.approx((1 + 0.5 * 2) / 3)
+    ent_type = results["overall"]["ent_type"]
+    assert (ent_type.correct, ent_type.incorrect) == (2, 1)
+    assert ent_type.precision == ent_type.recall == pytest.approx(2 / 3)
+    assert results["overall"]["strict"].f1 == pytest.approx(1 / 3)
+
+    per_partial = results["entities"]["PER"]["partial"]
+    assert (per_partial.partial, per_partial.spurious) == (1, 1)
+    assert per_partial.precision == pytest.approx(0.25)
+    assert per_partial.recall == pytest.approx(0.5)
+
+    # The metrics do not depend on the order the documents are merged in, nor on how they are split in batches
+    reversed_results = Evaluator(true[::-1], pred[::-1], tags, loader="dict").evaluate()
+    assert reversed_results["overall"] == results["overall"]
+    assert reversed_results["entities"] == results["entities"]
+
+    incremental = IncrementalEvaluator(tags, loader="dict")
+    for true_doc, pred_doc in zip(true, pred):
+        incremental.update([true_doc], [pred_doc])
+    assert incremental.compute()["overall"] == results["overall"]
+    assert GoldSet(true, tags, "dict").evaluate(pred)["entities"] == results["entities"]
+
+
+def test_evaluator_caches_results(sample_data):
+    """Test that evaluation results are cached across evaluate and report calls."""
+    true, pred = sample_data
+    evaluator = Evaluator(true, pred, ["PER", "ORG", "LOC"], loader="list")
+
+    assert not evaluator.cache_info().cached
+
+    results = evaluator.evaluate()
+    info = evaluator.cache_info()
+    assert (info.hits, info.misses, info.cached, info.last_hit) == (0, 1, True, False)
+
+    assert evaluator.evaluate() is results
+    evaluator.summary_report()
+    evaluator.summary_report(mode="entities", scenario="partial")
+    evaluator.summary_report_indices()
+    evaluator.results_to_csv()
+    info = evaluator.cache_info()
+    assert (info.hits, info.misses, info.last_hit) == (5, 1, True)
+
+
+def test_evaluator_cache_invalidation(sample_data):
+    """Test that the cache is invalidated when the evaluation inputs change."""
+    true, pred = sample_data
+    evaluator = Evaluator(true, pred, ["PER", "ORG", "LOC"], loader="list")
+    results = evaluator.evaluate()
+
+    evaluator.tags.remove("LOC")
+    assert not evaluator.cache_info().cached
+    results_without_loc = evaluator.evaluate()
+    assert results_without_loc is not results
+    assert "LOC" not in results_without_loc["entities"]
+
+    evaluator.tags = ["PER", "ORG", "LOC"]
+    assert evaluator.evaluate() == results
+
+    evaluator.min_overlap_percentage = 50.0
+    assert not evaluator.cache_info().cached
+    assert evaluator.strategies["strict"].min_overlap_percentage == 50.0
+    evaluator.evaluate()
+
+    evaluator.pred = evaluator.true
+    assert evaluator.evaluate()["overall"]["strict"].correct == 5
+    assert evaluator.cache_info().misses == 5
+
+
+def test_evaluator_refresh_and_clear_cache(sample_data):
+    """Test explicitly refreshing and clearing the cached results."""
+    true, pred = sample_data
+    evaluator = Evaluator(true, pred, ["PER", "ORG", "LOC"], loader="list")
+    results = evaluator.evaluate()
+
+    refreshed = evaluator.refresh()
+    assert refreshed is not results
+    assert refreshed == results
+    assert not evaluator.cache_info().last_hit
+
+    evaluator.clear_cache()
+    assert not evaluator.cache_info().cached
+    assert evaluator.evaluate() is not refreshed
+    assert evaluator.cache_info().misses == 3
+
+
+@pytest.mark.parametrize("n_jobs, chunk_size", [(2, 1), (2, 7), (3, None), (-1, 100)])
+def test_evaluator_parallel_matches_serial(random_corpus, n_jobs, chunk_size):
+    """Test that evaluating chunks of documents in a process pool gives the same results as a serial run."""
+    tags = ["PER", "ORG", "LOC"]
+    true, pred = random_corpus(13, 40)
+
+    serial = Evaluator(true, pred, tags, loader="dict").evaluate()
+    parallel = Evaluator(true, pred, tags, loader="dict").evaluate(n_jobs=n_jobs, chunk_size=chunk_size)
+
+    assert parallel == serial
+
+
+def test_evaluator_parallel_edge_cases():
+    """Test the process pool with an empty corpus and with more workers than chunks of documents."""
+    assert Evaluator([], [], ["PER"], loader="dict").evaluate(n_jobs=2) == Evaluator([], [], ["PER"], "dict").evaluate()
+
+    true = [[{"label": "PER", "start": 0, "end": 1}], [{"label": "PER", "start": 2, "end": 3}]]
+    pred = [[], [{"label": "PER", "start": 2, "end": 3}]]
+    results = Evaluator(true, pred, ["PER"], loader="dict").evaluate(n_jobs=4, chunk_size=10)
+    assert (results["overall"]["strict"].correct, results["overall"]["strict"].missed) == (1, 1)
+    # The indices of the documents of a single chunk keep their position in the corpus
+    assert results["overall_indices"]["strict"].missed_indices == [(0, 0)]
+    assert results["overall_indices"]["strict"].correct_indices == [(1, 0)]
+
+
+def test_evaluator_parallel_invalid_arguments(sample_data):
+    """Test that invalid process pool arguments raise ValueError."""
+    true, pred = sample_data
+    evaluator = Evaluator(true, pred, ["PER", "ORG", "LOC"], loader="list")
+
+    with pytest.raises(ValueError, match="n_jobs must be a positive integer or -1"):
+        evaluator.evaluate(n_jobs=0)
+
+    with pytest.raises(ValueError, match="chunk_size must be a positive integer"):
+        evaluator.evaluate(n_jobs=2, chunk_size=0)
+
+
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_evaluator_without_indices(random_corpus, n_jobs):
+    """Test that the counts-only mode gives the same results without the indices."""
+    tags = ["PER", "ORG", "LOC"]
+    true, pred = random_corpus(29, 30)
+
+    expected = Evaluator(true, pred, tags, loader="dict").evaluate()
+    evaluator = Evaluator(true, pred, tags, loader="dict", collect_indices=False)
+    results = evaluator.evaluate(n_jobs=n_jobs, chunk_size=7)
+
+    assert set(results) == {"overall", "entities"}
+    assert results["overall"] == expected["overall"]
+    assert results["entities"] == expected["entities"]
+    assert evaluator.summary_report() == Evaluator(true, pred, tags, loader="dict").summary_report()
+
+
+def test_evaluator_without_indices_reports(sample_data):
+    """Test that the methods needing the indices raise a clear error in counts-only mode."""
+    true, pred = sample_data
+    evaluator = Evaluator(true, pred, ["PER", "ORG", "LOC"], loader="list", collect_indices=False)
+
+    with pytest.raises(ValueError, match="collect_indices=False"):
+        evaluator.summary_report_indices()
+
+    with pytest.raises(ValueError, match="collect_indices=False"):
+        evaluator.export_state(include_indices=True)
+
+    assert evaluator.export_state().overall_indices is None
+
+    evaluator.collect_indices = True
+    assert "overall_indices" in evaluator.evaluate()
+    assert evaluator.summary_report_indices()
+
+
+def test_evaluator_from_arrays(sample_data):
+    """Test that evaluating tag id arrays gives the same results as the corresponding tag lists."""
+    np = pytest.importorskip("numpy")
+    true, pred = sample_data
+    id2tag = ["O", "B-PER", "I-PER", "B-ORG", "I-ORG", "B-LOC", "I-LOC"]
+    tag2id = {tag: tag_id for tag_id, tag in enumerate(id2tag)}
+    tags = ["PER", "ORG", "LOC"]
+    expected = Evaluator(true, pred, tags, loader="list").evaluate()
+
+    # Padded with a sub-token after each token, which is masked out
+    true_ids = np.full((2, 12), -100)
+    pred_ids = np.full((2, 12), -100)
+    mask = np.zeros((2, 12), dtype=int)
+    for row, (true_doc, pred_doc) in enumerate(zip(true, pred)):
+        true_ids[row, : 2 * len(true_doc) : 2] = [tag2id[tag] for tag in true_doc]
+        pred_ids[row, : 2 * len(pred_doc) : 2] = [tag2id[tag] for tag in pred_doc]
+        mask[row, : 2 * len(true_doc) : 2] = 1
+
+    assert Evaluator.from_arrays(true_ids, pred_ids, id2tag, tags, mask=mask).evaluate() == expected
+    assert (
+        Evaluator.from_arrays(true_ids[:, ::2], pred_ids[:, ::2], id2tag, tags, lengths=[6, 4]).evaluate() == expected
+    )
+    evaluator = Evaluator.from_arrays(
+        [[tag2id[tag] for tag in doc] for doc in true],
+        [[tag2id[tag] for tag in doc] for doc in pred],
+        dict(enumerate(id2tag)),
+        tags,
+        collect_indices=False,
+        backend="numpy",
+    )
+    assert evaluator.evaluate()["overall"] == expected["overall"]
+    assert evaluator.true.labels[:3] == tags
+
+    with pytest.raises(ValueError, match="different shapes"):
+        Evaluator.from_arrays(true_ids, pred_ids[:1], id2tag, tags)
+    with pytest.raises(ValueError, match="different shapes"):
+        Evaluator.from_arrays([[0, 1]], [[0]], id2tag, tags)
+    with pytest.raises(ValueError, match="Pass either lengths or mask"):
+        Evaluator.from_arrays(true_ids, pred_ids, id2tag, tags, lengths=[6, 4], mask=mask)
+    with pytest.raises(ValueError, match="mask must have the same shape"):
+        Evaluator.from_arrays(true_ids, pred_ids, id2tag, tags, mask=mask[:, :6])
+
+
+def test_evaluator_streaming_report_indices():
+    """Test the streamed report of the indices, with a limit and a range of documents."""
+    true = [[{"label": "PER", "start": i, "end": i}] for i in range(6)]
+    pred = [[{"label": "PER", "start": i, "end": i}] if i % 3 else [] for i in range(6)]
+    evaluator = Evaluator(true, true, ["PER"], loader="dict")
+
+    lines = list(evaluator.iter_report_indices())
+    assert "".join(lines) == evaluator.summary_report_indices()
+    assert all(line.endswith("\n") for line in lines)
+    assert "".join(evaluator.iter_report_indices("entities", "partial", True)) == evaluator.summary_report_indices(
+        "entities", "partial", True
+    )
+
+    output = io.StringIO()
+    evaluator.write_report_indices(output, limit=2, documents=(1, 6))
+    rows = [line.split() for line in output.getvalue().splitlines() if line.startswith("Correct")]
+    assert rows == [
+        ["Correct", "1", "0", "Label=PER,", "Start=1,", "End=1"],
+        ["Correct", "2", "0", "Label=PER,", "Start=2,", "End=2"],
+        ["Correct", "...", "...", "3", "more"],
+    ]
+
+    evaluator = Evaluator(true, pred, ["PER"], loader="dict")
+    report = "".join(evaluator.iter_report_indices(documents=(4, 6)))
+    assert [line.split()[:2] for line in report.splitlines() if line.startswith(("Correct", "Missed"))] == [
+        ["Correct", "4"],
+        ["Correct", "5"],
+        ["Missed", "-"],
+    ]
+
+    with pytest.raises(ValueError, match="limit must be a non-negative integer"):
+        evaluator.iter_report_indices(limit=-1)
+    with pytest.raises(ValueError, match="documents must be a"):
+        evaluator.iter_report_indices(documents=(3, 1))
+
+
+def test_evaluator_report_indices_of_missed_entities():
+    """Test that the rows of the missed entities describe the true entities, with more true than predicted entities."""
+    true = [
+        [
+            {"label": "MISC", "start": 0, "end": 0},
+            {"label": "PER", "start": 0, "end": 1},
+            {"label": "LOC", "start": 4, "end": 5},
+            {"label": "ORG", "start": 8, "end": 9},
+        ]
+    ]
+    pred = [[{"label": "PER", "start": 0, "end": 1}]]
+    evaluator = Evaluator(true, pred, ["PER", "ORG", "LOC"], loader="dict")
+
+    def rows(report, category):
+        return [line.split()[1:] for line in report.splitlines() if line.startswith(category)]
+
+    report = "".join(evaluator.iter_report_indices())
+    assert rows(report, "Correct") == [["0", "0", "Label=PER,", "Start=0,", "End=1"]]
+    # The entity indices are positions among the entities of the evaluated tags
+    assert rows(report, "Missed") == [
+        ["0", "1", "Label=LOC,", "Start=4,", "End=5"],
+        ["0", "2", "Label=ORG,", "Start=8,", "End=9"],
+    ]
+    # The entity indices of an entity type are positions among the entities of that type
+    report = "".join(evaluator.iter_report_indices("entities"))
+    assert sorted(rows(report, "Missed")) == [
+        ["-", "-", "None"],
+        ["0", "0", "Label=LOC,", "Start=4,", "End=5"],
+        ["0", "0", "Label=ORG,", "Start=8,", "End=9"],
+    ]
+
+    # Without any predicted entity the missed entities are still described
+    report = Evaluator(true, [[]], ["PER"], loader="dict").summary_report_indices(colors=False)
+    assert rows(report, "Missed") == [["0", "0", "Label=PER,", "Start=0,", "End=1"]]
+
+
+@pytest.mark.parametrize("n_documents, matching", [(30, "pairwise"), (30, "sweep"), (1, "pairwise")])
+def test_evaluator_thresholds_match_separate_evaluations(random_corpus, n_documents, matching):
+    """Test that the curves over the thresholds give the results of an evaluation with each threshold."""
+    tags = ["PER", "ORG", "LOC"]
+    true, pred = random_corpus(17, n_documents)
+
+    thresholds = [100.0, 1.0, 25.0, 50.0, 50.0, 33.4, 66.6, 75.0, 99.0]
+    evaluator = Evaluator(true, pred, tags, loader="dict", matching=matching)
+    curves = evaluator.evaluate_thresholds(thresholds)
+
+    assert curves["thresholds"] == sorted(set(thresholds))
+    for position, threshold in enumerate(curves["thresholds"]):
+        results = Evaluator(true, pred, tags, "dict", threshold, collect_indices=False).evaluate()
+        assert {name: curve[position] for name, curve in curves["overall"].items()} == results["overall"]
+        assert {
+            tag: {name: curve[position] for name, curve in tag_curves.items()}
+            for tag, tag_curves in curves["entities"].items()
+        } == results["entities"]
+
+
+def test_evaluator_thresholds_validation(sample_data):
+    """Test the validation of the thresholds and the curves of an empty corpus."""
+    true, pred = sample_data
+    evaluator = Evaluator(true, pred, ["PER", "ORG", "LOC"], loader="list")
+
+    with pytest.raises(ValueError, match="at least one minimum overlap percentage"):
+        evaluator.evaluate_thresholds([])
+    with pytest.raises(ValueError, match="min_overlap_percentage must be between 1.0 and 100.0"):
+        evaluator.evaluate_thresholds([50.0, 0.5])
+
+    assert Evaluator([], [], ["PER"], "dict").evaluate_thresholds([50.0]) == {
+        "thresholds": [50.0],
+        "overall": {},
+        "entities": {},
+    }
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from nervaluate.evaluator import Evaluator
+from nervaluate.gold import GoldSet
+from nervaluate.loaders import DictLoader
+from nervaluate.spans import SpanTable
+from nervaluate.store import open_span_store
+
+from .conftest import LABELS, perturb, random_entities, to_dicts
+
+TAGS = ["PER", "ORG", "LOC"]
+
+
+@pytest.fixture(name="corpus")
+def fixture_corpus():
+    """True entities and three prediction sets in the dict format."""
+    rng = random.Random(31)
+    true, predictions = [], {"model_a": [], "model_b": [], "model_c": []}
+    for _ in range(60):
+        doc_length = rng.randint(1, 40)
+        true_doc = random_entities(rng, rng.randrange(8), doc_length, LABELS)
+        true.append(true_doc)
+        for pred in predictions.values():
+            pred.append(perturb(rng, true_doc, doc_length, LABELS))
+    return to_dicts(true), {name: to_dicts(pred) for name, pred in predictions.items()}
+
+
+@pytest.mark.parametrize("min_overlap_percentage", [1.0, 50.0])
+def test_gold_set_matches_evaluator(corpus, min_overlap_percentage):
+    """Test that each prediction set gets the results of an Evaluator."""
+    true, predictions = corpus
+    gold = GoldSet(true, TAGS, "dict", min_overlap_percentage)
+
+    results = gold.evaluate_many(predictions)
+    assert list(results) == list(predictions)
+    for name, pred in predictions.items():
+        expected = Evaluator(true, pred, TAGS, "dict", min_overlap_percentage).evaluate()
+        assert results[name] == expected
+        assert gold.evaluate(pred) == expected
+
+    counts_only = gold.evaluate_many(list(predictions.values()), collect_indices=False)
+    assert counts_only == [
+        Evaluator(true, pred, TAGS, "dict", min_overlap_percentage, collect_indices=False).evaluate()
+        for pred in predictions.values()
+    ]
+
+
+def test_gold_set_parallel(corpus):
+    """Test that the prediction sets evaluated by a process pool get the same results."""
+    true, predictions = corpus
+    gold = GoldSet(true, TAGS, "dict")
+
+    assert gold.evaluate_many(predictions, n_jobs=2) == gold.evaluate_many(predictions)
+    assert gold.evaluate_many([predictions["model_a"]], n_jobs=2) == [gold.evaluate(predictions["model_a"])]
+
+    with pytest.raises(ValueError, match="n_jobs must be a positive integer or -1"):
+        gold.evaluate_many(predictions, n_jobs=0)
+
+
+def test_gold_set_inputs(tmp_path, corpus):
+    """Test gold sets of span tables and of token level tags."""
+    true, predictions = corpus
+    pred = predictions["model_b"]
+    expected = Evaluator(true, pred, TAGS, "dict").evaluate()
+
+    DictLoader().write_store(true, tmp_path / "gold.spans")
+    assert GoldSet(open_span_store(tmp_path / "gold.spans"), TAGS).evaluate(pred, "dict") == expected
+    assert GoldSet(true, TAGS, "dict").evaluate(DictLoader().load_table(pred)) == expected
+    assert len(GoldSet(SpanTable.from_documents(DictLoader().load(true)), TAGS)) == len(true)
+
+    true_tags = [["O", "B-PER", "I-PER", "O"], ["B-LOC", "O"]]
+    pred_tags = [["O", "B-PER", "O", "O"], ["B-LOC", "I-LOC"]]
+    gold = GoldSet(true_tags, ["PER", "LOC"])
+    assert gold.evaluate(pred_tags) == Evaluator(true_tags, pred_tags, ["PER", "LOC"]).evaluate()
+
+    with pytest.raises(ValueError, match="Document 1 has different lengths: true=2, pred=1"):
+        gold.evaluate([["O", "B-PER", "O", "O"], ["B-LOC"]])
+
+    with pytest.raises(ValueError, match="Number of predicted documents does not equal true"):
+        gold.evaluate(pred_tags[:1])
+
+    with pytest.raises(ValueError, match="Number of predicted documents does not equal true"):
+        GoldSet(true, TAGS, "dict").evaluate(pred[1:])
@@ -0,0 +1,84 @@
+import pytest
+
+from nervaluate.evaluator import Evaluator
+from nervaluate.incremental import IncrementalEvaluator
+
+
+@pytest.fixture
+def sample_corpus(random_corpus):
+    tags = ["PER", "ORG", "LOC"]
+    true, pred = random_corpus(17, 40)
+    return true, pred, tags
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 40])
+def test_incremental_evaluator_matches_evaluator(sample_corpus, batch_size):
+    """Test that accumulating batches gives the same results as evaluating the whole corpus."""
+    true, pred, tags = sample_corpus
+    expected = Evaluator(true, pred, tags, loader="dict").evaluate()
+
+    evaluator = IncrementalEvaluator(tags, loader="dict")
+    for start in range(0, len(true), batch_size):
+        evaluator.update(true[start : start + batch_size], pred[start : start + batch_size])
+
+    results = evaluator.compute()
+    assert evaluator.n_documents == len(true)
+    assert results["overall"] == expected["overall"]
+    assert results["entities"] == expected["entities"]
+
+
+def test_incremental_evaluator_single_document():
+    """Test the results after a single document."""
+    true = [["O", "B-PER", "I-PER", "O", "B-ORG"]]
+    pred = [["O", "B-PER", "O", "O", "B-LOC"]]
+    expected = Evaluator(true, pred, ["PER", "ORG", "LOC"], loader="list").evaluate()
+
+    evaluator = IncrementalEvaluator(["PER", "ORG", "LOC"])
+    evaluator.update(true, pred)
+
+    results = evaluator.compute()
+    assert results["overall"] == expected["overall"]
+    assert results["entities"] == expected["entities"]
+
+
+def test_incremental_evaluator_compute_snapshot():
+    """Test that computed results are not modified by later updates, and that reset forgets all documents."""
+    evaluator = IncrementalEvaluator(["PER"], loader="list")
+    assert evaluator.compute() == {"overall": {}, "entities": {}}
+
+    evaluator.update([["B-PER", "O"]], [["B-PER", "O"]])
+    first = evaluator.compute()
+    evaluator.update([["B-PER", "O"]], [["O", "O"]])
+    evaluator.update([], [])
+    second = evaluator.compute()
+
+    assert first["overall"]["strict"].correct == 1
+    assert first["overall"]["strict"].missed == 0
+    assert second["overall"]["strict"].correct == 1
+    assert second["overall"]["strict"].missed == 1
+    assert evaluator.n_documents == 2
+
+    evaluator.reset()
+    assert evaluator.n_documents == 0
+    assert evaluator.compute() == {"overall": {}, "entities": {}}
+
+
+def test_incremental_evaluator_batch_length_mismatch():
+    """Test that a batch with different numbers of true and predicted documents raises ValueError."""
+    evaluator = IncrementalEvaluator(["PER"], loader="list")
+
+    with pytest.raises(ValueError, match="Number of predicted documents does not equal true"):
+        evaluator.update([["B-PER"], ["O"]], [["B-PER"]])
+
+
+def test_incremental_evaluator_empty_documents():
+    """Test that the loader is inferred from the first document with entities, whatever the empty documents."""
+    evaluator = IncrementalEvaluator(["PER"])
+    evaluator.update([[]], [[]])
+    assert evaluator.n_documents == 1
+    assert evaluator.compute()["overall"]["strict"].possible == 0
+    assert not evaluator.compute()["entities"]
+
+    evaluator.update([[], [{"label": "PER", "start": 0, "end": 1}]], [[], [{"label": "PER", "start": 0, "end": 1}]])
+    assert evaluator.n_documents == 3
+    assert evaluator.compute()["overall"]["strict"].correct == 1
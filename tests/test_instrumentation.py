@@ -0,0 +1,74 @@
+import pytest
+
+from nervaluate.evaluator import EVALUATION_PHASES, Evaluator
+from nervaluate.instrumentation import EvaluationStats, Instrumentation, PhaseStats
+
+
+@pytest.fixture(name="data")
+def fixture_data():
+    true = [[{"label": "PER", "start": 0, "end": 1}, {"label": "ORG", "start": 3, "end": 3}]] * 6
+    pred = [[{"label": "PER", "start": 0, "end": 0}, {"label": "LOC", "start": 3, "end": 3}]] * 6
+    return true, pred
+
+
+def test_instrumented_evaluator(data):
+    """Test that the phases of loading, evaluation and reports are recorded and passed to the hooks."""
+    true, pred = data
+    events = []
+    instrumentation = Instrumentation(hooks=[lambda name, stats: events.append((name, stats.calls))])
+    evaluator = Evaluator(true, pred, ["PER", "ORG", "LOC"], loader="dict", instrumentation=instrumentation)
+
+    assert evaluator.summary_report() == Evaluator(true, pred, ["PER", "ORG", "LOC"], loader="dict").summary_report()
+    evaluator.summary_report_indices()
+    evaluator.results_to_csv()
+
+    phases = instrumentation.stats.phases
+    assert phases["load"] == PhaseStats(calls=1, seconds=phases["load"].seconds, documents=6, entities=24)
+    assert phases["evaluate"].calls == 1
+    assert phases["evaluate"].entities == 24
+    for name in EVALUATION_PHASES:
+        assert (phases[name].calls, phases[name].documents, phases[name].entities) == (6, 6, 24)
+    assert (phases["report.summary"].calls, phases["report.indices"].calls, phases["report.csv"].calls) == (1, 1, 1)
+    assert all(stats.seconds >= 0 for stats in phases.values())
+    assert events == [("load", 1), *((name, 6) for name in EVALUATION_PHASES), ("evaluate", 1)] + [
+        ("report.summary", 1),
+        ("report.indices", 1),
+        ("report.csv", 1),
+    ]
+
+    # Each report evaluates once, as without the instrumentation
+    reference = Evaluator(true, pred, ["PER", "ORG", "LOC"], loader="dict")
+    reference.summary_report()
+    reference.summary_report_indices()
+    reference.results_to_csv()
+    assert evaluator.cache_info() == reference.cache_info()
+    assert (evaluator.cache_info().misses, evaluator.cache_info().hits) == (1, 2)
+
+    stats = instrumentation.stats.to_dict()
+    assert stats["evaluate.match"]["entities_per_second"] == pytest.approx(24 / phases["evaluate.match"].seconds)
+
+    instrumentation.reset()
+    evaluator.refresh(n_jobs=2, chunk_size=2)
+    phases = instrumentation.stats.phases
+    assert phases["evaluate.match"].calls == 6
+    assert phases["evaluate.merge_chunks"].calls == 3
+
+
+def test_evaluation_stats():
+    """Test the accumulation and merging of the stats of the phases."""
+    stats = EvaluationStats()
+    stats.add("load", PhaseStats(calls=1, seconds=2.0, documents=10, entities=40))
+    other = EvaluationStats({"load": PhaseStats(calls=1, seconds=2.0, documents=10, entities=40)})
+    stats.merge(other)
+
+    assert stats.phases["load"] == PhaseStats(calls=2, seconds=4.0, documents=20, entities=80)
+    assert stats.phases["load"].entities_per_second == 20.0
+    assert stats.phases["load"].documents_per_second == 5.0
+    assert PhaseStats().entities_per_second == 0.0
+
+    instrumentation = Instrumentation()
+    with pytest.raises(ValueError):
+        with instrumentation.phase("report.summary") as phase:
+            phase.documents = 3
+            raise ValueError
+    assert instrumentation.stats.phases["report.summary"].documents == 3
@@ -1,6 +1,12 @@
+import io
+import random
+
 import pytest
 
-from nervaluate.loaders import ConllLoader, ListLoader, DictLoader
+from nervaluate.entities import Entity
+from nervaluate.evaluator import Evaluator
+from nervaluate.loaders import ArrayLoader, ConllLoader, ListLoader, DictLoader
+from nervaluate.spans import SpanTable
 
 
 def test_conll_loader():
@@ -197,3 +203,146 @@ def test_loader_with_invalid_data():
 
     with pytest.raises(Exception):
         DictLoader().load([[{"invalid": "data"}]])
+
+
+def test_conll_loader_iter_load(tmp_path):
+    """Test that streaming CoNLL documents from a path, a file or lines gives the same documents as load()."""
+    conll = "word\tO\nword\tB-PER\nword\tI-PER\n\nword\tO\nword\tO\n\nword\tB-ORG\nword\tB-ORG\nword\tI-ORG\n\n"
+    path = tmp_path / "data.conll"
+    path.write_text(conll, encoding="utf-8")
+    loader = ConllLoader()
+    expected = loader.load(conll)
+
+    assert list(loader.iter_load(path)) == expected
+    # A string is CoNLL content, as in load(), and never a path
+    assert list(loader.iter_load(conll)) == expected
+    with pytest.raises(ValueError, match="does not contain a tab separator"):
+        list(loader.iter_load(str(path)))
+    with open(path, encoding="utf-8") as file:
+        documents = loader.iter_load(file)
+        assert next(documents) == expected[0]
+        assert list(documents) == expected[1:]
+    assert list(loader.iter_load(conll.split("\n"))) == expected
+    assert not list(loader.iter_load([]))
+
+
+@pytest.mark.parametrize(
+    "conll",
+    [
+        "",
+        "\n",
+        "  \n\n \n",
+        "word\tB-PER\n\n\nword\tB-PER\nword\tI-PER",
+        "word\tB-PER\n\n\n\nword\tB-ORG\n \n",
+        "\n\nword\tB-PER\n  \n\nword\tO\n",
+        "word\tB-PER\n  \n\n \n\n",
+        "word\tO\nword\tB-PER \n\n\t\n",
+    ],
+)
+def test_conll_loader_iter_load_whitespace(conll):
+    """Test that streaming handles blank lines and trailing whitespace like load()."""
+    loader = ConllLoader()
+    expected = loader.load(conll)
+
+    assert list(loader.iter_load(io.StringIO(conll))) == expected
+    assert list(loader.iter_load(conll.split("\n"))) == expected
+
+
+def test_conll_loader_iter_load_random():
+    """Test streaming against load() on random CoNLL content."""
+    rng = random.Random(0)
+    lines = ["word\tO", "word\tB-PER", "word\tI-PER", "word\tB-ORG", "word\tI-ORG\t", "", "", " "]
+    loader = ConllLoader()
+
+    for _ in range(500):
+        conll = "\n".join(rng.choice(lines) for _ in range(rng.randrange(12))) + rng.choice(["", "\n", " \n\n"])
+        assert list(loader.iter_load(io.StringIO(conll))) == loader.load(conll)
+
+
+def test_conll_loader_iter_load_invalid_data():
+    """Test that streaming raises the same errors as load()."""
+    with pytest.raises(ValueError, match="does not contain a tab separator"):
+        list(ConllLoader().iter_load(["invalid"]))
+
+
+def test_evaluator_with_conll_streams(tmp_path):
+    """Test that the Evaluator reads true and predicted CoNLL files in lockstep."""
+    true_conll = "word\tB-PER\nword\tI-PER\n\nword\tO\nword\tB-ORG\n"
+    pred_conll = "word\tB-PER\nword\tO\n\nword\tO\nword\tB-ORG\n"
+    true_path = tmp_path / "true.conll"
+    pred_path = tmp_path / "pred.conll"
+    true_path.write_text(true_conll, encoding="utf-8")
+    pred_path.write_text(pred_conll, encoding="utf-8")
+    expected = Evaluator(true_conll, pred_conll, ["PER", "ORG"]).evaluate()
+
+    assert Evaluator(true_path, pred_path, ["PER", "ORG"]).evaluate() == expected
+    with open(true_path, encoding="utf-8") as true_file, open(pred_path, encoding="utf-8") as pred_file:
+        assert Evaluator(true_file, pred_file, ["PER", "ORG"]).evaluate() == expected
+    assert Evaluator(true_conll, iter(pred_conll.split("\n")), ["PER", "ORG"], loader="conll").evaluate() == expected
+    assert Evaluator(true_conll, pred_path, ["PER", "ORG"], loader="conll").evaluate() == expected
+    # The streamed documents are added to the span tables as they are read
+    evaluator = Evaluator(true_path, pred_path, ["PER", "ORG"], entity_storage="table")
+    assert isinstance(evaluator.true, SpanTable) and isinstance(evaluator.pred, SpanTable)
+    assert evaluator.evaluate() == expected
+
+    with pytest.raises(ValueError, match="Number of predicted documents does not equal true"):
+        Evaluator(true_path, io.StringIO("word\tO\n"), ["PER", "ORG"])
+
+
+def test_array_loader_matches_list_loader():
+    """Test that decoding tag ids gives the same entities as loading the tags with ListLoader."""
+    np = pytest.importorskip("numpy")
+    rng = random.Random(3)
+    id2tag = ["O", "B-PER", "I-PER", "B-ORG", "I-ORG", "I-LOC", "E-PER", "B"]
+    loader = ArrayLoader(id2tag)
+
+    for _ in range(300):
+        tag_ids = [[rng.randrange(len(id2tag)) for _ in range(rng.randrange(10))] for _ in range(rng.randrange(1, 6))]
+        tags = [[id2tag[tag_id] for tag_id in doc] for doc in tag_ids]
+        try:
+            expected = ListLoader().load(tags)
+        except ValueError as error:
+            with pytest.raises(ValueError, match=str(error)):
+                loader.load(tag_ids)
+            continue
+
+        assert loader.load(tag_ids) == expected
+        assert loader.load([np.array(doc, dtype=np.int8) for doc in tag_ids]) == expected
+        assert loader.load_table(tag_ids) == expected
+
+        width = max(len(doc) for doc in tag_ids) + 2
+        padded = np.full((len(tag_ids), width), -1)
+        for row, doc in enumerate(tag_ids):
+            padded[row, : len(doc)] = doc
+        lengths = np.array([len(doc) for doc in tag_ids])
+        assert loader.load(padded, lengths) == expected
+
+
+def test_array_loader():
+    """Test the input formats and validation of the array loader."""
+    np = pytest.importorskip("numpy")
+    loader = ArrayLoader({0: "O", 1: "B-PER", 2: "I-PER", 4: "B-LOC"})
+    batch = np.array([[1, 2, 0, 4], [4, 1, 2, 2]])
+
+    assert loader.load(batch) == [
+        [Entity("PER", 0, 1), Entity("LOC", 3, 3)],
+        [Entity("LOC", 0, 0), Entity("PER", 1, 3)],
+    ]
+    assert loader.load(batch, lengths=[1, 0]) == [[Entity("PER", 0, 0)], []]
+    assert loader.load([]) == []
+    assert loader.load_table(batch).labels == ["PER", "LOC"]
+
+    with pytest.raises(ValueError, match="Unknown tag id: 3"):
+        loader.load([[0, 3]])
+    with pytest.raises(ValueError, match="Unknown tag id: -1"):
+        loader.load(batch - 1)
+    with pytest.raises(ValueError, match="lengths must be between 0"):
+        loader.load(batch, lengths=[1, 5])
+    with pytest.raises(ValueError, match="lengths must have one value per document"):
+        loader.load(batch, lengths=[1])
+    with pytest.raises(ValueError, match="lengths are only supported"):
+        loader.load([[0, 1]], lengths=[1])
+    with pytest.raises(ValueError, match="Tag ids must be integers"):
+        loader.load(batch.astype(float))
+    with pytest.raises(ValueError, match="ArrayLoader expects"):
+        loader.load(np.array([0, 1]))
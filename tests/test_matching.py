@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from nervaluate.entities import Entity
+from nervaluate.evaluator import Evaluator
+from nervaluate.matching import PairwiseMatching, SweepMatching, get_matching_engine
+from nervaluate.strategies import EntityTypeEvaluation, ExactEvaluation, PartialEvaluation, StrictEvaluation
+
+from .conftest import perturb, random_entities
+
+STRATEGIES = [StrictEvaluation, PartialEvaluation, EntityTypeEvaluation, ExactEvaluation]
+
+
+def assert_same_evaluation(first, second):
+    result_a, indices_a = first
+    result_b, indices_b = second
+    assert result_a == result_b
+    assert indices_a == indices_b
+
+
+def test_get_matching_engine():
+    """Test matching engine lookup by name."""
+    assert isinstance(get_matching_engine("pairwise"), PairwiseMatching)
+    assert isinstance(get_matching_engine("sweep"), SweepMatching)
+
+    with pytest.raises(ValueError, match="Unknown matching engine: invalid"):
+        get_matching_engine("invalid")
+
+    with pytest.raises(ValueError, match="Unknown matching engine: invalid"):
+        StrictEvaluation(matching="invalid")
+
+
+def test_sweep_candidates():
+    """Test that the sweep engine only returns overlapping true entities, in index order."""
+    true = [
+        Entity(label="PER", start=10, end=12),
+        Entity(label="ORG", start=0, end=20),
+        Entity(label="LOC", start=5, end=6),
+        Entity(label="PER", start=30, end=31),
+    ]
+    pred = [
+        Entity(label="PER", start=11, end=11),
+        Entity(label="ORG", start=6, end=10),
+        Entity(label="LOC", start=21, end=29),
+        Entity(label="PER", start=31, end=40),
+    ]
+
+    candidates = SweepMatching().candidates(true, pred)
+
+    assert candidates == [[0, 1], [0, 1, 2], [], [3]]
+
+
+def test_sweep_candidates_empty():
+    """Test the sweep engine with empty inputs."""
+    entity = Entity(label="PER", start=0, end=1)
+
+    assert not SweepMatching().candidates([], [])
+    assert SweepMatching().candidates([], [entity]) == [[]]
+    assert not SweepMatching().candidates([entity], [])
+
+
+@pytest.mark.parametrize("strategy_class", STRATEGIES)
+@pytest.mark.parametrize("min_overlap_percentage", [1.0, 30.0, 50.0, 100.0])
+def test_sweep_matches_pairwise(strategy_class, min_overlap_percentage):
+    """Test that the sweep engine reproduces the pairwise greedy matching on random documents."""
+    rng = random.Random(42)
+    labels = ["PER", "ORG", "LOC"]
+    pairwise = strategy_class(min_overlap_percentage, matching="pairwise")
+    sweep = strategy_class(min_overlap_percentage, matching="sweep")
+
+    for instance_index in range(200):
+        doc_length = rng.randint(1, 60)
+        true = random_entities(rng, rng.randrange(12), doc_length, labels)
+        pred = perturb(rng, true, doc_length, labels)
+
+        assert_same_evaluation(
+            pairwise.evaluate(true, pred, labels, instance_index),
+            sweep.evaluate(true, pred, labels, instance_index),
+        )
+
+
+def test_evaluator_sweep_matches_pairwise(random_corpus):
+    """Test that the Evaluator produces the same results with both matching engines."""
+    labels = ["PER", "ORG", "LOC", "MISC"]
+    true, pred = random_corpus(7, 50)
+
+    pairwise = Evaluator(true, pred, labels, loader="dict").evaluate()
+    sweep = Evaluator(true, pred, labels, loader="dict", matching="sweep").evaluate()
+
+    assert pairwise == sweep
@@ -0,0 +1,98 @@
+import itertools
+import random
+
+import pytest
+
+from nervaluate.counters import STRATEGIES, DocumentCounters
+from nervaluate.evaluator import Evaluator
+from nervaluate.significance import paired_significance_test
+
+from .conftest import perturb, random_entities, to_dicts
+
+np = pytest.importorskip("numpy")
+
+TAGS = ["PER", "ORG", "LOC"]
+
+
+@pytest.fixture(name="systems")
+def fixture_systems():
+    rng = random.Random(11)
+    true, pred_a, pred_b = [], [], []
+    for _ in range(30):
+        doc_length = rng.randint(1, 30)
+        true_doc = random_entities(rng, rng.randrange(6), doc_length, TAGS)
+        true.append(true_doc)
+        pred_a.append(perturb(rng, true_doc, doc_length, TAGS))
+        # The second system finds the true entities of most documents
+        pred_b.append(true_doc if rng.random() < 0.8 else perturb(rng, true_doc, doc_length, TAGS))
+    return to_dicts(true), to_dicts(pred_a), to_dicts(pred_b)
+
+
+def test_paired_significance_test(systems):
+    """Test the scores, the p-values and the reproducibility of both tests."""
+    true, pred_a, pred_b = systems
+    system_a, system_b = Evaluator(true, pred_a, TAGS, "dict"), Evaluator(true, pred_b, TAGS, "dict")
+    results_a, results_b = system_a.evaluate(), system_b.evaluate()
+
+    for method in ["randomization", "bootstrap"]:
+        results = paired_significance_test(system_a, system_b, method=method, n_rounds=2000, seed=0)
+        assert results == paired_significance_test(
+            DocumentCounters.from_evaluator(system_a), system_b, method=method, n_rounds=2000, seed=0
+        )
+        assert list(results["overall"]) == list(STRATEGIES)
+        for name, result in results["overall"].items():
+            assert result.score_a == results_a["overall"][name].f1
+            assert result.score_b == results_b["overall"][name].f1
+            assert result.p_value < 0.01
+        for tag, tag_results in results["entities"].items():
+            assert tag_results["exact"].score_b == results_b["entities"][tag]["exact"].f1
+
+    same = paired_significance_test(system_a, system_a, n_rounds=100, seed=0)
+    assert all(result.difference == 0 and result.p_value == 1 for result in same["overall"].values())
+
+    recall = paired_significance_test(system_a, system_b, n_rounds=100, seed=0, metric="recall")
+    assert recall["overall"]["strict"].score_a == results_a["overall"]["strict"].recall
+
+
+def test_randomization_matches_exact_permutation_test():
+    """Test that the approximate randomization p-value converges to the one of all the swaps of the documents."""
+    true = [[{"label": "PER", "start": i, "end": i + 1}] for i in range(6)]
+    pred_a = [[{"label": "PER", "start": i, "end": i + 1}] if i % 3 else [] for i in range(6)]
+    pred_b = [[{"label": "PER", "start": i, "end": i + 1 + i % 2}] for i in range(6)]
+    observed = Evaluator(true, pred_b, TAGS, "dict").evaluate()["overall"]["strict"].f1
+    observed -= Evaluator(true, pred_a, TAGS, "dict").evaluate()["overall"]["strict"].f1
+
+    extreme = 0
+    for swaps in itertools.product([False, True], repeat=6):
+        swapped_a = [b if swap else a for a, b, swap in zip(pred_a, pred_b, swaps)]
+        swapped_b = [a if swap else b for a, b, swap in zip(pred_a, pred_b, swaps)]
+        difference = Evaluator(true, swapped_b, TAGS, "dict").evaluate()["overall"]["strict"].f1
+        difference -= Evaluator(true, swapped_a, TAGS, "dict").evaluate()["overall"]["strict"].f1
+        extreme += abs(difference) >= abs(observed) - 1e-12
+
+    results = paired_significance_test(
+        Evaluator(true, pred_a, TAGS, "dict"), Evaluator(true, pred_b, TAGS, "dict"), n_rounds=20000, seed=0
+    )
+    assert results["overall"]["strict"].p_value == pytest.approx(extreme / 2**6, abs=0.02)
+
+
+def test_paired_significance_test_errors(systems):
+    """Test the validation of the arguments and the union of the entity types of both systems."""
+    true, pred_a, pred_b = systems
+    system_a, system_b = Evaluator(true, pred_a, TAGS, "dict"), Evaluator(true, pred_b, TAGS, "dict")
+
+    only_per = Evaluator(true, pred_b, ["PER"], "dict")
+    results = paired_significance_test(system_a, only_per, n_rounds=10, seed=0)
+    assert set(results["entities"]) == set(TAGS)
+    assert results["entities"]["ORG"]["strict"].score_b == 0
+
+    with pytest.raises(ValueError, match="Unknown significance method"):
+        paired_significance_test(system_a, system_b, method="permutation")
+    with pytest.raises(ValueError, match="n_rounds must be a positive integer"):
+        paired_significance_test(system_a, system_b, n_rounds=0)
+    with pytest.raises(ValueError, match="Unknown metric"):
+        paired_significance_test(system_a, system_b, metric="accuracy")
+    with pytest.raises(ValueError, match="same documents"):
+        paired_significance_test(system_a, Evaluator(true[:5], pred_b[:5], TAGS, "dict"))
+    with pytest.raises(ValueError, match="at least one document"):
+        paired_significance_test(Evaluator([], [], TAGS, "dict"), Evaluator([], [], TAGS, "dict"))
@@ -0,0 +1,159 @@
+import pickle
+
+import pytest
+
+from nervaluate.entities import Entity
+from nervaluate.evaluator import Evaluator
+from nervaluate.loaders import DictLoader, ListLoader, load_documents
+from nervaluate.spans import DocumentSpans, SpanTable
+from nervaluate.vocabulary import LabelVocabulary
+
+from .conftest import to_dicts
+
+
+@pytest.fixture
+def documents():
+    return [
+        [Entity("PER", 0, 1), Entity("LOC", 3, 3)],
+        [],
+        [Entity("ORG", 2, 4)],
+    ]
+
+
+def test_entity_uses_slots():
+    """Test that entities have no per-instance dictionary."""
+    entity = Entity("PER", 0, 1)
+
+    assert not hasattr(entity, "__dict__")
+    assert entity == Entity(label="PER", start=0, end=1)
+    assert hash(entity) == hash(Entity("PER", 0, 1))
+    assert pickle.loads(pickle.dumps(entity)) == entity
+
+
+def test_span_table_behaves_like_documents(documents):
+    """Test that a table can be used like a list of entity lists."""
+    table = SpanTable.from_documents(documents)
+
+    assert len(table) == 3
+    assert table.n_entities == 3
+    assert table.labels == ["PER", "LOC", "ORG"]
+    assert list(table.label_ids) == [0, 1, 2]
+    assert list(table.offsets) == [0, 2, 2, 3]
+    assert table == documents
+    assert table.to_documents() == documents
+    assert table[0][1] == Entity("LOC", 3, 3)
+    assert table[-1][-1] == Entity("ORG", 2, 4)
+    assert table[0][:1] == [Entity("PER", 0, 1)]
+    assert not table[1]
+    assert [len(document) for document in table] == [2, 0, 1]
+
+    with pytest.raises(IndexError):
+        table[3]  # pylint: disable=pointless-statement
+    with pytest.raises(IndexError):
+        table[1][0]  # pylint: disable=pointless-statement
+
+
+def test_span_table_slicing(documents):
+    """Test that slicing a table returns a table of the selected documents."""
+    table = SpanTable.from_documents(documents)
+
+    assert isinstance(table[1:], SpanTable)
+    assert table[1:] == documents[1:]
+    assert table[::2] == documents[::2]
+    assert len(table[2:1]) == 0
+    assert table[1:].labels == table.labels
+    assert pickle.loads(pickle.dumps(table)) == documents
+
+
+def test_loaders_load_table():
+    """Test that the loaders build the same documents as a table."""
+    dict_data = [
+        [{"label": "PER", "start": 0, "end": 1}, {"label": "ORG", "start": 3, "end": 4}],
+        [{"label": "LOC", "start": 2, "end": 2}],
+    ]
+    list_data = [["B-PER", "I-PER", "O", "B-ORG"], ["O", "B-LOC"]]
+
+    assert DictLoader().load_table(dict_data) == DictLoader().load(dict_data)
+    assert ListLoader().load_table(list_data) == ListLoader().load(list_data)
+
+    with pytest.raises(ValueError, match="Entity label must be a string"):
+        DictLoader().load_table([[{"label": 1, "start": 0, "end": 1}]])
+
+
+def test_evaluator_with_span_tables(random_corpus):
+    """Test that evaluating span tables gives the same results as entity lists."""
+    tags = ["PER", "ORG", "LOC"]
+    true, pred = random_corpus(37, 30, as_dicts=False)
+
+    true_dicts, pred_dicts = to_dicts(true), to_dicts(pred)
+    expected = Evaluator(true_dicts, pred_dicts, tags, loader="dict").evaluate()
+    true_table, pred_table = SpanTable.from_documents(true), SpanTable.from_documents(pred)
+
+    assert Evaluator(true_table, pred_table, tags).evaluate() == expected
+    assert Evaluator(true_table, pred_table, tags).evaluate(n_jobs=2, chunk_size=7) == expected
+
+    assert Evaluator(true_table, pred_dicts, tags).evaluate() == expected
+    assert Evaluator(true_dicts, pred_table, tags, loader="dict").evaluate() == expected
+
+    with pytest.raises(ValueError, match="Number of predicted documents does not equal true"):
+        Evaluator(true_table, pred_table[1:], tags)
+
+
+def test_label_vocabulary():
+    """Test that labels get consecutive ids in the order they are added."""
+    vocabulary = LabelVocabulary(["PER", "ORG"])
+
+    assert vocabulary.add("LOC") == 2
+    assert vocabulary.add("PER") == 0
+    assert vocabulary.get("ORG") == 1
+    assert vocabulary.get("MISC") is None
+    assert vocabulary.label(2) == "LOC"
+    assert "ORG" in vocabulary and "MISC" not in vocabulary
+    assert list(vocabulary) == ["PER", "ORG", "LOC"]
+    assert vocabulary.mask(["LOC", "PER", "MISC"]) == bytearray([1, 0, 1])
+
+
+def test_span_table_shared_vocabulary(documents):
+    """Test that tables sharing a vocabulary use the same ids and label strings."""
+    vocabulary = LabelVocabulary(["ORG", "PER"])
+    true_table = SpanTable.from_documents(documents, vocabulary)
+    pred_table = SpanTable.from_documents([[Entity("PER", 0, 1)], [], []], vocabulary)
+
+    assert list(true_table.label_ids) == [1, 2, 0]
+    assert list(pred_table.label_ids) == [1]
+    true_doc: DocumentSpans = next(iter(true_table))
+    assert pred_table.entity(0).label is true_table.entity(0).label
+    assert true_table.used_labels() == {"PER", "LOC", "ORG"}
+    assert true_doc.select(vocabulary.mask(["LOC"])) == [Entity("LOC", 3, 3)]
+
+
+def test_load_documents_with_vocabulary():
+    """Test that documents are loaded into span tables when a vocabulary is given."""
+    vocabulary = LabelVocabulary(["PER", "ORG"])
+    true = "a\tB-PER\nb\tO\n\nc\tB-LOC"
+    pred = "a\tB-ORG\nb\tO\n\nc\tO"
+
+    true_docs, pred_docs = load_documents(true, pred, vocabulary=vocabulary)
+    assert isinstance(true_docs, SpanTable) and isinstance(pred_docs, SpanTable)
+    assert true_docs.vocabulary is vocabulary and pred_docs.vocabulary is vocabulary
+    assert (true_docs, pred_docs) == load_documents(true, pred)
+
+    true_docs, pred_docs = load_documents(iter(true.split("\n")), pred, vocabulary=vocabulary)
+    assert isinstance(true_docs, SpanTable)
+    assert (true_docs, pred_docs) == load_documents(true, pred)
+
+
+@pytest.mark.parametrize("tags", [["PER", "ORG", "LOC"], ["LOC", "PER"]])
+def test_evaluator_table_entity_storage(random_corpus, tags):
+    """Test that loading the entities into span tables gives the same results."""
+    true, pred = random_corpus(41, 30)
+
+    expected = Evaluator(true, pred, tags, loader="dict").evaluate()
+    evaluator = Evaluator(true, pred, tags, loader="dict", entity_storage="table")
+
+    assert isinstance(evaluator.true, SpanTable)
+    assert evaluator.true.labels[: len(tags)] == tags
+    assert evaluator.evaluate() == expected
+
+    with pytest.raises(ValueError, match="Unknown entity storage"):
+        Evaluator(true, pred, tags, loader="dict", entity_storage="arrow")
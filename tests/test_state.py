@@ -0,0 +1,130 @@
+import itertools
+
+import pytest
+
+from nervaluate.evaluator import Evaluator
+from nervaluate.incremental import IncrementalEvaluator
+from nervaluate.state import EvaluationState, merge_states
+
+
+@pytest.fixture
+def sample_corpus(random_corpus):
+    tags = ["PER", "ORG", "LOC"]
+    true, pred = random_corpus(23, 30)
+    return true, pred, tags
+
+
+def shard_states(true, pred, tags, bounds):
+    return [
+        Evaluator(true[start:end], pred[start:end], tags, loader="dict").export_state(doc_offset=start)
+        for start, end in zip(bounds, bounds[1:])
+    ]
+
+
+def test_merged_state_matches_evaluator(sample_corpus):
+    """Test that merging the states of shards gives the results of evaluating the whole corpus."""
+    true, pred, tags = sample_corpus
+    expected = Evaluator(true, pred, tags, loader="dict").evaluate()
+
+    states = shard_states(true, pred, tags, [0, 1, 7, 18, 30])
+    state = merge_states(states)
+
+    assert state.documents == [(0, 30)]
+    assert state.n_documents == 30
+    assert state.compute() == expected
+
+
+def test_merge_is_commutative_and_associative(sample_corpus):
+    """Test that the merged state does not depend on the order and grouping of the merges."""
+    true, pred, tags = sample_corpus
+    states = shard_states(true, pred, tags, [0, 5, 12, 30])
+    expected = merge_states(states)
+
+    for first, second, third in itertools.permutations(states):
+        assert first.merge(second).merge(third) == expected
+        assert first.merge(second.merge(third)) == expected
+
+
+def test_merge_does_not_modify_states(sample_corpus):
+    """Test that merging returns a new state."""
+    true, pred, tags = sample_corpus
+    first, second = shard_states(true, pred, tags, [0, 10, 30])
+    copy = EvaluationState.from_dict(first.to_dict())
+
+    first.merge(second)
+
+    assert first == copy
+
+
+def test_single_document_state_matches_evaluator(sample_corpus):
+    """Test that the state of a single document keeps the metrics of the evaluator."""
+    true, pred, tags = sample_corpus
+    evaluator = Evaluator(true[3:4], pred[3:4], tags, loader="dict")
+
+    assert evaluator.export_state(doc_offset=3).compute()["overall"] == evaluator.evaluate()["overall"]
+
+
+def test_state_json_round_trip(sample_corpus):
+    """Test that a state is unchanged by a JSON round trip."""
+    true, pred, tags = sample_corpus
+    state = merge_states(shard_states(true, pred, tags, [0, 12, 30]))
+
+    restored = EvaluationState.from_json(state.to_json())
+
+    assert restored == state
+    assert restored.compute() == state.compute()
+
+
+def test_state_without_indices(sample_corpus):
+    """Test that indices are dropped when merging with a state without indices."""
+    true, pred, tags = sample_corpus
+    first = Evaluator(true[:10], pred[:10], tags, loader="dict").export_state()
+    second = Evaluator(true[10:], pred[10:], tags, loader="dict").export_state(doc_offset=10, include_indices=False)
+
+    state = first.merge(second)
+    results = state.compute()
+
+    assert state.overall_indices is None
+    assert "overall_indices" not in results
+    assert "overall_indices" not in EvaluationState.from_json(state.to_json()).to_dict()
+    assert results["overall"] == Evaluator(true, pred, tags, loader="dict").evaluate()["overall"]
+
+
+def test_incremental_evaluator_state(sample_corpus):
+    """Test that states exported by incremental evaluators merge with the states of evaluators."""
+    true, pred, tags = sample_corpus
+    expected = Evaluator(true, pred, tags, loader="dict").evaluate()
+
+    incremental = IncrementalEvaluator(tags, loader="dict")
+    incremental.update(true[:8], pred[:8])
+    incremental.update(true[8:20], pred[8:20])
+    state = incremental.export_state().merge(
+        Evaluator(true[20:], pred[20:], tags, loader="dict").export_state(doc_offset=20)
+    )
+
+    results = state.compute()
+    assert results["overall"] == expected["overall"]
+    assert results["entities"] == expected["entities"]
+
+
+def test_merge_invalid_states(sample_corpus):
+    """Test that incompatible states cannot be merged."""
+    true, pred, tags = sample_corpus
+    state = Evaluator(true[:10], pred[:10], tags, loader="dict").export_state()
+
+    with pytest.raises(ValueError, match="same documents"):
+        state.merge(Evaluator(true[5:15], pred[5:15], tags, loader="dict").export_state(doc_offset=5))
+
+    with pytest.raises(ValueError, match="different tags"):
+        state.merge(Evaluator(true[10:], pred[10:], ["PER"], loader="dict").export_state(doc_offset=10))
+
+    with pytest.raises(ValueError, match="min_overlap_percentage"):
+        state.merge(
+            Evaluator(true[10:], pred[10:], tags, loader="dict", min_overlap_percentage=50).export_state(doc_offset=10)
+        )
+
+    with pytest.raises(ValueError, match="Unsupported state version"):
+        EvaluationState.from_dict({**state.to_dict(), "version": 0})
+
+    with pytest.raises(ValueError, match="At least one state"):
+        merge_states([])
@@ -0,0 +1,125 @@
+import pickle
+import struct
+
+import pytest
+
+from nervaluate.entities import Entity
+from nervaluate.evaluator import Evaluator
+from nervaluate.loaders import ConllLoader, DictLoader
+from nervaluate.spans import SpanTable
+from nervaluate.store import STORE_MAGIC, MappedSpanTable, open_span_store, write_span_store
+
+
+@pytest.fixture
+def documents():
+    return [
+        [Entity("PER", 0, 1), Entity("LOC", 3, 3)],
+        [],
+        [Entity("ORG", 2, 4), Entity("Café", 5, 7)],
+        [Entity("PER", 1, 1)],
+    ]
+
+
+def test_span_store_round_trip(tmp_path, documents):
+    """Test that a mapped store holds the written documents."""
+    path = tmp_path / "gold.spans"
+    write_span_store(path, documents)
+    table = open_span_store(path)
+
+    assert isinstance(table, MappedSpanTable)
+    assert table == documents
+    assert table.labels == ["PER", "LOC", "ORG", "Café"]
+    assert table.n_entities == 5
+    assert table.used_labels() == {"PER", "LOC", "ORG", "Café"}
+    assert table.nbytes == 4 * (5 + 3 * 5)
+    assert all(isinstance(entity.start, int) for document in table for entity in document)
+
+    write_span_store(tmp_path / "copy.spans", table[1:])
+    assert open_span_store(tmp_path / "copy.spans") == documents[1:]
+
+
+def test_span_store_views(tmp_path, documents):
+    """Test that slices share the mapping and are pickled as a range of the store."""
+    path = tmp_path / "gold.spans"
+    write_span_store(path, SpanTable.from_documents(documents))
+    view = open_span_store(path)[2:4]
+
+    assert isinstance(view, MappedSpanTable)
+    assert view == documents[2:4]
+    assert view.n_entities == 3
+    assert view.used_labels() == {"ORG", "Café", "PER"}
+    assert view[1:] == documents[3:]
+    assert open_span_store(path)[::2] == documents[::2]
+
+    payload = pickle.dumps(view)
+    assert len(payload) < 200
+    assert pickle.loads(payload) == documents[2:4]
+
+    with pytest.raises(ValueError, match="read-only"):
+        view.append([Entity("PER", 0, 0)])
+
+
+def test_span_store_as_true_input(tmp_path, random_corpus):
+    """Test that the evaluator accepts a mapped store as the true entities."""
+    tags = ["PER", "ORG", "LOC"]
+    true, pred = random_corpus(17, 40)
+    expected = Evaluator(true, pred, tags, loader="dict").evaluate()
+
+    path = tmp_path / "gold.spans"
+    DictLoader().write_store(true, path)
+    gold = open_span_store(path)
+
+    assert Evaluator(gold, pred, tags, loader="dict").evaluate() == expected
+    assert Evaluator(gold, pred, tags, loader="dict", entity_storage="table").evaluate() == expected
+    assert Evaluator(gold, pred, tags, loader="dict").evaluate(n_jobs=2, chunk_size=9) == expected
+
+    counts_only = Evaluator(gold, pred, tags, loader="dict", collect_indices=False).evaluate()
+    assert Evaluator(gold, pred, tags, loader="dict", collect_indices=False, backend="numpy").evaluate() == counts_only
+
+    with pytest.raises(ValueError, match="Number of predicted documents does not equal true"):
+        Evaluator(gold, pred[1:], tags, loader="dict")
+
+
+def test_conll_loader_write_store(tmp_path):
+    """Test that loaders write their documents to a store."""
+    conll = "word\tB-PER\nword\tI-PER\n\nword\tO\nword\tB-ORG\n"
+    ConllLoader().write_store(conll, tmp_path / "gold.spans")
+
+    assert open_span_store(tmp_path / "gold.spans") == ConllLoader().load(conll)
+    assert Evaluator(open_span_store(tmp_path / "gold.spans"), conll, ["PER", "ORG"]).evaluate() == (
+        Evaluator(conll, conll, ["PER", "ORG"]).evaluate()
+    )
+
+
+def test_span_store_validation(tmp_path, documents):
+    """Test that invalid or corrupted stores are rejected."""
+    path = tmp_path / "gold.spans"
+    write_span_store(path, documents)
+    content = path.read_bytes()
+
+    corrupted = bytearray(content)
+    corrupted[-1] ^= 0xFF
+    path.write_bytes(bytes(corrupted))
+    with pytest.raises(ValueError, match="checksum mismatch"):
+        open_span_store(path)
+    assert open_span_store(path, verify=False)[3][0] != Entity("PER", 1, 1)
+
+    path.write_bytes(content[:-4])
+    with pytest.raises(ValueError, match="truncated"):
+        open_span_store(path)
+
+    path.write_bytes(content[:8] + struct.pack("<I", 99) + content[12:])
+    with pytest.raises(ValueError, match="Unsupported span store version: 99"):
+        open_span_store(path)
+
+    path.write_bytes(b"word\tB-PER\n" * 4)
+    with pytest.raises(ValueError, match="Not a span store"):
+        open_span_store(path)
+
+    path.write_bytes(b"")
+    with pytest.raises(ValueError, match="Not a span store"):
+        open_span_store(path)
+
+    assert content.startswith(STORE_MAGIC)
+    with pytest.raises(ValueError, match="do not fit in the int32 arrays"):
+        write_span_store(path, [[Entity("PER", 0, 2**31)]])
@@ -1,6 +1,17 @@
+import random
+
 import pytest
 from nervaluate.entities import Entity
-from nervaluate.strategies import EntityTypeEvaluation, ExactEvaluation, PartialEvaluation, StrictEvaluation
+from nervaluate.strategies import (
+    EntityTypeEvaluation,
+    ExactEvaluation,
+    FusedEvaluation,
+    PartialEvaluation,
+    StrictEvaluation,
+)
+
+from .conftest import perturb, random_entities
+
 
 def create_entities_from_bio(bio_tags):
     """Helper function to create entities from BIO tags."""
@@ -27,6 +38,7 @@ def create_entities_from_bio(bio_tags):
 
     return entities
 
+
 @pytest.fixture
 def base_sequence():
     """Base sequence: 'The John Smith who works at Google Inc'"""
@@ -842,3 +854,95 @@ def test_multiple_entities_with_min_overlap():
     assert result.partial == 1  # Only the ORG entity has sufficient overlap (60% > 50%)
     assert result.spurious == 2  # PER entity (40% < 50%) and LOC entity (no overlap)
     assert result.missed == 1  # First true entity (PER) not sufficiently matched
+
+
+def test_fused_evaluation(base_sequence):
+    """Test that the fused evaluation classifies a matched pair differently for each strategy."""
+    true = create_entities_from_bio(base_sequence)
+    pred = create_entities_from_bio(["B-PER", "I-PER", "I-PER", "O", "O", "O", "B-LOC", "I-LOC"])
+
+    outcomes = FusedEvaluation().evaluate(true, pred, ["PER", "ORG", "LOC"])
+
+    assert list(outcomes) == ["strict", "partial", "ent_type", "exact"]
+    strict, strict_indices = outcomes["strict"]
+    assert (strict.correct, strict.incorrect, strict.partial) == (0, 2, 0)
+    assert strict_indices.incorrect_indices == [(0, 0), (0, 1)]
+    partial, partial_indices = outcomes["partial"]
+    assert (partial.correct, partial.incorrect, partial.partial) == (1, 0, 1)
+    assert partial_indices.partial_indices == [(0, 0)]
+    ent_type, ent_type_indices = outcomes["ent_type"]
+    assert (ent_type.correct, ent_type.incorrect, ent_type.partial) == (1, 1, 0)
+    assert ent_type_indices.incorrect_indices == [(0, 1)]
+    exact, exact_indices = outcomes["exact"]
+    assert (exact.correct, exact.incorrect, exact.partial) == (1, 1, 0)
+    assert exact_indices.correct_indices == [(0, 1)]
+
+
+@pytest.mark.parametrize("matching", ["pairwise", "sweep"])
+@pytest.mark.parametrize("min_overlap_percentage", [1.0, 50.0, 100.0])
+def test_fused_evaluation_matches_strategies(matching, min_overlap_percentage):
+    """Test that the fused evaluation produces the same results as each strategy on random documents."""
+    rng = random.Random(3)
+    labels = ["PER", "ORG", "LOC"]
+    fused = FusedEvaluation(min_overlap_percentage, matching)
+    strategies = {
+        "strict": StrictEvaluation(min_overlap_percentage),
+        "partial": PartialEvaluation(min_overlap_percentage),
+        "ent_type": EntityTypeEvaluation(min_overlap_percentage),
+        "exact": ExactEvaluation(min_overlap_percentage),
+    }
+
+    for instance_index in range(200):
+        doc_length = rng.randint(1, 60)
+        true = random_entities(rng, rng.randrange(12), doc_length, labels)
+        pred = perturb(rng, true, doc_length, labels)
+
+        outcomes = fused.evaluate(true, pred, labels, instance_index)
+        for name, strategy in strategies.items():
+            assert outcomes[name] == strategy.evaluate(true, pred, labels, instance_index)
+
+
+def test_fused_evaluation_min_overlap_validation():
+    """Test that the fused evaluation validates minimum overlap percentage."""
+    with pytest.raises(ValueError, match="min_overlap_percentage must be between 1.0 and 100.0"):
+        FusedEvaluation(min_overlap_percentage=0.5)
+
+
+def test_fused_evaluation_by_label():
+    """Test that grouped evaluation equals evaluating the entities of each label separately."""
+    rng = random.Random(11)
+    labels = ["PER", "ORG", "LOC"]
+    fused = FusedEvaluation()
+
+    for instance_index in range(100):
+        doc_length = rng.randint(1, 60)
+        true = random_entities(rng, rng.randrange(12), doc_length, labels)
+        pred = perturb(rng, true, doc_length, labels)
+
+        outcomes = fused.evaluate_by_label(true, pred, instance_index)
+
+        assert set(outcomes) == {e.label for e in true + pred}
+        for label, label_outcomes in outcomes.items():
+            true_label = [e for e in true if e.label == label]
+            pred_label = [e for e in pred if e.label == label]
+            assert label_outcomes == fused.evaluate(true_label, pred_label, [label], instance_index)
+
+
+@pytest.mark.parametrize("matching", ["pairwise", "sweep"])
+def test_fused_evaluation_without_indices(matching):
+    """Test that the counts-only fused evaluation gives the same counters without building indices."""
+    rng = random.Random(5)
+    labels = ["PER", "ORG", "LOC"]
+    fused = FusedEvaluation(50.0, matching)
+    counts_only = FusedEvaluation(50.0, matching, collect_indices=False)
+
+    for instance_index in range(200):
+        doc_length = rng.randint(1, 60)
+        true = random_entities(rng, rng.randrange(12), doc_length, labels)
+        pred = perturb(rng, true, doc_length, labels)
+
+        expected = fused.evaluate(true, pred, labels, instance_index)
+        outcomes = counts_only.evaluate(true, pred, labels, instance_index)
+        for name, (result, indices) in outcomes.items():
+            assert indices is None
+            assert result == expected[name][0]
@@ -0,0 +1,149 @@
+import pytest
+
+from nervaluate.entities import Entity
+from nervaluate.evaluator import Evaluator
+from nervaluate.spans import SpanTable
+from nervaluate.strategies import EntityTypeEvaluation, ExactEvaluation, PartialEvaluation, StrictEvaluation
+from nervaluate.vectorized import NumpyEvaluation
+
+from .conftest import to_dicts
+
+np = pytest.importorskip("numpy")
+
+STRATEGIES = {
+    "strict": StrictEvaluation,
+    "partial": PartialEvaluation,
+    "ent_type": EntityTypeEvaluation,
+    "exact": ExactEvaluation,
+}
+
+
+@pytest.mark.parametrize("min_overlap_percentage", [1.0, 50.0, 100.0])
+def test_parity_with_strategies(random_corpus, min_overlap_percentage):
+    """Test that each document gets the same results as the strategy classes."""
+    tags = ["PER", "ORG", "LOC"]
+    true, pred = random_corpus(11, 200, as_dicts=False)
+    vectorized = NumpyEvaluation(min_overlap_percentage)
+
+    for true_doc, pred_doc in zip(true, pred):
+        results = vectorized.evaluate([true_doc], [pred_doc], tags)
+        true_valid = [e for e in true_doc if e.label in tags]
+        pred_valid = [e for e in pred_doc if e.label in tags]
+
+        for name, strategy_class in STRATEGIES.items():
+            strategy = strategy_class(min_overlap_percentage)
+            expected, _ = strategy.evaluate(true_valid, pred_valid, tags)
+            assert results["overall"][name] == expected
+
+            for tag, tag_results in results["entities"].items():
+                expected, _ = strategy.evaluate(
+                    [e for e in true_valid if e.label == tag], [e for e in pred_valid if e.label == tag], [tag]
+                )
+                assert tag_results[name] == expected
+
+
+@pytest.mark.parametrize(
+    "tags,min_overlap_percentage,max_entities",
+    [
+        (["PER", "ORG", "LOC"], 1.0, 8),
+        (["LOC", "PER"], 30.0, 8),
+        (["PER", "ORG", "LOC", "MISC"], 75.0, 20),
+        (["ORG"], 100.0, 20),
+    ],
+)
+def test_parity_with_python_backend(random_corpus, tags, min_overlap_percentage, max_entities):
+    """Test that the NumPy backend gives the same results as the Python backend on a whole corpus."""
+    true, pred = random_corpus(23, 300, max_entities, as_dicts=False)
+    true_dicts, pred_dicts = to_dicts(true), to_dicts(pred)
+
+    expected = Evaluator(true_dicts, pred_dicts, tags, "dict", min_overlap_percentage, collect_indices=False).evaluate()
+    evaluator = Evaluator(
+        true_dicts, pred_dicts, tags, "dict", min_overlap_percentage, collect_indices=False, backend="numpy"
+    )
+
+    assert evaluator.evaluate() == expected
+
+    true_table, pred_table = SpanTable.from_documents(true), SpanTable.from_documents(pred)
+    evaluator = Evaluator(
+        true_table,
+        pred_table,
+        tags,
+        min_overlap_percentage=min_overlap_percentage,
+        collect_indices=False,
+        backend="numpy",
+    )
+    assert evaluator.evaluate() == expected
+
+
+def test_ambiguous_documents():
+    """Test documents where several predicted entities compete for the same true entity."""
+    true = [
+        [Entity("PER", 0, 5), Entity("PER", 2, 3), Entity("ORG", 10, 12)],
+        [Entity("LOC", 0, 0)],
+        [],
+    ]
+    pred = [
+        [Entity("PER", 2, 3), Entity("PER", 0, 5), Entity("ORG", 11, 11), Entity("LOC", 12, 14)],
+        [Entity("LOC", 0, 0)],
+        [Entity("PER", 1, 2)],
+    ]
+    tags = ["PER", "ORG", "LOC"]
+    true, pred = to_dicts(true), to_dicts(pred)
+
+    expected = Evaluator(true, pred, tags, "dict", collect_indices=False).evaluate()
+    assert Evaluator(true, pred, tags, "dict", collect_indices=False, backend="numpy").evaluate() == expected
+    assert NumpyEvaluation().evaluate([], [], tags) == Evaluator([], [], tags, "dict", collect_indices=False).evaluate()
+
+
+@pytest.mark.parametrize("max_rounds", [1, 2, 32])
+def test_unsettled_documents(random_corpus, max_rounds):
+    """Test that documents not settled after max_rounds are evaluated with the greedy matching."""
+    tags = ["PER", "ORG", "LOC", "MISC"]
+    true, pred = random_corpus(5, 200, max_entities=25, as_dicts=False)
+    # Each predicted entity first competes for the true entity of the previous one, which settles one per round
+    true.append([Entity("PER", 2 * i, 2 * i + 1) for i in range(10)])
+    pred.append([Entity("PER", 0, 1)] + [Entity("PER", 2 * i - 1, 2 * i) for i in range(1, 10)])
+
+    expected = Evaluator(to_dicts(true), to_dicts(pred), tags, "dict", collect_indices=False).evaluate()
+    assert NumpyEvaluation(max_rounds=max_rounds).evaluate(true, pred, tags) == expected
+
+    with pytest.raises(ValueError, match="max_rounds must be a positive integer"):
+        NumpyEvaluation(max_rounds=0)
+
+
+def test_documents_without_entities():
+    """Test the documents without true or predicted entities, which have no pair of entities to match."""
+    true = [[], [{"label": "PER", "start": 0, "end": 1}], []]
+    pred = [[], [], [{"label": "LOC", "start": 0, "end": 0}]]
+    results = Evaluator(true, pred, ["PER", "LOC"], "dict", collect_indices=False, backend="numpy").evaluate()
+
+    assert (results["overall"]["strict"].missed, results["overall"]["strict"].spurious) == (1, 1)
+    assert results["entities"]["PER"]["partial"].possible == 1
+    assert results["entities"]["LOC"]["exact"].actual == 1
+    empty = Evaluator([[]], [[]], ["PER"], "dict", collect_indices=False, backend="numpy").evaluate()
+    assert empty["overall"]["ent_type"].possible == 0
+    assert not empty["entities"]
+
+
+def test_numpy_backend_options():
+    """Test the validation of the options of the NumPy backend."""
+    true = [[{"label": "PER", "start": 0, "end": 1}]]
+    pred = [[{"label": "PER", "start": 0, "end": 1}]]
+
+    with pytest.raises(ValueError, match="Unknown backend: arrow"):
+        Evaluator(true, pred, ["PER"], "dict", collect_indices=False, backend="arrow")
+
+    with pytest.raises(ValueError, match="only computes the counters"):
+        Evaluator(true, pred, ["PER"], "dict", backend="numpy")
+
+    evaluator = Evaluator(true, pred, ["PER"], "dict", collect_indices=False, backend="numpy")
+    with pytest.raises(ValueError, match="n_jobs is only supported by the 'python' backend"):
+        evaluator.evaluate(n_jobs=2)
+
+    evaluator.min_overlap_percentage = 100.0
+    assert evaluator.evaluate()["overall"]["strict"].correct == 1
+    assert evaluator.export_state().compute() == evaluator.evaluate()
+
+    evaluator.collect_indices = True
+    with pytest.raises(ValueError, match="only computes the counters"):
+        evaluator.evaluate()